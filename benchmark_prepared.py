@@ -0,0 +1,54 @@
+"""
+Prepared vs ad-hoc latency of the hot queries (src/db/prepared.py), on the database of the .env file.
+Times the seat map of an event and the scan of a ticket, both on the same pooled connection.
+Scans use an unknown ticket so nothing is written.
+Run with: python benchmark_prepared.py [event_id] [calls]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+# Add project root to path so 'src' package can be imported
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.db import requests
+from src.db.prepared import set_prepared_statements, get_prepared_stats
+
+UNKNOWN_TICKET = -1
+
+
+def measure(call, calls):
+    """Median and 95th percentile of `calls` calls, in milliseconds."""
+    call()  # warm up: connection opened, statement prepared
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95) - 1]
+
+
+def main():
+    event_id = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    queries = {
+        'seat map': lambda: requests.get_seats_with_status_for_event(event_id),
+        'scan': lambda: requests.scan_ticket(UNKNOWN_TICKET, 1, 'A'),
+    }
+
+    for name, call in queries.items():
+        for enabled in (False, True):
+            set_prepared_statements(enabled)
+            median, p95 = measure(call, calls)
+            mode = "prepared" if enabled else "ad-hoc"
+            print(f"{name:>9} {mode:>8}: median {median:6.3f} ms, p95 {p95:6.3f} ms")
+
+    stats = get_prepared_stats()
+    print(f"{stats['prepares']} PREPARE, {stats['executes']} EXECUTE, {stats['adhoc']} ad-hoc")
+
+
+if __name__ == "__main__":
+    main()
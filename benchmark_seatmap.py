@@ -0,0 +1,66 @@
+"""
+Seat map construction benchmark (button engine), no database needed.
+Run with: python benchmark_seatmap.py [seat counts...]
+"""
+
+import os
+import sys
+import time
+
+# Add project root to path so 'src' package can be imported
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout
+
+from src.qt.seatmap_widget import Sector, SECTOR_COLORS
+
+STATUSES = ['AVAILABLE', 'AVAILABLE', 'AVAILABLE', 'SOLD', 'HOLD']
+
+
+def build_seat_map(seat_count):
+    """Same sectors as the seed room, seats split evenly, one seat out of 5 sold or held."""
+    container = QWidget()
+    layout = QVBoxLayout(container)
+    names = list(SECTOR_COLORS)
+    per_sector = seat_count // len(names)
+    seat_id = 1
+    for name in names:
+        seats_data = []
+        for _ in range(per_sector):
+            seats_data.append({'id': seat_id, 'name': str(seat_id), 'sector': name,
+                               'status': STATUSES[seat_id % len(STATUSES)]})
+            seat_id += 1
+        layout.addWidget(Sector(SECTOR_COLORS[name], seats_data, name))
+    return container
+
+
+def run(seat_count, repeat=3):
+    """Best time of `repeat` runs to build and show the seat map, in seconds."""
+    app = QApplication.instance()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        seat_map = build_seat_map(seat_count)
+        seat_map.show()
+        app.processEvents()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        seat_map.deleteLater()
+        app.processEvents()
+    return best
+
+
+def main():
+    app = QApplication(sys.argv[:1])
+    style_path = os.path.join(os.path.dirname(__file__), 'src', 'qt', 'styles.qss')
+    with open(style_path, "r") as f:
+        app.setStyleSheet(f.read())
+
+    counts = [int(arg) for arg in sys.argv[1:]] or [500, 2000, 5000]
+    for seat_count in counts:
+        print(f"{seat_count:>6} seats: {run(seat_count) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Launcher startup benchmark: import time and time to first paint of each launcher.
+Each launcher is started with --startup-profile, which prints its times and quits.
+Run with: python benchmark_startup.py [launchers...]
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+LAUNCHERS = ['main', 'main_client', 'main_staff', 'main_admin']
+REPORT = re.compile(r"imports ([\d.]+) ms, first paint ([\d.]+) ms")
+
+
+def run(launcher, repeat=3):
+    """Best (imports, first paint, process) times of `repeat` starts, in milliseconds."""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # 'src' package and the launchers' own folder must both be importable
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, os.path.join(ROOT, 'src', f'{launcher}.py'), '--startup-profile'],
+            env=env, capture_output=True, text=True, timeout=60)
+        process_ms = (time.perf_counter() - start) * 1000
+        match = REPORT.search(result.stdout)
+        if match is None:
+            raise RuntimeError(f"{launcher} did not report its startup:\n{result.stdout}{result.stderr}")
+        times = (float(match.group(1)), float(match.group(2)), process_ms)
+        best = times if best is None else tuple(map(min, best, times))
+    return best
+
+
+def main():
+    for launcher in sys.argv[1:] or LAUNCHERS:
+        imports, first_paint, process = run(launcher)
+        print(f"{launcher:>12}: imports {imports:7.1f} ms, first paint {first_paint:7.1f} ms, "
+              f"process {process:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
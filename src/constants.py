@@ -25,6 +25,29 @@ SEAT_LARGE_WIDTH = 55  # For SPC seats
 
 SIDE_PANEL_WIDTH = 320
 
+# Seat holds
+SEAT_HOLD_SECONDS = 600  # seats picked on the seat map are kept this long
+PENDING_RESERVATION_MINUTES = 30  # unpaid reservations older than this are expired
+HOLD_SWEEP_INTERVAL_MS = 60 * 1000  # the selling apps sweep expired holds and reservations this often
+SEAT_HOLD_RENEW_MS = SEAT_HOLD_SECONDS * 1000 // 2  # the seat map renews the holds of its selection this often
+SEAT_MAP_REFRESH_MS = 3000  # seat map polls the seats changed by other buyers
+SEAT_MAP_GRAPHICS_THRESHOLD = 1000  # above this many seats, the seat map is drawn with QGraphicsView
+LIVE_UPDATE_DELAY_MS = 500  # lists reload once database changes pause this long
+
+# Event list
+EVENT_ROW_HEIGHT = 70
+EVENT_LIST_BATCH_SIZE = 50  # events fetched per page of the event lists
+SEARCH_DEBOUNCE_MS = 250  # the event search runs once typing pauses this long
+
+# Reference data (event types, rooms, configurations, tarifs)
+REFERENCE_CACHE_SECONDS = 300  # reloaded from the database after this long
+REFERENCE_DISK_CACHE_SECONDS = 24 * 3600  # a copy on disk this recent is used at startup
+
+# Query cache (results of the read functions of requests.py)
+EVENT_LIST_CACHE_SECONDS = 30  # upcoming events list
+EVENT_DATA_CACHE_SECONDS = 300  # details, tarifs, supplements... of an event
+STAFF_CACHE_SECONDS = 60  # staff list
+
 # icons
 ICON_WIDTH = 80
 ICON_HEIGHT = 80
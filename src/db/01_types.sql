@@ -2,7 +2,7 @@
 CREATE TYPE seat_status AS ENUM (
     'AVAILABLE',
     'RESERVED',
-    --'HOLD', --removed from project scope
+    'HOLD',
     'SOLD',
     'UNAVAILABLE'
 );
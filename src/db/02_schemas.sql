@@ -2,7 +2,9 @@
 CREATE TABLE IF NOT EXISTS room (
     id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     name VARCHAR(255) NOT NULL,
-    address VARCHAR(255) NOT NULL
+    address VARCHAR(255) NOT NULL,
+    -- Bumped when its seats or sectors move (trg_bump_room_layout_version), keys the cached seat map geometry
+    layout_version INTEGER NOT NULL DEFAULT 1
 );
 
 CREATE TABLE IF NOT EXISTS sector(
@@ -31,6 +33,11 @@ CREATE TABLE IF NOT EXISTS seat (
     room_id INTEGER NOT NULL REFERENCES room(id)
         ON UPDATE CASCADE
         ON DELETE RESTRICT,
+    -- Place in the sector grid (seat map), x / y override it for free-form layouts (in seats)
+    seat_row SMALLINT,
+    seat_col SMALLINT,
+    pos_x REAL,
+    pos_y REAL,
     CONSTRAINT unique_seat_per_room UNIQUE(name, room_id)
 );
 
@@ -46,7 +53,13 @@ CREATE TABLE IF NOT EXISTS config_with_sector (
         ON DELETE RESTRICT,
     sector_id INTEGER REFERENCES sector(id)
         ON UPDATE CASCADE
-        ON DELETE RESTRICT
+        ON DELETE RESTRICT,
+    -- Place of the sector on the seat map (NULL: after the placed ones)
+    grid_row SMALLINT,
+    grid_col SMALLINT,
+    row_span SMALLINT NOT NULL DEFAULT 1,
+    col_span SMALLINT NOT NULL DEFAULT 1,
+    wide_seats BOOLEAN NOT NULL DEFAULT FALSE
 );
 
 CREATE TABLE IF NOT EXISTS type_of_event (
@@ -67,7 +80,13 @@ CREATE TABLE IF NOT EXISTS event (
     room_id INTEGER NOT NULL REFERENCES room(id),
     config_id INTEGER NOT NULL REFERENCES configuration(id),
     status event_status NOT NULL DEFAULT 'on_sale',
-    CONSTRAINT valid_event_time CHECK (end_at > start_at)
+    -- General admission: no seats, tickets take a place from event_capacity_shard
+    general_admission BOOLEAN NOT NULL DEFAULT FALSE,
+    capacity INTEGER,
+    -- Event and type names for search_events, kept up to date by triggers
+    search_vector TSVECTOR,
+    CONSTRAINT valid_event_time CHECK (end_at > start_at),
+    CONSTRAINT valid_capacity CHECK (capacity IS NULL OR capacity >= 0)
 );
 
 CREATE TABLE IF NOT EXISTS event_seat (
@@ -78,9 +97,14 @@ CREATE TABLE IF NOT EXISTS event_seat (
     seat_id INTEGER NOT NULL REFERENCES seat(id)
         ON UPDATE CASCADE
         ON DELETE RESTRICT,
-    status seat_status NOT NULL DEFAULT 'AVAILABLE'--,
-    --hold_expires_at TIMESTAMP,
-    --CONSTRAINT hold_requires_time CHECK ((status = 'HOLD' AND hold_expires_at IS NOT NULL) OR status != 'HOLD')
+    status seat_status NOT NULL DEFAULT 'AVAILABLE',
+    hold_expires_at TIMESTAMP,
+    -- Reservation holding the seat (no FK: cleared with the hold)
+    held_by INTEGER,
+    -- Transaction (xid8) of the last seat change. Seat maps reload the rows changed by transactions
+    -- not finished at their last poll (see get_seat_changes_since)
+    version BIGINT NOT NULL DEFAULT pg_current_xact_id()::TEXT::BIGINT,
+    CONSTRAINT hold_requires_time CHECK ((status = 'HOLD' AND hold_expires_at IS NOT NULL) OR status != 'HOLD')
 );
 
 CREATE TABLE IF NOT EXISTS client (
@@ -145,6 +169,8 @@ CREATE TABLE IF NOT EXISTS ticket (
         ON UPDATE CASCADE
         ON DELETE RESTRICT,
     tarif_name VARCHAR(255) NOT NULL,
+    -- General admission (no seat): place RESERVED, SOLD once paid, AVAILABLE once given back
+    place_status seat_status NOT NULL DEFAULT 'RESERVED',
     CONSTRAINT unique_seat_per_event UNIQUE (event_id, seat_id),
     CONSTRAINT fk_event_seat FOREIGN KEY(event_id, seat_id)
         REFERENCES event_seat(event_id, seat_id)
@@ -173,4 +199,30 @@ CREATE TABLE IF NOT EXISTS scan_ticket (
         ON UPDATE CASCADE
         ON DELETE CASCADE,
     CONSTRAINT unique_ticket_scan UNIQUE(ticket_id)
-);
\ No newline at end of file
+);
+
+-- General admission places, split on a few rows so concurrent sales do not all lock the same one
+CREATE TABLE IF NOT EXISTS event_capacity_shard (
+    PRIMARY KEY(event_id, shard),
+    event_id INTEGER NOT NULL REFERENCES event(id)
+        ON UPDATE CASCADE
+        ON DELETE CASCADE,
+    shard SMALLINT NOT NULL,
+    remaining INTEGER NOT NULL,
+    sold INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT capacity_not_exceeded CHECK (remaining >= 0)
+);
+
+-- Pre-aggregated statistics, kept current by the event_seat / scan_ticket / payment triggers
+CREATE TABLE IF NOT EXISTS event_counters (
+    event_id INTEGER PRIMARY KEY REFERENCES event(id)
+        ON UPDATE CASCADE
+        ON DELETE CASCADE,
+    seats_total INTEGER NOT NULL DEFAULT 0,
+    seats_available INTEGER NOT NULL DEFAULT 0,
+    -- Reserved or held (HOLD) seats: seats_available + reserved + sold = seats_total
+    reserved INTEGER NOT NULL DEFAULT 0,
+    sold INTEGER NOT NULL DEFAULT 0,
+    scanned INTEGER NOT NULL DEFAULT 0,
+    revenue NUMERIC(12,2) NOT NULL DEFAULT 0
+);
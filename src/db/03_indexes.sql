@@ -2,16 +2,28 @@ CREATE INDEX IF NOT EXISTS idx_event_date ON event(start_at);
 CREATE INDEX IF NOT EXISTS idx_event_type ON event(type_id);
 CREATE INDEX IF NOT EXISTS idx_event_room ON event(room_id);
 CREATE INDEX IF NOT EXISTS idx_event_status ON event(status);
-CREATE INDEX IF NOT EXISTS idx_event_on_sale ON event(status, start_at)
-    WHERE status = 'on_sale' OR status = 'on_site';
+-- Event catalog: upcoming on-sale events, paginated on (start_at, id)
+CREATE INDEX IF NOT EXISTS idx_event_on_sale ON event(start_at, id)
+    WHERE status IN ('on_sale', 'on_site');
+-- Event search (search_events)
+CREATE INDEX IF NOT EXISTS idx_event_search ON event USING GIN(search_vector);
 
 CREATE INDEX IF NOT EXISTS idx_event_seat_status ON event_seat(status);
 CREATE INDEX IF NOT EXISTS idx_event_seat_event ON event_seat(event_id);
+-- Holds only: the sweeper and the release/extend functions never scan all of event_seat
+CREATE INDEX IF NOT EXISTS idx_event_seat_hold_expiry ON event_seat(hold_expires_at)
+    WHERE status = 'HOLD';
+CREATE INDEX IF NOT EXISTS idx_event_seat_held_by ON event_seat(held_by)
+    WHERE status = 'HOLD';
+-- Seat map refresh: changes of one event since a transaction
+CREATE INDEX IF NOT EXISTS idx_event_seat_version ON event_seat(event_id, version);
 
 CREATE INDEX IF NOT EXISTS idx_reservation_client ON reservation(client_id)
     WHERE client_id IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_reservation_event ON reservation(event_id);
 CREATE INDEX IF NOT EXISTS idx_reservation_status ON reservation(status);
+CREATE INDEX IF NOT EXISTS idx_reservation_pending_time ON reservation(reservation_time)
+    WHERE status = 'pending';
 
 CREATE INDEX IF NOT EXISTS idx_ticket_reservation ON ticket(reservation_id);
 CREATE INDEX IF NOT EXISTS idx_ticket_event ON ticket(event_id);
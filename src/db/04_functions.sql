@@ -1,11 +1,20 @@
 CREATE OR REPLACE FUNCTION prevent_double_booking()
 RETURNS TRIGGER AS $$
 BEGIN
+    -- General admission ticket, no seat to book
+    IF NEW.seat_id IS NULL THEN
+        RETURN NEW;
+    END IF;
+
     IF EXISTS (
         SELECT 1 FROM event_seat
         WHERE event_id = NEW.event_id
           AND seat_id = NEW.seat_id
-          AND status IN ('SOLD','RESERVED')
+          AND (status IN ('SOLD','RESERVED')
+               -- Held by another reservation and not expired yet
+               OR (status = 'HOLD'
+                   AND held_by IS DISTINCT FROM NEW.reservation_id
+                   AND hold_expires_at > now()))
     ) THEN
         RAISE EXCEPTION 'Seat % already booked for event %',
             NEW.seat_id, NEW.event_id;
@@ -14,36 +23,84 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
--- Removed from project scope
-/*CREATE OR REPLACE FUNCTION check_hold_expiration()
-RETURNS TRIGGER AS $$
+-- Sweeper: expired holds back to AVAILABLE, set based through idx_event_seat_hold_expiry.
+-- Seats locked by a buyer are skipped (next run). Returns the number of seats released.
+CREATE OR REPLACE FUNCTION release_expired_holds(p_limit INTEGER DEFAULT 1000)
+RETURNS INTEGER AS $$
+DECLARE
+    released INTEGER;
 BEGIN
-    IF NEW.status = 'HOLD'
-       AND NEW.hold_expires_at IS NOT NULL
-       AND NEW.hold_expires_at < NOW() THEN
-        NEW.status := 'AVAILABLE';
-        NEW.hold_expires_at := NULL;
-    END IF;
-    RETURN NEW;
+    WITH expired AS (
+        SELECT event_id, seat_id
+        FROM event_seat
+        WHERE status = 'HOLD' AND hold_expires_at < now()
+        ORDER BY hold_expires_at
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE event_seat es
+    SET status = 'AVAILABLE', hold_expires_at = NULL, held_by = NULL
+    FROM expired
+    WHERE es.event_id = expired.event_id AND es.seat_id = expired.seat_id;
+
+    GET DIAGNOSTICS released = ROW_COUNT;
+    RETURN released;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Pending reservations abandoned before payment (their seats go back on sale through the trigger)
+CREATE OR REPLACE FUNCTION expire_pending_reservations(p_older_than INTERVAL)
+RETURNS INTEGER AS $$
+DECLARE
+    expired_count INTEGER;
+BEGIN
+    WITH stale AS (
+        SELECT id
+        FROM reservation
+        WHERE status = 'pending' AND reservation_time < now() - p_older_than
+        ORDER BY id
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE reservation r
+    SET status = 'expired'
+    FROM stale
+    WHERE r.id = stale.id;
+
+    GET DIAGNOSTICS expired_count = ROW_COUNT;
+    RETURN expired_count;
 END;
-$$ LANGUAGE plpgsql;*/
+$$ LANGUAGE plpgsql;
 
 CREATE OR REPLACE FUNCTION sync_seat_with_reservation()
 RETURNS TRIGGER AS $$
+DECLARE
+    ga_tickets INTEGER;
+    ga_sold INTEGER;
 BEGIN
     -- Reservation is now 'paid' → mark seats as SOLD
     IF NEW.status = 'paid' AND (OLD.status IS DISTINCT FROM 'paid') THEN
         UPDATE event_seat es
-        SET status = 'SOLD'
+        SET status = 'SOLD', hold_expires_at = NULL, held_by = NULL
         FROM ticket t
         WHERE t.reservation_id = NEW.id
           AND es.event_id = t.event_id
           AND es.seat_id = t.seat_id;
 
+        -- General admission places sold
+        UPDATE ticket
+        SET place_status = 'SOLD'
+        WHERE reservation_id = NEW.id AND seat_id IS NULL AND place_status = 'RESERVED';
+        GET DIAGNOSTICS ga_tickets = ROW_COUNT;
+
+        IF ga_tickets > 0 THEN
+            PERFORM add_to_event_capacity(NEW.event_id, 0, ga_tickets);
+            PERFORM add_to_event_counters(NEW.event_id, 0, -ga_tickets, ga_tickets);
+        END IF;
+
     -- Reservation is now 'pending' → mark seats as RESERVED
     ELSIF NEW.status = 'pending' AND (OLD.status IS DISTINCT FROM 'pending') THEN
         UPDATE event_seat es
-        SET status = 'RESERVED'
+        SET status = 'RESERVED', hold_expires_at = NULL, held_by = NULL
         FROM ticket t
         WHERE t.reservation_id = NEW.id
           AND es.event_id = t.event_id
@@ -54,11 +111,43 @@ BEGIN
           AND (OLD.status IS DISTINCT FROM NEW.status OR OLD.status IS DISTINCT FROM 'cancelled')
     THEN
         UPDATE event_seat es
-        SET status = 'AVAILABLE' /*, hold_expires_at = NULL*/
+        SET status = 'AVAILABLE', hold_expires_at = NULL, held_by = NULL
         FROM ticket t
         WHERE t.reservation_id = NEW.id
           AND es.event_id = t.event_id
           AND es.seat_id = t.seat_id;
+
+        -- Seats still held on the seat map
+        UPDATE event_seat
+        SET status = 'AVAILABLE', hold_expires_at = NULL, held_by = NULL
+        WHERE held_by = NEW.id AND status = 'HOLD';
+
+        -- General admission places given back, paid ones too (their tickets are kept)
+        WITH released AS (
+            UPDATE ticket t
+            SET place_status = 'AVAILABLE'
+            FROM (
+                SELECT id, place_status
+                FROM ticket
+                WHERE reservation_id = NEW.id AND seat_id IS NULL AND place_status <> 'AVAILABLE'
+                FOR UPDATE
+            ) before
+            WHERE t.id = before.id
+            RETURNING before.place_status
+        )
+        SELECT COUNT(*), COUNT(*) FILTER (WHERE place_status = 'SOLD')
+        INTO ga_tickets, ga_sold
+        FROM released;
+
+        IF ga_tickets > 0 THEN
+            PERFORM add_to_event_capacity(NEW.event_id, ga_tickets, -ga_sold);
+            PERFORM add_to_event_counters(NEW.event_id, ga_tickets, -(ga_tickets - ga_sold), -ga_sold);
+        END IF;
+
+        -- Unpaid tickets would keep their seat (unique_seat_per_event) and block the resale
+        IF OLD.status IS DISTINCT FROM 'paid' THEN
+            DELETE FROM ticket WHERE reservation_id = NEW.id;
+        END IF;
     END IF;
 
     RETURN NEW;
@@ -93,6 +182,14 @@ RETURNS TRIGGER AS $$
 DECLARE
     seat_exists BOOLEAN;
 BEGIN
+    -- No seat: only for general admission events
+    IF NEW.seat_id IS NULL THEN
+        IF NOT EXISTS (SELECT 1 FROM event WHERE id = NEW.event_id AND general_admission) THEN
+            RAISE EXCEPTION 'A seat is needed for event %', NEW.event_id;
+        END IF;
+        RETURN NEW;
+    END IF;
+
     SELECT EXISTS(
         SELECT 1 FROM event_seat
         WHERE event_id = NEW.event_id AND seat_id = NEW.seat_id
@@ -106,36 +203,64 @@ END;
 $$ LANGUAGE plpgsql;
 
 -- tigger when tickets inserted (because reservation already created and no update)
+-- Statement level: one update for all the tickets inserted together (new_tickets transition table)
 CREATE OR REPLACE FUNCTION sync_seats_with_ticket()
 RETURNS TRIGGER AS $$
 BEGIN
-    -- Get the reservation status
-    DECLARE
-        res_status reservation_status;
-    BEGIN
-        SELECT status INTO res_status
-        FROM reservation
-        WHERE id = NEW.reservation_id;
-
-        -- Update seat based on reservation status
-        IF res_status = 'pending' THEN
-            UPDATE event_seat
-            SET status = 'RESERVED'
-            WHERE event_id = NEW.event_id AND seat_id = NEW.seat_id;
-        ELSIF res_status = 'paid' THEN
-            UPDATE event_seat
-            SET status = 'SOLD'
-            WHERE event_id = NEW.event_id AND seat_id = NEW.seat_id;
-        END IF;
-    END;
-    RETURN NEW;
+    -- Update seats based on reservation status
+    UPDATE event_seat es
+    SET status = CASE r.status
+                     WHEN 'paid' THEN 'SOLD'::seat_status
+                     ELSE 'RESERVED'::seat_status
+                 END,
+        hold_expires_at = NULL,
+        held_by = NULL
+    FROM new_tickets nt
+    JOIN reservation r ON r.id = nt.reservation_id
+    WHERE r.status IN ('pending', 'paid')
+      AND es.event_id = nt.event_id
+      AND es.seat_id = nt.seat_id;
+
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
 
 CREATE OR REPLACE FUNCTION add_seats_to_event_when_created()
 RETURNS TRIGGER AS $$
+DECLARE
+    v_capacity INTEGER;
+    v_shards INTEGER;
 BEGIN
+    -- General admission: capacity counter instead of one row per seat
+    IF NEW.general_admission THEN
+        v_capacity := NEW.capacity;
+        IF v_capacity IS NULL THEN
+            SELECT COUNT(*) INTO v_capacity
+            FROM seat s
+            JOIN config_with_sector cws ON s.sector_id = cws.sector_id
+            WHERE cws.config_id = NEW.config_id
+              AND s.room_id = NEW.room_id;
+
+            UPDATE event SET capacity = v_capacity WHERE id = NEW.id;
+        END IF;
+
+        -- Up to 8 shards, the places spread evenly
+        v_shards := GREATEST(LEAST(8, v_capacity), 1);
+        INSERT INTO event_capacity_shard (event_id, shard, remaining)
+        SELECT NEW.id, n, v_capacity / v_shards + CASE WHEN n < v_capacity % v_shards THEN 1 ELSE 0 END
+        FROM generate_series(0, v_shards - 1) AS n;
+
+        -- Statistics row, the event_seat triggers never see these events
+        INSERT INTO event_counters AS c (event_id, seats_total, seats_available)
+        VALUES (NEW.id, v_capacity, v_capacity)
+        ON CONFLICT (event_id) DO UPDATE
+        SET seats_total = EXCLUDED.seats_total,
+            seats_available = EXCLUDED.seats_available;
+
+        RETURN NEW;
+    END IF;
+
     -- Insert all seats for the configuration into event_seat
     INSERT INTO event_seat (event_id, seat_id, status)
     SELECT NEW.id, s.id, 'AVAILABLE'
@@ -147,4 +272,687 @@ BEGIN
 
     RETURN NEW;
 END;
-$$ LANGUAGE plpgsql;
\ No newline at end of file
+$$ LANGUAGE plpgsql;
+
+-- Take p_count general admission places, raises when the event is sold out.
+-- Usually one random shard with enough places, skipping the ones locked by other sales.
+CREATE OR REPLACE FUNCTION take_event_capacity(p_event_id INTEGER, p_count INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    v_shard RECORD;
+    v_left INTEGER := p_count;
+    v_take INTEGER;
+BEGIN
+    UPDATE event_capacity_shard c
+    SET remaining = c.remaining - p_count
+    WHERE c.event_id = p_event_id
+      AND c.shard = (
+          SELECT shard
+          FROM event_capacity_shard
+          WHERE event_id = p_event_id AND remaining >= p_count
+          ORDER BY random()
+          LIMIT 1
+          FOR UPDATE SKIP LOCKED
+      );
+
+    IF FOUND THEN
+        RETURN;
+    END IF;
+
+    -- Places spread over several shards (or all busy): lock them all in order and take what is left
+    FOR v_shard IN
+        SELECT shard, remaining
+        FROM event_capacity_shard
+        WHERE event_id = p_event_id
+        ORDER BY shard
+        FOR UPDATE
+    LOOP
+        v_take := LEAST(v_left, v_shard.remaining);
+        IF v_take > 0 THEN
+            UPDATE event_capacity_shard
+            SET remaining = remaining - v_take
+            WHERE event_id = p_event_id AND shard = v_shard.shard;
+            v_left := v_left - v_take;
+        END IF;
+        EXIT WHEN v_left = 0;
+    END LOOP;
+
+    IF v_left > 0 THEN
+        RAISE EXCEPTION 'Event % is sold out', p_event_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Give back places / count sold places on any free shard (waits on shard 0 if all are busy)
+CREATE OR REPLACE FUNCTION add_to_event_capacity(p_event_id INTEGER, p_remaining INTEGER, p_sold INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    UPDATE event_capacity_shard c
+    SET remaining = c.remaining + p_remaining,
+        sold = c.sold + p_sold
+    WHERE c.event_id = p_event_id
+      AND c.shard = (
+          SELECT shard
+          FROM event_capacity_shard
+          WHERE event_id = p_event_id AND sold >= -LEAST(p_sold, 0)
+          ORDER BY random()
+          LIMIT 1
+          FOR UPDATE SKIP LOCKED
+      );
+
+    IF NOT FOUND THEN
+        UPDATE event_capacity_shard
+        SET remaining = remaining + p_remaining,
+            sold = sold + p_sold
+        WHERE event_id = p_event_id AND shard = 0;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statistics of a general admission event (event_counters), for places taken / given back / sold
+CREATE OR REPLACE FUNCTION add_to_event_counters(p_event_id INTEGER, p_available INTEGER,
+                                                 p_reserved INTEGER, p_sold INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    UPDATE event_counters
+    SET seats_available = seats_available + p_available,
+        reserved = reserved + p_reserved,
+        sold = sold + p_sold
+    WHERE event_id = p_event_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- General admission tickets (no seat) take / give back their place
+CREATE OR REPLACE FUNCTION count_general_admission_tickets()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_event RECORD;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        FOR v_event IN
+            SELECT event_id, COUNT(*) AS tickets
+            FROM new_tickets
+            WHERE seat_id IS NULL
+            GROUP BY event_id
+            ORDER BY event_id
+        LOOP
+            PERFORM take_event_capacity(v_event.event_id, v_event.tickets::INTEGER);
+            PERFORM add_to_event_counters(v_event.event_id, -v_event.tickets::INTEGER, v_event.tickets::INTEGER, 0);
+        END LOOP;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        -- The ticket's own place status: its reservation may be deleted by the same statement
+        FOR v_event IN
+            SELECT event_id,
+                   COUNT(*) AS tickets,
+                   COUNT(*) FILTER (WHERE place_status = 'SOLD') AS sold
+            FROM old_tickets
+            WHERE seat_id IS NULL AND place_status <> 'AVAILABLE'
+            GROUP BY event_id
+            ORDER BY event_id
+        LOOP
+            PERFORM add_to_event_capacity(v_event.event_id, v_event.tickets::INTEGER, -v_event.sold::INTEGER);
+            PERFORM add_to_event_counters(v_event.event_id, v_event.tickets::INTEGER,
+                                          -(v_event.tickets - v_event.sold)::INTEGER, -v_event.sold::INTEGER);
+        END LOOP;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- New version for a changed seat (status or hold time): the changing transaction, see get_seat_changes_since.
+-- Transaction ids do not follow commit order, a sequence number would let a poll skip slower commits.
+CREATE OR REPLACE FUNCTION bump_event_seat_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.version := pg_current_xact_id()::TEXT::BIGINT;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Seat map geometry of a room changed (seat, sector or sector placement in a configuration):
+-- the seat maps keyed by the older version are rebuilt (src/qt/venue_geometry.py)
+CREATE OR REPLACE FUNCTION bump_room_layout_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE room
+    SET layout_version = layout_version + 1
+    WHERE id IN (
+        SELECT COALESCE((changed->>'room_id')::INTEGER,
+                        (SELECT room_id FROM sector WHERE id = (changed->>'sector_id')::INTEGER))
+        FROM unnest(ARRAY[to_jsonb(OLD), to_jsonb(NEW)]) AS changed
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Lower case without French accents, so "theatre" finds "Théâtre" (no unaccent extension needed)
+CREATE OR REPLACE FUNCTION fold_search_text(p_text TEXT)
+RETURNS TEXT AS $$
+    SELECT translate(lower(p_text),
+                     'àâäáãåçéèêëíìîïñóòôöõúùûüýÿæœÀÂÄÁÃÅÇÉÈÊËÍÌÎÏÑÓÒÔÖÕÚÙÛÜÝŸÆŒ',
+                     'aaaaaaceeeeiiiinooooouuuuyyaoaaaaaaceeeeiiiinooooouuuuyyao');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Search words of an event: its name and the name of its type
+CREATE OR REPLACE FUNCTION update_event_search_vector()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('simple', fold_search_text(
+        NEW.name || ' ' || COALESCE((SELECT name FROM type_of_event WHERE id = NEW.type_id), '')));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Renamed type: search words of its events
+CREATE OR REPLACE FUNCTION update_type_search_vectors()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE event
+    SET search_vector = to_tsvector('simple', fold_search_text(name || ' ' || NEW.name))
+    WHERE type_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Best available seats for a reservation, held for p_hold_seconds and returned.
+-- Seats locked by a concurrent buyer are skipped (SKIP LOCKED): two quick sales never take nor wait for the same seats.
+-- p_sector: only this sector, p_contiguous: try a block of consecutive seats (seat map order) in one sector first.
+-- Raises if fewer than p_count seats are free.
+CREATE OR REPLACE FUNCTION allocate_seats(
+    p_event_id INTEGER,
+    p_count INTEGER,
+    p_reservation_id INTEGER,
+    p_sector VARCHAR DEFAULT NULL,
+    p_contiguous BOOLEAN DEFAULT FALSE,
+    p_hold_seconds INTEGER DEFAULT 600
+)
+RETURNS TABLE (seat_id INTEGER, seat_name VARCHAR, sector_name VARCHAR, supplement NUMERIC) AS $$
+#variable_conflict use_column
+DECLARE
+    v_block RECORD;
+    v_seat_ids INTEGER[];
+BEGIN
+    IF p_contiguous THEN
+        -- Runs of consecutive free seats per sector (gaps and islands), a few candidates only
+        FOR v_block IN
+            SELECT f.sector_id, MIN(f.seat_id) AS first_seat
+            FROM (
+                SELECT s.sector_id,
+                       es.seat_id,
+                       es.seat_id - ROW_NUMBER() OVER (PARTITION BY s.sector_id ORDER BY es.seat_id) AS island
+                FROM event_seat es
+                JOIN seat s ON s.id = es.seat_id
+                JOIN sector sec ON sec.id = s.sector_id
+                WHERE es.event_id = p_event_id
+                  AND (es.status = 'AVAILABLE' OR (es.status = 'HOLD' AND es.hold_expires_at < now()))
+                  AND (p_sector IS NULL OR sec.name = p_sector)
+            ) f
+            GROUP BY f.sector_id, f.island
+            HAVING COUNT(*) >= p_count
+            ORDER BY first_seat
+            LIMIT 5
+        LOOP
+            SELECT array_agg(b.seat_id ORDER BY b.seat_id)
+            INTO v_seat_ids
+            FROM (
+                SELECT es.seat_id
+                FROM event_seat es
+                JOIN seat s ON s.id = es.seat_id
+                WHERE es.event_id = p_event_id
+                  AND s.sector_id = v_block.sector_id
+                  AND es.seat_id >= v_block.first_seat
+                  AND (es.status = 'AVAILABLE' OR (es.status = 'HOLD' AND es.hold_expires_at < now()))
+                ORDER BY es.seat_id
+                LIMIT p_count
+                FOR UPDATE OF es SKIP LOCKED
+            ) b;
+
+            -- Still one block once locked (a concurrent buyer may have taken a seat in between)
+            EXIT WHEN cardinality(v_seat_ids) = p_count
+                  AND v_seat_ids[p_count] - v_seat_ids[1] = p_count - 1;
+            v_seat_ids := NULL;
+        END LOOP;
+    END IF;
+
+    IF v_seat_ids IS NULL THEN
+        SELECT array_agg(a.seat_id ORDER BY a.seat_id)
+        INTO v_seat_ids
+        FROM (
+            SELECT es.seat_id
+            FROM event_seat es
+            JOIN seat s ON s.id = es.seat_id
+            JOIN sector sec ON sec.id = s.sector_id
+            WHERE es.event_id = p_event_id
+              AND (es.status = 'AVAILABLE' OR (es.status = 'HOLD' AND es.hold_expires_at < now()))
+              AND (p_sector IS NULL OR sec.name = p_sector)
+            ORDER BY es.seat_id
+            LIMIT p_count
+            FOR UPDATE OF es SKIP LOCKED
+        ) a;
+    END IF;
+
+    IF COALESCE(cardinality(v_seat_ids), 0) < p_count THEN
+        RAISE EXCEPTION 'Only % seats available for event %', COALESCE(cardinality(v_seat_ids), 0), p_event_id;
+    END IF;
+
+    UPDATE event_seat es
+    SET status = 'HOLD',
+        hold_expires_at = now() + make_interval(secs => p_hold_seconds),
+        held_by = p_reservation_id
+    WHERE es.event_id = p_event_id AND es.seat_id = ANY(v_seat_ids);
+
+    RETURN QUERY
+    SELECT s.id, s.name, sec.name, sec.supplement
+    FROM seat s
+    JOIN sector sec ON sec.id = s.sector_id
+    WHERE s.id = ANY(v_seat_ids)
+    ORDER BY s.id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Whole purchase in one transaction: client, reservation and tickets
+-- p_tarifs: [{"name": "Normal", "quantity": 2}, ...] (one ticket per unit, in this order)
+-- p_seat_ids: chosen seats, NULL to let allocate_seats pick them (events without seat selection)
+CREATE OR REPLACE FUNCTION checkout(
+    p_event_id INTEGER,
+    p_vendor INTEGER,
+    p_email VARCHAR,
+    p_firstname VARCHAR,
+    p_lastname VARCHAR,
+    p_tarifs JSONB,
+    p_seat_ids INTEGER[] DEFAULT NULL,
+    p_sector VARCHAR DEFAULT NULL,
+    p_contiguous BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE (reservation_id INTEGER, ticket_ids INTEGER[], total NUMERIC) AS $$
+#variable_conflict use_column
+DECLARE
+    v_client_id INTEGER;
+    v_reservation_id INTEGER;
+    v_tarif_names VARCHAR[];
+    v_seat_ids INTEGER[];
+    v_general_admission BOOLEAN;
+BEGIN
+    SELECT general_admission INTO v_general_admission
+    FROM event
+    WHERE id = p_event_id AND status IN ('on_sale', 'on_site');
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Event % is not on sale', p_event_id;
+    END IF;
+
+    -- One tarif name per ticket
+    SELECT array_agg(t.item->>'name' ORDER BY t.ord, n.i)
+    INTO v_tarif_names
+    FROM jsonb_array_elements(p_tarifs) WITH ORDINALITY AS t(item, ord)
+    CROSS JOIN LATERAL generate_series(1, (t.item->>'quantity')::INTEGER) AS n(i);
+
+    IF v_tarif_names IS NULL THEN
+        RAISE EXCEPTION 'No ticket requested for event %', p_event_id;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM unnest(v_tarif_names) AS requested(name)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM tarif
+            WHERE tarif.event_id = p_event_id AND tarif.name = requested.name
+        )
+    ) THEN
+        RAISE EXCEPTION 'Unknown tarif for event %', p_event_id;
+    END IF;
+
+    -- Client (online sales only), reuse the existing one with the same mail
+    IF p_email IS NOT NULL THEN
+        INSERT INTO client (mail, firstname, lastname)
+        VALUES (p_email, p_firstname, p_lastname)
+        ON CONFLICT (mail) DO NOTHING
+        RETURNING id INTO v_client_id;
+
+        IF v_client_id IS NULL THEN
+            SELECT id INTO v_client_id FROM client WHERE mail = p_email;
+        END IF;
+    END IF;
+
+    INSERT INTO reservation (event_id, vendor, client_id, status)
+    VALUES (p_event_id, p_vendor, v_client_id, 'pending')
+    RETURNING id INTO v_reservation_id;
+
+    IF v_general_admission THEN
+        -- No seats, the ticket trigger takes the places from the capacity counter
+        v_seat_ids := array_fill(NULL::INTEGER, ARRAY[cardinality(v_tarif_names)]);
+    ELSIF p_seat_ids IS NULL THEN
+        SELECT array_agg(a.seat_id ORDER BY a.seat_id)
+        INTO v_seat_ids
+        FROM allocate_seats(p_event_id, cardinality(v_tarif_names), v_reservation_id,
+                            p_sector, p_contiguous) a;
+    ELSE
+        v_seat_ids := p_seat_ids;
+    END IF;
+
+    IF coalesce(cardinality(v_seat_ids), 0) <> cardinality(v_tarif_names) THEN
+        RAISE EXCEPTION 'Not enough seats available for event %', p_event_id;
+    END IF;
+
+    -- Sector supplements only apply to seats chosen by the buyer
+    RETURN QUERY
+    WITH new_ticket AS (
+        INSERT INTO ticket (reservation_id, event_id, seat_id, tarif_name)
+        SELECT v_reservation_id, p_event_id, s.seat_id, s.tarif_name
+        FROM unnest(v_seat_ids, v_tarif_names) AS s(seat_id, tarif_name)
+        RETURNING ticket.id, ticket.seat_id, ticket.tarif_name
+    )
+    SELECT v_reservation_id,
+           array_agg(nt.id ORDER BY nt.id),
+           sum(tf.price + CASE WHEN p_seat_ids IS NULL AND p_sector IS NULL THEN 0
+                               ELSE COALESCE(sec.supplement, 0) END)
+    FROM new_ticket nt
+    JOIN tarif tf ON tf.event_id = p_event_id AND tf.name = nt.tarif_name
+    LEFT JOIN seat s ON s.id = nt.seat_id
+    LEFT JOIN sector sec ON sec.id = s.sector_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Scan a ticket at a door in one call.
+-- The unique ticket_id on scan_ticket decides between two doors scanning the same ticket.
+-- outcome: valid, unknown, wrong_event, unpaid or already_scanned (with the first scan time and door)
+CREATE OR REPLACE FUNCTION record_ticket_scan(
+    p_ticket_id INTEGER,
+    p_staff_id INTEGER,
+    p_door VARCHAR,
+    p_event_id INTEGER DEFAULT NULL
+)
+RETURNS TABLE(outcome TEXT, scanned_at TIMESTAMP, scanned_door VARCHAR) AS $$
+DECLARE
+    v_event_id INTEGER;
+    v_status reservation_status;
+BEGIN
+    SELECT t.event_id, r.status INTO v_event_id, v_status
+    FROM ticket t
+    JOIN reservation r ON r.id = t.reservation_id
+    WHERE t.id = p_ticket_id;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'unknown'::TEXT, NULL::TIMESTAMP, NULL::VARCHAR;
+        RETURN;
+    END IF;
+
+    IF p_event_id IS NOT NULL AND v_event_id <> p_event_id THEN
+        RETURN QUERY SELECT 'wrong_event'::TEXT, NULL::TIMESTAMP, NULL::VARCHAR;
+        RETURN;
+    END IF;
+
+    IF v_status <> 'paid' THEN
+        RETURN QUERY SELECT 'unpaid'::TEXT, NULL::TIMESTAMP, NULL::VARCHAR;
+        RETURN;
+    END IF;
+
+    -- Concurrent door: waits for the other insert, then does nothing
+    RETURN QUERY
+    INSERT INTO scan_ticket (staff_id, door, ticket_id)
+    VALUES (p_staff_id, p_door, p_ticket_id)
+    ON CONFLICT (ticket_id) DO NOTHING
+    RETURNING 'valid'::TEXT, scan_ticket.scan_time, scan_ticket.door;
+
+    IF NOT FOUND THEN
+        RETURN QUERY
+        SELECT 'already_scanned'::TEXT, s.scan_time, s.door
+        FROM scan_ticket s
+        WHERE s.ticket_id = p_ticket_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- event_counters: statement level triggers, one write per event touched by the statement
+-- (transition tables only exist for their own operation, hence one branch per TG_OP)
+CREATE OR REPLACE FUNCTION count_event_seats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO event_counters AS c (event_id, seats_total, seats_available, reserved, sold)
+        SELECT event_id,
+               COUNT(*),
+               COUNT(*) FILTER (WHERE status = 'AVAILABLE'),
+               COUNT(*) FILTER (WHERE status IN ('RESERVED', 'HOLD')),
+               COUNT(*) FILTER (WHERE status = 'SOLD')
+        FROM new_seats
+        GROUP BY event_id
+        ORDER BY event_id
+        ON CONFLICT (event_id) DO UPDATE
+        SET seats_total = c.seats_total + EXCLUDED.seats_total,
+            seats_available = c.seats_available + EXCLUDED.seats_available,
+            reserved = c.reserved + EXCLUDED.reserved,
+            sold = c.sold + EXCLUDED.sold;
+
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Only the seats whose status changed
+        UPDATE event_counters c
+        SET seats_available = c.seats_available + d.available,
+            reserved = c.reserved + d.reserved,
+            sold = c.sold + d.sold
+        FROM (
+            SELECT ns.event_id,
+                   SUM((ns.status = 'AVAILABLE')::INTEGER - (os.status = 'AVAILABLE')::INTEGER) AS available,
+                   SUM((ns.status IN ('RESERVED', 'HOLD'))::INTEGER - (os.status IN ('RESERVED', 'HOLD'))::INTEGER) AS reserved,
+                   SUM((ns.status = 'SOLD')::INTEGER - (os.status = 'SOLD')::INTEGER) AS sold
+            FROM new_seats ns
+            JOIN old_seats os ON os.event_id = ns.event_id AND os.seat_id = ns.seat_id
+            WHERE ns.status <> os.status
+            GROUP BY ns.event_id
+        ) d
+        WHERE c.event_id = d.event_id;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE event_counters c
+        SET seats_total = c.seats_total - d.total,
+            seats_available = c.seats_available - d.available,
+            reserved = c.reserved - d.reserved,
+            sold = c.sold - d.sold
+        FROM (
+            SELECT event_id,
+                   COUNT(*) AS total,
+                   COUNT(*) FILTER (WHERE status = 'AVAILABLE') AS available,
+                   COUNT(*) FILTER (WHERE status IN ('RESERVED', 'HOLD')) AS reserved,
+                   COUNT(*) FILTER (WHERE status = 'SOLD') AS sold
+            FROM old_seats
+            GROUP BY event_id
+        ) d
+        WHERE c.event_id = d.event_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION count_event_scans()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE event_counters c
+        SET scanned = c.scanned + d.scanned
+        FROM (
+            SELECT t.event_id, COUNT(*) AS scanned
+            FROM new_scans s
+            JOIN ticket t ON t.id = s.ticket_id
+            GROUP BY t.event_id
+        ) d
+        WHERE c.event_id = d.event_id;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        -- Scans removed with their ticket (cascade) are not found here, refresh_event_counters() recounts them
+        UPDATE event_counters c
+        SET scanned = c.scanned - d.scanned
+        FROM (
+            SELECT t.event_id, COUNT(*) AS scanned
+            FROM old_scans s
+            JOIN ticket t ON t.id = s.ticket_id
+            GROUP BY t.event_id
+        ) d
+        WHERE c.event_id = d.event_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION count_event_revenue()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE event_counters c
+        SET revenue = c.revenue + d.revenue
+        FROM (
+            SELECT r.event_id, SUM(p.total) AS revenue
+            FROM new_payments p
+            JOIN reservation r ON r.id = p.reservation_id
+            GROUP BY r.event_id
+        ) d
+        WHERE c.event_id = d.event_id;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE event_counters c
+        SET revenue = c.revenue - d.revenue
+        FROM (
+            SELECT r.event_id, SUM(p.total) AS revenue
+            FROM old_payments p
+            JOIN reservation r ON r.id = p.reservation_id
+            GROUP BY r.event_id
+        ) d
+        WHERE c.event_id = d.event_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute event_counters from scratch (existing databases, or to check the triggers)
+CREATE OR REPLACE FUNCTION refresh_event_counters()
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO event_counters AS c (event_id, seats_total, seats_available, reserved, sold, scanned, revenue)
+    SELECT e.id,
+           COALESCE(es.total, 0),
+           COALESCE(es.available, 0),
+           COALESCE(es.reserved, 0),
+           COALESCE(es.sold, 0),
+           COALESCE(sc.scanned, 0),
+           COALESCE(pay.revenue, 0)
+    FROM event e
+    LEFT JOIN (
+        SELECT event_id,
+               COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE status = 'AVAILABLE') AS available,
+               COUNT(*) FILTER (WHERE status IN ('RESERVED', 'HOLD')) AS reserved,
+               COUNT(*) FILTER (WHERE status = 'SOLD') AS sold
+        FROM event_seat
+        GROUP BY event_id
+        UNION ALL
+        -- General admission: from the capacity shards
+        SELECT s.event_id,
+               MAX(ev.capacity),
+               SUM(s.remaining),
+               MAX(ev.capacity) - SUM(s.remaining) - SUM(s.sold),
+               SUM(s.sold)
+        FROM event_capacity_shard s
+        JOIN event ev ON ev.id = s.event_id
+        GROUP BY s.event_id
+    ) es ON es.event_id = e.id
+    LEFT JOIN (
+        SELECT t.event_id, COUNT(*) AS scanned
+        FROM scan_ticket s
+        JOIN ticket t ON t.id = s.ticket_id
+        GROUP BY t.event_id
+    ) sc ON sc.event_id = e.id
+    LEFT JOIN (
+        SELECT r.event_id, SUM(p.total) AS revenue
+        FROM payment p
+        JOIN reservation r ON r.id = p.reservation_id
+        GROUP BY r.event_id
+    ) pay ON pay.event_id = e.id
+    ORDER BY e.id
+    ON CONFLICT (event_id) DO UPDATE
+    SET seats_total = EXCLUDED.seats_total,
+        seats_available = EXCLUDED.seats_available,
+        reserved = EXCLUDED.reserved,
+        sold = EXCLUDED.sold,
+        scanned = EXCLUDED.scanned,
+        revenue = EXCLUDED.revenue;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Change feed: compact NOTIFY payloads for the listening apps (src/db/change_feed.py).
+-- Ids are NULL when a statement changed too many rows for one payload: listeners reload everything.
+CREATE OR REPLACE FUNCTION notify_event_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_ids INTEGER[];
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        SELECT array_agg(id ORDER BY id) INTO v_ids FROM old_events;
+    ELSE
+        SELECT array_agg(id ORDER BY id) INTO v_ids FROM new_events;
+    END IF;
+
+    IF v_ids IS NOT NULL THEN
+        PERFORM pg_notify('event_changes', json_build_object(
+            'op', lower(TG_OP),
+            'ids', CASE WHEN cardinality(v_ids) <= 500 THEN v_ids END)::TEXT);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Seats whose status changed: newest version per event, seat maps then call get_seat_changes_since
+CREATE OR REPLACE FUNCTION notify_seat_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_events JSON;
+    v_count INTEGER;
+BEGIN
+    SELECT json_object_agg(event_id, version), COUNT(*)
+    INTO v_events, v_count
+    FROM (
+        SELECT ns.event_id, MAX(ns.version) AS version
+        FROM new_seats ns
+        JOIN old_seats os ON os.event_id = ns.event_id AND os.seat_id = ns.seat_id
+        WHERE ns.status <> os.status
+        GROUP BY ns.event_id
+    ) changed;
+
+    IF v_count > 0 THEN
+        PERFORM pg_notify('seat_changes', json_build_object(
+            'events', CASE WHEN v_count <= 200 THEN v_events END)::TEXT);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- New reservations and status changes (paid, cancelled, expired...)
+CREATE OR REPLACE FUNCTION notify_reservation_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_ids INTEGER[];
+    v_events INTEGER[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(id ORDER BY id), array_agg(DISTINCT event_id)
+        INTO v_ids, v_events
+        FROM new_reservations;
+    ELSE
+        SELECT array_agg(nr.id ORDER BY nr.id), array_agg(DISTINCT nr.event_id)
+        INTO v_ids, v_events
+        FROM new_reservations nr
+        JOIN old_reservations orr ON orr.id = nr.id
+        WHERE nr.status <> orr.status;
+    END IF;
+
+    IF v_ids IS NOT NULL THEN
+        PERFORM pg_notify('reservation_changes', json_build_object(
+            'op', lower(TG_OP),
+            'ids', CASE WHEN cardinality(v_ids) <= 500 THEN v_ids END,
+            'events', CASE WHEN cardinality(v_events) <= 200 THEN v_events END)::TEXT);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
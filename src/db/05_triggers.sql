@@ -3,12 +3,6 @@ BEFORE INSERT ON ticket
 FOR EACH ROW
 EXECUTE FUNCTION prevent_double_booking();
 
--- Removed from project scope
-/*CREATE OR REPLACE TRIGGER trg_check_hold_expiration
-BEFORE UPDATE ON event_seat
-FOR EACH ROW
-EXECUTE FUNCTION check_hold_expiration();*/
-
 CREATE OR REPLACE TRIGGER trg_sync_seats_with_reservation
 AFTER INSERT OR UPDATE ON reservation
 FOR EACH ROW
@@ -26,11 +20,139 @@ EXECUTE FUNCTION check_event_capacity();
 
 CREATE TRIGGER trg_sync_seats_on_ticket
 AFTER INSERT ON ticket
-FOR EACH ROW
+REFERENCING NEW TABLE AS new_tickets
+FOR EACH STATEMENT
 EXECUTE FUNCTION sync_seats_with_ticket();
 
+-- General admission places taken / given back by tickets without seat
+CREATE TRIGGER trg_general_admission_ticket_insert
+AFTER INSERT ON ticket
+REFERENCING NEW TABLE AS new_tickets
+FOR EACH STATEMENT
+EXECUTE FUNCTION count_general_admission_tickets();
+
+CREATE TRIGGER trg_general_admission_ticket_delete
+AFTER DELETE ON ticket
+REFERENCING OLD TABLE AS old_tickets
+FOR EACH STATEMENT
+EXECUTE FUNCTION count_general_admission_tickets();
+
+CREATE OR REPLACE TRIGGER trg_bump_event_seat_version
+BEFORE UPDATE ON event_seat
+FOR EACH ROW
+WHEN (OLD.status IS DISTINCT FROM NEW.status
+      OR OLD.hold_expires_at IS DISTINCT FROM NEW.hold_expires_at)
+EXECUTE FUNCTION bump_event_seat_version();
+
+-- Seat map geometry (room.layout_version)
+CREATE OR REPLACE TRIGGER trg_bump_room_layout_version_seat
+AFTER INSERT OR DELETE OR UPDATE OF seat_row, seat_col, pos_x, pos_y, sector_id, room_id ON seat
+FOR EACH ROW
+EXECUTE FUNCTION bump_room_layout_version();
+
+CREATE OR REPLACE TRIGGER trg_bump_room_layout_version_sector
+AFTER INSERT OR DELETE OR UPDATE OF name, room_id ON sector
+FOR EACH ROW
+EXECUTE FUNCTION bump_room_layout_version();
+
+CREATE OR REPLACE TRIGGER trg_bump_room_layout_version_config
+AFTER INSERT OR DELETE OR UPDATE OF grid_row, grid_col, row_span, col_span, wide_seats, sector_id, config_id
+ON config_with_sector
+FOR EACH ROW
+EXECUTE FUNCTION bump_room_layout_version();
+
+CREATE OR REPLACE TRIGGER trg_update_event_search_vector
+BEFORE INSERT OR UPDATE OF name, type_id ON event
+FOR EACH ROW
+EXECUTE FUNCTION update_event_search_vector();
+
+CREATE OR REPLACE TRIGGER trg_update_type_search_vectors
+AFTER UPDATE OF name ON type_of_event
+FOR EACH ROW
+WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION update_type_search_vectors();
 
 CREATE OR REPLACE TRIGGER trg_add_seats_to_event_when_created
 AFTER INSERT ON event
 FOR EACH ROW
-EXECUTE FUNCTION add_seats_to_event_when_created();
\ No newline at end of file
+EXECUTE FUNCTION add_seats_to_event_when_created();
+
+-- event_counters (transition tables need one trigger per operation)
+CREATE OR REPLACE TRIGGER trg_count_event_seats_insert
+AFTER INSERT ON event_seat
+REFERENCING NEW TABLE AS new_seats
+FOR EACH STATEMENT
+EXECUTE FUNCTION count_event_seats();
+
+CREATE OR REPLACE TRIGGER trg_count_event_seats_update
+AFTER UPDATE ON event_seat
+REFERENCING OLD TABLE AS old_seats NEW TABLE AS new_seats
+FOR EACH STATEMENT
+EXECUTE FUNCTION count_event_seats();
+
+CREATE OR REPLACE TRIGGER trg_count_event_seats_delete
+AFTER DELETE ON event_seat
+REFERENCING OLD TABLE AS old_seats
+FOR EACH STATEMENT
+EXECUTE FUNCTION count_event_seats();
+
+CREATE OR REPLACE TRIGGER trg_count_event_scans_insert
+AFTER INSERT ON scan_ticket
+REFERENCING NEW TABLE AS new_scans
+FOR EACH STATEMENT
+EXECUTE FUNCTION count_event_scans();
+
+CREATE OR REPLACE TRIGGER trg_count_event_scans_delete
+AFTER DELETE ON scan_ticket
+REFERENCING OLD TABLE AS old_scans
+FOR EACH STATEMENT
+EXECUTE FUNCTION count_event_scans();
+
+CREATE OR REPLACE TRIGGER trg_count_event_revenue_insert
+AFTER INSERT ON payment
+REFERENCING NEW TABLE AS new_payments
+FOR EACH STATEMENT
+EXECUTE FUNCTION count_event_revenue();
+
+CREATE OR REPLACE TRIGGER trg_count_event_revenue_delete
+AFTER DELETE ON payment
+REFERENCING OLD TABLE AS old_payments
+FOR EACH STATEMENT
+EXECUTE FUNCTION count_event_revenue();
+
+-- Change feed (NOTIFY event_changes / seat_changes / reservation_changes)
+CREATE OR REPLACE TRIGGER trg_notify_event_changes_insert
+AFTER INSERT ON event
+REFERENCING NEW TABLE AS new_events
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_event_changes();
+
+CREATE OR REPLACE TRIGGER trg_notify_event_changes_update
+AFTER UPDATE ON event
+REFERENCING NEW TABLE AS new_events
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_event_changes();
+
+CREATE OR REPLACE TRIGGER trg_notify_event_changes_delete
+AFTER DELETE ON event
+REFERENCING OLD TABLE AS old_events
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_event_changes();
+
+CREATE OR REPLACE TRIGGER trg_notify_seat_changes
+AFTER UPDATE ON event_seat
+REFERENCING OLD TABLE AS old_seats NEW TABLE AS new_seats
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_seat_changes();
+
+CREATE OR REPLACE TRIGGER trg_notify_reservation_changes_insert
+AFTER INSERT ON reservation
+REFERENCING NEW TABLE AS new_reservations
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_reservation_changes();
+
+CREATE OR REPLACE TRIGGER trg_notify_reservation_changes_update
+AFTER UPDATE ON reservation
+REFERENCING OLD TABLE AS old_reservations NEW TABLE AS new_reservations
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_reservation_changes();
@@ -180,26 +180,35 @@ INSERT INTO seat (id, name, type_id, sector_id, room_id) VALUES
 (147, 'BD19', 4, 7, 1),
 (148, 'BD20', 4, 7, 1);
 
+-- Seat map rows / columns of each sector (seats numbered row by row)
+UPDATE seat s
+SET seat_row = (numbered.n - 1) / layout.cols,
+    seat_col = (numbered.n - 1) % layout.cols
+FROM (SELECT id, sector_id, ROW_NUMBER() OVER (PARTITION BY sector_id ORDER BY id) AS n FROM seat) numbered
+JOIN (VALUES (1, 10), (2, 10), (3, 2), (4, 2), (5, 15), (6, 2), (7, 2)) AS layout(sector_id, cols)
+    ON layout.sector_id = numbered.sector_id
+WHERE s.id = numbered.id;
+
 INSERT INTO configuration (id, name) VALUES
 (1, 'Main Floor'), -- sector 1
 (2, 'Balcony'), -- sector 2
 (3, 'Full Room'); -- sector 1 + 2
 
-INSERT INTO config_with_sector (config_id, sector_id) VALUES
-(1, 1), -- Main Floor only
-(1,2),
-(1,3),
-(1,4),
-(2,5), -- Balcony only
-(2,6),
-(2,7),
-(3, 1), -- Full room
-(3,2),
-(3,3),
-(3,4),
-(3,5),
-(3,6),
-(3,7);
+INSERT INTO config_with_sector (config_id, sector_id, grid_row, grid_col, row_span, col_span, wide_seats) VALUES
+(1, 1, 2, 1, 1, 3, false), -- Main Floor only
+(1, 2, 1, 2, 1, 1, false),
+(1, 3, 1, 1, 1, 1, true),
+(1, 4, 1, 3, 1, 1, true),
+(2, 5, 0, 1, 1, 3, false), -- Balcony only
+(2, 6, 0, 0, 3, 1, false),
+(2, 7, 0, 4, 3, 1, false),
+(3, 1, 2, 1, 1, 3, false), -- Full room
+(3, 2, 1, 2, 1, 1, false),
+(3, 3, 1, 1, 1, 1, true),
+(3, 4, 1, 3, 1, 1, true),
+(3, 5, 0, 1, 1, 3, false),
+(3, 6, 0, 0, 3, 1, false),
+(3, 7, 0, 4, 3, 1, false);
 
 INSERT INTO type_of_event (id, name, is_free, need_reservation) VALUES
 (1, 'Concert', false, true),
@@ -0,0 +1,140 @@
+"""
+Change feed of the database.
+Triggers (04_functions.sql) NOTIFY a compact JSON payload for each statement changing events, seats or reservations:
+    event_changes        {"op": "insert" | "update" | "delete", "ids": [event ids]}
+    seat_changes         {"events": {event id: newest seat version}}
+    reservation_changes  {"op": "insert" | "update", "ids": [reservation ids], "events": [event ids]}
+Ids / events are null when a statement changed too many rows. A ChangeListener thread LISTENs on its own
+connection and calls the subscribed callbacks on that thread, with None after a reconnection
+(changes may have been missed: reload everything).
+"""
+
+import atexit
+import json
+import select
+import threading
+
+from .connection import _open_dedicated_connection
+from .requests import _invalidate_event, get_all_events
+from .query_cache import clear_query_cache
+
+EVENT_CHANGES = "event_changes"
+SEAT_CHANGES = "seat_changes"
+RESERVATION_CHANGES = "reservation_changes"
+CHANNELS = (EVENT_CHANGES, SEAT_CHANGES, RESERVATION_CHANGES)
+
+# Seconds between checks of stop(), and before connecting again after an error
+POLL_TIMEOUT = 1.0
+RECONNECT_DELAY = 5.0
+
+
+class ChangeListener(threading.Thread):
+    """Background thread calling callback(change) for the notifications of the subscribed channels."""
+
+    def __init__(self, connect=_open_dedicated_connection, poll_timeout=POLL_TIMEOUT,
+                 reconnect_delay=RECONNECT_DELAY):
+        super().__init__(name="ChangeListener", daemon=True)
+        self.connect = connect
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self.listening = threading.Event()
+        self._callbacks = {channel: [] for channel in CHANNELS}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def subscribe(self, channel, callback):
+        with self._lock:
+            self._callbacks[channel].append(callback)
+
+    def unsubscribe(self, channel, callback):
+        with self._lock:
+            if callback in self._callbacks[channel]:
+                self._callbacks[channel].remove(callback)
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        missed = False
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                connection = self.connect()
+                cursor = connection.cursor()
+                for channel in CHANNELS:
+                    cursor.execute(f"LISTEN {channel}")
+                self.listening.set()
+
+                if missed:
+                    for channel in CHANNELS:
+                        self._dispatch(channel, None)
+
+                while not self._stopped.is_set():
+                    if select.select([connection], [], [], self.poll_timeout)[0]:
+                        connection.poll()
+                        while connection.notifies:
+                            notify = connection.notifies.pop(0)
+                            self._dispatch(notify.channel, notify.payload)
+            except Exception as e:
+                if not self._stopped.is_set():
+                    print(f"Error listening to database changes: {e}")
+            finally:
+                self.listening.clear()
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            missed = True
+            self._stopped.wait(self.reconnect_delay)
+
+    def _dispatch(self, channel, payload):
+        try:
+            change = json.loads(payload) if payload is not None else None
+        except ValueError:
+            change = None
+
+        with self._lock:
+            callbacks = list(self._callbacks.get(channel, ()))
+        for callback in callbacks:
+            try:
+                callback(change)
+            except Exception as e:
+                print(f"Error handling {channel}: {e}")
+
+
+def invalidate_changed_reads(change):
+    """Drop the cached reads (query_cache) of the changed events, all of them if unknown."""
+    if change is None or change.get('ids') is None:
+        clear_query_cache()
+        return
+    for event_id in change['ids']:
+        _invalidate_event(event_id)
+    get_all_events.invalidate()
+
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def get_change_listener():
+    """The listener of the app, started on first call."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = ChangeListener()
+            # Events changed by another app are not served from the cache
+            _listener.subscribe(EVENT_CHANGES, invalidate_changed_reads)
+            _listener.start()
+        return _listener
+
+
+def stop_change_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(stop_change_listener)
@@ -1,14 +1,392 @@
 # Connect to db
 
+import atexit
+import os
+import threading
+import time
+
 import psycopg2
+import psycopg2.extensions
 from dotenv import load_dotenv
-import os
 
 load_dotenv()
 
-# Accessible uniquement depuis requests.py
-def _get_connection():
-    connection =  psycopg2.connect(
+# Pool sizing (can be overridden in the .env file)
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX", "10"))
+# Seconds a caller waits for a free connection before giving up
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Connections idle for longer than this are pinged before being handed out
+POOL_PING_AFTER = float(os.getenv("DB_POOL_PING_AFTER", "30"))
+
+# Read replicas (optional): comma separated DSNs, e.g. "host=replica1 port=5432,host=replica2 port=5432".
+# Missing dbname / user / password are taken from DB_NAME / DB_USER / DB_PASSWORD.
+REPLICA_DSNS = [dsn.strip() for dsn in os.getenv("DB_REPLICA_DSN", "").split(",") if dsn.strip()]
+# Replicas further behind the primary than this (seconds) are skipped, reads go to the primary instead
+REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+# Seconds a measured replica lag is trusted before measuring it again
+REPLICA_LAG_CHECK_EVERY = float(os.getenv("DB_REPLICA_LAG_CHECK", "1"))
+# Seconds before an unreachable replica is tried again
+REPLICA_RETRY_AFTER = 10.0
+
+# Staleness of a replica (seconds) and the WAL position it replayed.
+# 0 for a primary, or a replica streaming from the primary that replayed all it received.
+# A replica whose WAL receiver is not streaming may be missing anything: infinite lag.
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+               WHEN NOT pg_is_in_recovery() THEN 0
+               WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 'Infinity'
+               WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+               ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::FLOAT8, 'Infinity')
+           END::FLOAT8,
+           (CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() ELSE pg_current_wal_lsn() END
+               - '0/0'::PG_LSN)::BIGINT
+"""
+# WAL position of the primary after a commit, replicas serve the app's reads once they replayed it
+COMMIT_LSN_QUERY = "SELECT (pg_current_wal_lsn() - '0/0'::PG_LSN)::BIGINT"
+
+# Timezone is set once per physical connection through the startup options
+CONNECTION_OPTIONS = "-c timezone=Europe/Zurich"
+
+
+class PoolTimeout(Exception):
+    """No connection could be borrowed from the pool in time."""
+
+
+class _PooledConnection:
+    """Connection borrowed from the pool, close() gives it back instead of closing it."""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        if self._raw is not None:
+            self._pool.putconn(self._raw)
+            self._raw = None
+
+    def _wrapped(self):
+        if self._raw is None:
+            raise psycopg2.InterfaceError("connection already returned to the pool")
+        return self._raw
+
+    def commit(self):
+        raw = self._wrapped()
+        raw.commit()
+        if self._pool.track_commits:
+            self._pool.record_commit(raw)
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped(), name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of psycopg2 connections with checkout health checks."""
+
+    def __init__(self, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE, timeout=POOL_TIMEOUT,
+                 ping_after=POOL_PING_AFTER, readonly=False, track_commits=False, **connect_kwargs):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Invalid pool size (min={min_size}, max={max_size})")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        # Read-only autocommit sessions (replicas)
+        self.readonly = readonly
+        self.connect_kwargs = connect_kwargs
+        # WAL position of the last commit made through this pool (track_commits, primary with replicas),
+        # and time.monotonic() of the last commit whose position could not be read
+        self.track_commits = track_commits
+        self.commit_lsn = 0
+        self.unknown_commit_at = float("-inf")
+
+        self._cond = threading.Condition()
+        self._idle = []          # list of (connection, returned_at)
+        self._in_use = set()
+        self._opening = 0        # connections being opened outside the lock
+        self._closed = False
+
+        # Counters for get_stats()
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._opened = 0
+        self._discarded = 0
+
+    def _connect(self):
+        connection = psycopg2.connect(options=CONNECTION_OPTIONS, **self.connect_kwargs)
+        if self.readonly:
+            connection.set_session(readonly=True, autocommit=True)
+        with self._cond:
+            self._opened += 1
+        return connection
+
+    def prewarm(self):
+        """Open connections until min_size is reached."""
+        while True:
+            with self._cond:
+                if self._closed or self._size() >= self.min_size:
+                    return
+                self._opening += 1
+            try:
+                connection = self._connect()
+            except Exception:
+                with self._cond:
+                    self._opening -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._opening -= 1
+                self._idle.append((connection, time.monotonic()))
+                self._cond.notify()
+
+    def _size(self):
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _is_healthy(self, connection, idle_since):
+        if connection.closed:
+            return False
+        if time.monotonic() - idle_since < self.ping_after:
+            return True
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, connection):
+        try:
+            if not connection.closed:
+                connection.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._discarded += 1
+
+    def getconn(self):
+        """Borrow a connection, waiting up to `timeout` seconds if the pool is exhausted."""
+        started = time.monotonic()
+        waited = False
+
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise psycopg2.InterfaceError("connection pool is closed")
+                    if self._idle:
+                        connection, idle_since = self._idle.pop()
+                        self._in_use.add(connection)
+                        action = "check"
+                        break
+                    if self._size() < self.max_size:
+                        self._opening += 1
+                        action = "open"
+                        break
+
+                    remaining = self.timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        raise PoolTimeout(f"No database connection available after {self.timeout:.1f}s "
+                                          f"({self.max_size} in use)")
+                    waited = True
+                    self._cond.wait(remaining)
+
+            if action == "open":
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._opening -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._opening -= 1
+                    self._in_use.add(connection)
+            elif not self._is_healthy(connection, idle_since):
+                # Broken connection: drop it and try again (a new one can be opened)
+                with self._cond:
+                    self._in_use.discard(connection)
+                    self._cond.notify()
+                self._discard(connection)
+                continue
+
+            wait_time = time.monotonic() - started
+            with self._cond:
+                self._checkouts += 1
+                if waited:
+                    self._waits += 1
+                self._wait_time += wait_time
+                self._max_wait = max(self._max_wait, wait_time)
+
+            return _PooledConnection(self, connection)
+
+    def putconn(self, connection):
+        """Give a connection back, rolling back whatever the borrower left open."""
+        with self._cond:
+            if connection not in self._in_use:
+                return
+
+        keep = not connection.closed
+        if keep:
+            try:
+                status = connection.get_transaction_status()
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    keep = False
+                elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except Exception:
+                keep = False
+
+        with self._cond:
+            self._in_use.discard(connection)
+            if keep and not self._closed:
+                self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+
+        if not keep or self._closed:
+            self._discard(connection)
+
+    def close(self):
+        """Close idle connections, in-use ones are closed when given back."""
+        with self._cond:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle = []
+            self._cond.notify_all()
+        for connection in idle:
+            self._discard(connection)
+
+    def record_commit(self, connection):
+        """Remember the WAL position after a commit on `connection`, for the replicas."""
+        try:
+            cursor = connection.cursor()
+            cursor.execute(COMMIT_LSN_QUERY)
+            lsn = cursor.fetchone()[0]
+            cursor.close()
+            connection.rollback()
+            with self._cond:
+                self.commit_lsn = max(self.commit_lsn, lsn)
+        except Exception as e:
+            print(f"Error reading the commit position: {e}")
+            with self._cond:
+                self.unknown_commit_at = time.monotonic()
+
+    def get_stats(self):
+        with self._cond:
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size(),
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'total_wait_time': self._wait_time,
+                'avg_wait_time': self._wait_time / self._checkouts if self._checkouts else 0.0,
+                'max_wait_time': self._max_wait,
+                'opened': self._opened,
+                'discarded': self._discarded,
+            }
+
+
+class _Replica:
+    """Pool of a read replica, with its last measured lag and replayed WAL position."""
+
+    def __init__(self, dsn, pool):
+        self.dsn = dsn
+        self.pool = pool
+        self._lock = threading.Lock()
+        self.lag = None
+        self.replayed_lsn = 0
+        self.checked_at = float("-inf")
+        self.down_until = float("-inf")
+        self.reads = 0
+        self.skipped = 0
+        self.busy = 0
+
+    def borrow(self, max_lag, min_lsn=0):
+        """
+        A connection if the replica is reachable, no more than max_lag seconds behind
+        and has replayed the WAL up to min_lsn, else None.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self.down_until:
+                return None
+            check = now - self.checked_at >= REPLICA_LAG_CHECK_EVERY or self.replayed_lsn < min_lsn
+
+        connection = None
+        try:
+            connection = self.pool.getconn()
+        except PoolTimeout:
+            # Every connection in use: the replica is busy, not down
+            with self._lock:
+                self.busy += 1
+            return None
+        except Exception as e:
+            print(f"Error reaching replica ({self.dsn}): {e}")
+            with self._lock:
+                self.down_until = now + REPLICA_RETRY_AFTER
+            return None
+
+        try:
+            if check:
+                cursor = connection.cursor()
+                cursor.execute(REPLICA_LAG_QUERY)
+                lag, replayed_lsn = cursor.fetchone()
+                cursor.close()
+                with self._lock:
+                    self.lag = float(lag)
+                    self.replayed_lsn = max(self.replayed_lsn, replayed_lsn or 0)
+                    self.checked_at = now
+        except Exception as e:
+            print(f"Error reaching replica ({self.dsn}): {e}")
+            connection.close()
+            with self._lock:
+                self.down_until = now + REPLICA_RETRY_AFTER
+            return None
+
+        with self._lock:
+            usable = self.lag <= max_lag and self.replayed_lsn >= min_lsn
+            if usable:
+                self.reads += 1
+            else:
+                self.skipped += 1
+        if not usable:
+            connection.close()
+            return None
+        return connection
+
+    def get_stats(self):
+        stats = self.pool.get_stats()
+        with self._lock:
+            return dict(stats, dsn=self.dsn, lag=self.lag, replayed_lsn=self.replayed_lsn, reads=self.reads,
+                        skipped=self.skipped, busy=self.busy, down=time.monotonic() < self.down_until)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_replicas = None
+_replica_turn = 0
+_primary_reads = 0
+
+
+def _connect_kwargs():
+    return dict(
         database=os.getenv("DB_NAME"),
         user=os.getenv("DB_USER"),
         password=os.getenv("DB_PASSWORD"),
@@ -16,9 +394,113 @@ def _get_connection():
         port=os.getenv("DB_PORT")
     )
 
-    # Set timezone to Swiss time for all operations
-    cursor = connection.cursor()
-    cursor.execute("SET timezone = 'Europe/Zurich';")
-    cursor.close()
 
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(track_commits=bool(REPLICA_DSNS), **_connect_kwargs())
+            try:
+                _pool.prewarm()
+            except Exception as e:
+                print(f"Error opening database connections: {e}")
+        return _pool
+
+
+def _replica_connect_kwargs(dsn):
+    kwargs = {key: value for key, value in (("dbname", os.getenv("DB_NAME")),
+                                            ("user", os.getenv("DB_USER")),
+                                            ("password", os.getenv("DB_PASSWORD"))) if value}
+    kwargs.update(psycopg2.extensions.parse_dsn(dsn))
+    return kwargs
+
+
+def _get_replicas():
+    global _replicas
+    with _pool_lock:
+        if _replicas is None:
+            _replicas = []
+            for dsn in REPLICA_DSNS:
+                replica = _Replica(dsn, ConnectionPool(readonly=True, **_replica_connect_kwargs(dsn)))
+                try:
+                    replica.pool.prewarm()
+                except Exception as e:
+                    print(f"Error opening replica connections ({dsn}): {e}")
+                _replicas.append(replica)
+        return _replicas
+
+
+def _get_replica_connection():
+    """Connection to the next replica close enough to the primary, None if there is none."""
+    global _replica_turn
+    replicas = _get_replicas()
+    if not replicas:
+        return None
+    # Read your own writes: only replicas that replayed the last commit of this app (any thread).
+    # A commit whose position is unknown sends the reads to the primary for REPLICA_MAX_LAG seconds.
+    pool = _get_pool()
+    if time.monotonic() - pool.unknown_commit_at < REPLICA_MAX_LAG:
+        return None
+    min_lsn = pool.commit_lsn
+
+    with _pool_lock:
+        start = _replica_turn
+        _replica_turn = (_replica_turn + 1) % len(replicas)
+    for i in range(len(replicas)):
+        connection = replicas[(start + i) % len(replicas)].borrow(REPLICA_MAX_LAG, min_lsn)
+        if connection is not None:
+            return connection
+    return None
+
+
+# Accessible uniquement depuis requests.py
+def _get_connection(readonly=False):
+    """
+    Borrow a pooled connection, connection.close() gives it back to the pool.
+    readonly=True: for requests that only read, a read-only autocommit connection to a replica
+    (DB_REPLICA_DSN) if one is less than DB_REPLICA_MAX_LAG seconds behind and replayed the last
+    commit of the app, else the primary.
+    """
+    global _primary_reads
+    if readonly:
+        connection = _get_replica_connection()
+        if connection is not None:
+            return connection
+        if REPLICA_DSNS:
+            with _pool_lock:
+                _primary_reads += 1
+    return _get_pool().getconn()
+
+
+def _open_dedicated_connection():
+    """Connection outside the pool, in autocommit, for a LISTEN held as long as the app runs."""
+    connection = psycopg2.connect(options=CONNECTION_OPTIONS, **_connect_kwargs())
+    connection.autocommit = True
     return connection
+
+
+def get_pool_stats():
+    """
+    In-use / idle connections and wait times, to size DB_POOL_MIN / DB_POOL_MAX.
+    With replicas: their stats, lag and reads, and the reads that went to the primary instead.
+    """
+    stats = _get_pool().get_stats()
+    replicas = _get_replicas()
+    if replicas:
+        stats['replicas'] = [replica.get_stats() for replica in replicas]
+        stats['primary_reads'] = _primary_reads
+    return stats
+
+
+def close_pool():
+    global _pool, _replicas
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+        for replica in _replicas or ():
+            replica.pool.close()
+        _replicas = None
+
+
+atexit.register(close_pool)
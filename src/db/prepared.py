@@ -0,0 +1,100 @@
+"""
+Prepared statements of the hot queries (ticket scan, seat map, checkout).
+Each statement is PREPAREd the first time it runs on a physical connection, then run with EXECUTE:
+PostgreSQL parses and plans it once per pooled connection instead of on every call.
+DB_PREPARED_STATEMENTS=0 (or set_prepared_statements(False)) runs them as plain queries instead,
+to compare both (benchmark_prepared.py).
+"""
+
+import os
+import threading
+import weakref
+
+import psycopg2.errors
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_enabled = os.getenv("DB_PREPARED_STATEMENTS", "1") != "0"
+
+_statements = {}
+# Physical connection -> names of the statements prepared on it, forgotten with the connection
+_prepared_on = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+# Counters for get_prepared_stats()
+_stats = {'prepares': 0, 'executes': 0, 'adhoc': 0}
+
+
+class PreparedStatement:
+    """A query with %s placeholders, run by name once prepared."""
+
+    def __init__(self, name, query):
+        self.name = name
+        self.query = query
+        count = query.count("%s")
+        self.prepare_sql = f"PREPARE {name} AS {query % tuple(f'${i}' for i in range(1, count + 1))}"
+        self.execute_sql = f"EXECUTE {name}({', '.join(['%s'] * count)})" if count else f"EXECUTE {name}"
+
+
+def prepared_statement(name, query):
+    """Register a statement, `name` must be unique."""
+    if name in _statements:
+        raise ValueError(f"prepared statement {name} already registered")
+    statement = PreparedStatement(name, query)
+    _statements[name] = statement
+    return statement
+
+
+def set_prepared_statements(enabled):
+    global _enabled
+    _enabled = enabled
+
+
+def prepared_statements_enabled():
+    return _enabled
+
+
+def _names_prepared_on(connection):
+    with _lock:
+        names = _prepared_on.get(connection)
+        if names is None:
+            names = _prepared_on[connection] = set()
+        return names
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def execute_prepared(cursor, statement, params=()):
+    """cursor.execute() of the statement, preparing it first on the cursor's connection if needed."""
+    if not _enabled:
+        _count('adhoc')
+        cursor.execute(statement.query, params)
+        return
+
+    connection = cursor.connection
+    names = _names_prepared_on(connection)
+    if statement.name not in names:
+        # Prepared statements outlive the transaction, even when it is rolled back
+        prepare_cursor = connection.cursor()
+        prepare_cursor.execute(statement.prepare_sql)
+        prepare_cursor.close()
+        names.add(statement.name)
+        _count('prepares')
+
+    try:
+        cursor.execute(statement.execute_sql, params)
+        _count('executes')
+    except psycopg2.errors.InvalidSqlStatementName:
+        # The session lost its statements (DISCARD ALL...): prepare them again next time
+        names.clear()
+        raise
+
+
+def get_prepared_stats():
+    """Statements prepared, executed by name and run as plain queries since startup."""
+    with _lock:
+        return dict(_stats, enabled=_enabled, statements=sorted(_statements), connections=len(_prepared_on))
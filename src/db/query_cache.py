@@ -0,0 +1,132 @@
+"""
+In-memory cache of the read functions of requests.py.
+Each decorated function keeps its own bounded LRU of results by arguments, with its own TTL.
+Write functions drop the keys they change with func.invalidate(*args).
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+_cached_functions = []
+_call_state = threading.local()
+
+
+def dont_cache():
+    """Called by a cached function that failed: its default result is returned but not stored."""
+    _call_state.failed = True
+
+
+class _QueryCache:
+    """LRU of one function's results, with expiry and counters."""
+
+    def __init__(self, name, ttl, maxsize):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (result, stored_at)
+        self._lock = threading.Lock()
+
+        # Counters for get_query_cache_stats()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """(True, result) if a fresh result is cached, else (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, stored_at = entry
+                if time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, copy.deepcopy(result)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(result), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+def _make_key(args, kwargs):
+    return args + tuple(sorted(kwargs.items())) if kwargs else args
+
+
+def cached(ttl, maxsize=128):
+    """
+    Cache the results of a read function for `ttl` seconds, keeping the `maxsize` most recently used.
+    Adds func.invalidate(*args, **kwargs) and func.cache_clear().
+    Results are copied, callers can change them freely.
+    """
+    def decorator(func):
+        cache = _QueryCache(func.__name__, ttl, maxsize)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            found, result = cache.get(key)
+            if found:
+                return result
+
+            _call_state.failed = False
+            result = func(*args, **kwargs)
+            if not _call_state.failed:
+                cache.put(key, result)
+            _call_state.failed = False
+            return result
+
+        wrapper.invalidate = lambda *args, **kwargs: cache.invalidate(_make_key(args, kwargs))
+        wrapper.cache_clear = cache.clear
+        wrapper.cache = cache
+        _cached_functions.append(wrapper)
+        return wrapper
+
+    return decorator
+
+
+def clear_query_cache():
+    """Forget every cached result."""
+    for func in _cached_functions:
+        func.cache_clear()
+
+
+def get_query_cache_stats():
+    """Hits, misses, evictions... of each cached function, to tune their ttl / maxsize."""
+    return {func.__name__: func.cache.get_stats() for func in _cached_functions}
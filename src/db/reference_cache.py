@@ -0,0 +1,164 @@
+"""
+Nearly static reference data: event types, rooms, configurations and the tarifs of current events.
+Loaded in one query by get_reference_data(), kept in memory for REFERENCE_CACHE_SECONDS and copied to disk,
+so a new process starts from the disk copy without querying. Call invalidate_reference_cache() after an admin write.
+"""
+
+import json
+import os
+import threading
+import time
+
+from src.constants import REFERENCE_CACHE_SECONDS, REFERENCE_DISK_CACHE_SECONDS
+from .requests import get_reference_data, get_tarifs_for_event
+
+# Bump when the cached format changes, older files are ignored
+REFERENCE_FORMAT = 1
+CACHE_DIR = os.getenv("TICKETBESTER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ticketbester"))
+CACHE_FILE = os.path.join(CACHE_DIR, "reference.json")
+
+_cache = None       # indexes built from the last load
+_loaded_at = 0.0    # time.monotonic() of the last load
+_lock = threading.Lock()
+
+
+def _build(data):
+    """Name -> id and id -> row lookups of get_reference_data() rows."""
+    tarifs = {}
+    for tarif in data['tarifs']:
+        tarifs.setdefault(tarif['event_id'], []).append(
+            {'id': tarif['id'], 'name': tarif['name'], 'price': tarif['price']})
+
+    return {
+        'data': data,
+        'types': {row['id']: row for row in data['types']},
+        'rooms': {row['id']: row for row in data['rooms']},
+        'configs': {row['id']: row for row in data['configs']},
+        'type_ids': {row['name']: row['id'] for row in data['types']},
+        'room_ids': {row['name']: row['id'] for row in data['rooms']},
+        'config_ids': {row['name']: row['id'] for row in data['configs']},
+        'tarifs': tarifs,
+    }
+
+
+def _load_from_disk():
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if saved.get('format') != REFERENCE_FORMAT:
+        return None
+    age = time.time() - saved.get('saved_at', 0)
+    if not 0 <= age < REFERENCE_DISK_CACHE_SECONDS:
+        return None
+    return saved['data']
+
+
+def _save_to_disk(data):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(CACHE_FILE + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({'format': REFERENCE_FORMAT, 'saved_at': time.time(), 'data': data}, f)
+        os.replace(CACHE_FILE + ".tmp", CACHE_FILE)
+    except OSError as e:
+        print(f"Error saving reference data: {e}")
+
+
+def _reference():
+    """
+    Current indexes, from memory, disk or the database in that order.
+    If the database can't be reached, the last data loaded is kept (None if there is none).
+    """
+    global _cache, _loaded_at
+    with _lock:
+        if _cache is not None and time.monotonic() - _loaded_at < REFERENCE_CACHE_SECONDS:
+            return _cache
+
+        # Disk copy only for the first load of the process
+        data = _load_from_disk() if _cache is None else None
+        if data is None:
+            data = get_reference_data()
+            if data is None:
+                return _cache
+            _save_to_disk(data)
+
+        _cache = _build(data)
+        _loaded_at = time.monotonic()
+        return _cache
+
+
+def invalidate_reference_cache():
+    """Forget the reference data in memory and on disk, the next lookup reloads it."""
+    global _cache
+    with _lock:
+        _cache = None
+        try:
+            os.remove(CACHE_FILE)
+        except OSError:
+            pass
+
+
+def get_type_names():
+    reference = _reference()
+    return [row['name'] for row in reference['data']['types']] if reference else []
+
+
+def get_room_names():
+    reference = _reference()
+    return [row['name'] for row in reference['data']['rooms']] if reference else []
+
+
+def get_config_names():
+    reference = _reference()
+    return [row['name'] for row in reference['data']['configs']] if reference else []
+
+
+def get_type_id(type_name):
+    reference = _reference()
+    return reference['type_ids'].get(type_name) if reference else None
+
+
+def get_room_id(room_name):
+    reference = _reference()
+    return reference['room_ids'].get(room_name) if reference else None
+
+
+def get_config_id(config_name):
+    reference = _reference()
+    return reference['config_ids'].get(config_name) if reference else None
+
+
+def get_type(type_id):
+    """{'id', 'name', 'is_free', 'need_reservation'} of an event type, None if unknown."""
+    reference = _reference()
+    return reference['types'].get(type_id) if reference else None
+
+
+def get_room(room_id):
+    """{'id', 'name', 'address'} of a room, None if unknown."""
+    reference = _reference()
+    return reference['rooms'].get(room_id) if reference else None
+
+
+def get_config(config_id):
+    """{'id', 'name'} of a configuration, None if unknown."""
+    reference = _reference()
+    return reference['configs'].get(config_id) if reference else None
+
+
+def get_type_details(type_name):
+    """Same as requests.get_type_of_event_details(), from the cache."""
+    return get_type(get_type_id(type_name))
+
+
+def get_event_tarifs(event_id):
+    """
+    Same as requests.get_tarifs_for_event(), from the cache.
+    Events not in the cache (over, or created after the last load) are queried.
+    """
+    reference = _reference()
+    if reference and event_id in reference['tarifs']:
+        return [dict(tarif) for tarif in reference['tarifs'][event_id]]
+    return get_tarifs_for_event(event_id)
@@ -1,9 +1,18 @@
+import re
+
+from psycopg2.extras import Json
+
+from src.constants import SEAT_HOLD_SECONDS, EVENT_LIST_BATCH_SIZE, EVENT_LIST_CACHE_SECONDS, \
+    EVENT_DATA_CACHE_SECONDS, STAFF_CACHE_SECONDS
 from .connection import _get_connection
+from .query_cache import cached, dont_cache
+from .prepared import prepared_statement, execute_prepared
 
+@cached(ttl=EVENT_LIST_CACHE_SECONDS, maxsize=1)
 def get_all_events():
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
         
         query = """
@@ -15,9 +24,9 @@ def get_all_events():
                 e.start_at::time
             FROM event e
             JOIN type_of_event t ON e.type_id = t.id
-            WHERE e.status = 'on_sale' or e.status = 'on_site' 
+            WHERE e.status IN ('on_sale', 'on_site')
               AND e.start_at > NOW()
-            ORDER BY e.start_at ASC
+            ORDER BY e.start_at ASC, e.id ASC
         """
         
         cursor.execute(query)
@@ -28,15 +37,169 @@ def get_all_events():
         
     except Exception as e:
         print(f"Error fetching events: {e}")
+        dont_cache()
+        return []
+    finally:
+        if connection:
+            connection.close()
+
+def get_scannable_events():
+    """
+    Events tickets can be scanned for at the door: on sale or on site and not ended yet
+    (started ones included, unlike get_all_events()). Rows as in get_all_events().
+    """
+    connection = None
+    try:
+        connection = _get_connection(readonly=True)
+        cursor = connection.cursor()
+
+        query = """
+            SELECT
+                e.id,
+                e.name,
+                t.name as type_name,
+                e.start_at::date,
+                e.start_at::time
+            FROM event e
+            JOIN type_of_event t ON e.type_id = t.id
+            WHERE e.status IN ('on_sale', 'on_site')
+              AND e.end_at > NOW()
+            ORDER BY e.start_at ASC, e.id ASC
+        """
+
+        cursor.execute(query)
+        rows = cursor.fetchall()
+
+        cursor.close()
+        return rows
+
+    except Exception as e:
+        print(f"Error fetching scannable events: {e}")
         return []
     finally:
         if connection:
             connection.close()
 
+def _events_page_query(after=None, limit=EVENT_LIST_BATCH_SIZE, type_id=None, room_id=None,
+                       date_from=None, date_to=None):
+    """Catalog query and its parameters, one more row than `limit` to know if another page follows."""
+    conditions = ["e.status IN ('on_sale', 'on_site')", "e.start_at > NOW()"]
+    params = []
+    if type_id is not None:
+        conditions.append("e.type_id = %s")
+        params.append(type_id)
+    if room_id is not None:
+        conditions.append("e.room_id = %s")
+        params.append(room_id)
+    if date_from is not None:
+        conditions.append("e.start_at >= %s")
+        params.append(date_from)
+    if date_to is not None:
+        conditions.append("e.start_at < %s")
+        params.append(date_to)
+    if after is not None:
+        # Keyset: rows after the last one of the previous page, read from idx_event_on_sale
+        conditions.append("(e.start_at, e.id) > (%s, %s)")
+        params.extend(after)
+    params.append(limit + 1)
+
+    query = f"""
+        SELECT
+            e.id,
+            e.name,
+            t.name as type_name,
+            e.start_at::date,
+            e.start_at::time,
+            e.start_at
+        FROM event e
+        JOIN type_of_event t ON e.type_id = t.id
+        WHERE {" AND ".join(conditions)}
+        ORDER BY e.start_at ASC, e.id ASC
+        LIMIT %s
+    """
+    return query, params
+
+def get_events_page(after=None, limit=EVENT_LIST_BATCH_SIZE, type_id=None, room_id=None,
+                    date_from=None, date_to=None):
+    """
+    One page of the upcoming on-sale events, ordered by (start_at, id), rows as in get_all_events().
+    Filters by type, room and start date (date_from included, date_to excluded).
+    Returns (rows, next_cursor): pass next_cursor as `after` for the next page, None after the last page.
+    """
+    connection = None
+    try:
+        connection = _get_connection(readonly=True)
+        cursor = connection.cursor()
+
+        query, params = _events_page_query(after, limit, type_id, room_id, date_from, date_to)
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+        cursor.close()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][5], rows[-1][0])
+        return [row[:5] for row in rows], next_cursor
+
+    except Exception as e:
+        print(f"Error fetching events page: {e}")
+        return [], None
+    finally:
+        if connection:
+            connection.close()
+
+def search_events(text, limit=EVENT_LIST_BATCH_SIZE):
+    """
+    Upcoming on-sale events whose name or type has words starting with each word of `text`
+    (case and accents ignored), best matches first, rows as in get_all_events().
+    Ranking the matches keeps the planner on idx_event_search instead of walking the events by date.
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return []
+
+    connection = None
+    try:
+        connection = _get_connection(readonly=True)
+        cursor = connection.cursor()
+
+        query = """
+            SELECT
+                e.id,
+                e.name,
+                t.name as type_name,
+                e.start_at::date,
+                e.start_at::time
+            FROM event e
+            JOIN type_of_event t ON e.type_id = t.id,
+                 to_tsquery('simple', fold_search_text(%s)) query
+            WHERE e.search_vector @@ query
+              AND e.status IN ('on_sale', 'on_site')
+              AND e.start_at > NOW()
+            ORDER BY ts_rank(e.search_vector, query) DESC, e.start_at ASC, e.id ASC
+            LIMIT %s
+        """
+
+        # Prefix match on every word: "oth tro" finds "Otello par la Troupe Nationale"
+        cursor.execute(query, (" & ".join(f"{word}:*" for word in words), limit))
+        rows = cursor.fetchall()
+
+        cursor.close()
+        return rows
+
+    except Exception as e:
+        print(f"Error searching events: {e}")
+        return []
+    finally:
+        if connection:
+            connection.close()
+
+@cached(ttl=EVENT_DATA_CACHE_SECONDS)
 def get_all_events_details(event_id):
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
         
         query = """
@@ -81,15 +244,17 @@ def get_all_events_details(event_id):
         
     except Exception as e:
         print(f"Error fetching event details: {e}")
+        dont_cache()
         return None
     finally:
         if connection:
             connection.close()
 
+@cached(ttl=EVENT_DATA_CACHE_SECONDS)
 def get_tarifs_for_event(event_id):
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
         
         query = """
@@ -119,6 +284,7 @@ def get_tarifs_for_event(event_id):
         
     except Exception as e:
         print(f"Error fetching tarifs: {e}")
+        dont_cache()
         return []
     finally:
         if connection:
@@ -127,7 +293,7 @@ def get_tarifs_for_event(event_id):
 def get_available_seats_for_event(event_id):
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
         
         query = """
@@ -172,28 +338,38 @@ def get_available_seats_for_event(event_id):
         if connection:
             connection.close()
 
-def get_seats_with_status_for_event(event_id):
-    connection = None
-    try:
-        connection = _get_connection()
-        cursor = connection.cursor()
-
-        query = """
+SEATS_WITH_STATUS = prepared_statement("seats_with_status", """
                 SELECT s.id, \
                        s.name, \
                        ts.type        as seat_type, \
                        sec.name       as sector_name, \
                        sec.supplement as sector_supplement, \
-                       es.status
+                       CASE \
+                           WHEN es.status = 'HOLD' AND es.hold_expires_at < now() \
+                               THEN 'AVAILABLE'::seat_status \
+                           ELSE es.status \
+                       END            as status, \
+                       es.version, \
+                       pg_snapshot_xmin(pg_current_snapshot())::TEXT::BIGINT as watermark
                 FROM event_seat es
                          JOIN seat s ON es.seat_id = s.id
                          JOIN type_of_seat ts ON s.type_id = ts.id
                          JOIN sector sec ON s.sector_id = sec.id
                 WHERE es.event_id = %s
                 ORDER BY sec.name, s.name \
-                """
+                """)
 
-        cursor.execute(query, (event_id,))
+def get_seats_with_status_for_event(event_id, with_watermark=False):
+    """
+    Seats of the event with their status.
+    with_watermark=True: returns (seats, watermark), the version to poll get_seat_changes_since from.
+    """
+    connection = None
+    try:
+        connection = _get_connection(readonly=True)
+        cursor = connection.cursor()
+
+        execute_prepared(cursor, SEATS_WITH_STATUS, (event_id,))
         rows = cursor.fetchall()
 
         seats = []
@@ -204,15 +380,136 @@ def get_seats_with_status_for_event(event_id):
                 'type': row[2],
                 'sector': row[3],
                 'supplement': float(row[4]) if row[4] else 0.0,
-                'status': row[5]
+                'status': row[5],
+                'version': row[6]
             }
             seats.append(seat)
 
         cursor.close()
+        if with_watermark:
+            return seats, rows[0][7] if rows else 0
         return seats
 
     except Exception as e:
         print(f"Error fetching seats with status: {e}")
+        return ([], 0) if with_watermark else []
+    finally:
+        if connection:
+            connection.close()
+
+def get_seat_changes_since(event_id, version):
+    """
+    Seats of the event changed by the transactions not finished at the previous poll
+    (version: the watermark it returned, or the one of get_seats_with_status_for_event),
+    plus the holds that expired without being swept yet.
+    The new watermark is the oldest transaction still running: a change made before a faster
+    transaction commits is returned at the next poll instead of being skipped.
+    Returns (changes, watermark), changes being a list of {'id', 'status'}.
+    """
+    connection = None
+    try:
+        connection = _get_connection(readonly=True)
+        cursor = connection.cursor()
+
+        # One row even without changes, for the watermark
+        query = """
+                SELECT w.watermark, \
+                       es.seat_id, \
+                       CASE \
+                           WHEN es.status = 'HOLD' AND es.hold_expires_at < now() \
+                               THEN 'AVAILABLE'::seat_status \
+                           ELSE es.status \
+                       END as status
+                FROM (SELECT pg_snapshot_xmin(pg_current_snapshot())::TEXT::BIGINT as watermark) w
+                         LEFT JOIN event_seat es
+                                   ON es.event_id = %s
+                                       AND (es.version >= %s
+                                           OR (es.status = 'HOLD' AND es.hold_expires_at < now()))
+                ORDER BY es.version \
+                """
+
+        cursor.execute(query, (event_id, version))
+        rows = cursor.fetchall()
+
+        changes = [{'id': row[1], 'status': row[2]} for row in rows if row[1] is not None]
+        watermark = rows[0][0] if rows else version
+
+        cursor.close()
+        return changes, watermark
+
+    except Exception as e:
+        print(f"Error fetching seat changes: {e}")
+        return [], version
+    finally:
+        if connection:
+            connection.close()
+
+@cached(ttl=EVENT_DATA_CACHE_SECONDS)
+def get_event_room_config(event_id):
+    """(room_id, config_id, layout_version) of the event, None if not found."""
+    connection = None
+    try:
+        connection = _get_connection(readonly=True)
+        cursor = connection.cursor()
+
+        query = """
+                SELECT e.room_id, e.config_id, r.layout_version
+                FROM event e
+                         JOIN room r ON r.id = e.room_id
+                WHERE e.id = %s \
+                """
+
+        cursor.execute(query, (event_id,))
+        row = cursor.fetchone()
+
+        cursor.close()
+        return (row[0], row[1], row[2]) if row else None
+
+    except Exception as e:
+        print(f"Error fetching event room: {e}")
+        dont_cache()
+        return None
+    finally:
+        if connection:
+            connection.close()
+
+def get_venue_geometry_rows(room_id, config_id):
+    """
+    Sector placement and seat positions of a room configuration, one row per seat:
+    (sector, grid_row, grid_col, row_span, col_span, wide_seats, seat_id, seat_row, seat_col, pos_x, pos_y)
+    """
+    connection = None
+    try:
+        connection = _get_connection(readonly=True)
+        cursor = connection.cursor()
+
+        query = """
+                SELECT sec.name, \
+                       cws.grid_row, \
+                       cws.grid_col, \
+                       cws.row_span, \
+                       cws.col_span, \
+                       cws.wide_seats, \
+                       s.id, \
+                       s.seat_row, \
+                       s.seat_col, \
+                       s.pos_x, \
+                       s.pos_y
+                FROM config_with_sector cws
+                         JOIN sector sec ON sec.id = cws.sector_id
+                         JOIN seat s ON s.sector_id = sec.id AND s.room_id = %s
+                WHERE cws.config_id = %s
+                ORDER BY sec.id, s.id \
+                """
+
+        cursor.execute(query, (room_id, config_id))
+        rows = cursor.fetchall()
+
+        cursor.close()
+        return rows
+
+    except Exception as e:
+        print(f"Error fetching venue geometry: {e}")
         return []
     finally:
         if connection:
@@ -286,24 +583,77 @@ def create_reservation(event_id, client_id, vendor_id=1):
         if connection:
             connection.close()
 
+ADD_TICKET = prepared_statement("add_ticket", """
+            INSERT INTO ticket (reservation_id, event_id, seat_id, tarif_name)
+            VALUES (%s, %s, %s, %s)
+            RETURNING id
+        """)
+
 def add_ticket_to_reservation(reservation_id, event_id, seat_id, tarif_name):
     connection = None
     try:
         connection = _get_connection()
         cursor = connection.cursor()
+
+        execute_prepared(cursor, ADD_TICKET, (reservation_id, event_id, seat_id, tarif_name))
+        connection.commit()
+        cursor.close()
+        return True
         
-        ticket_query = """
+    except Exception as e:
+        print(f"Error adding ticket: {e}")
+        if connection:
+            connection.rollback()
+        return False
+    finally:
+        if connection:
+            connection.close()
+
+def add_tickets_to_reservation(reservation_id, event_id, seat_tarifs):
+    """
+    Add all the tickets of a reservation in one statement.
+    seat_tarifs: list of (seat_id, tarif_name).
+    Seats are locked in seat_id order so two buyers never deadlock,
+    either every ticket is added or none (returns False).
+    """
+    connection = None
+    try:
+        connection = _get_connection()
+        cursor = connection.cursor()
+
+        seat_ids = [seat_id for seat_id, _ in seat_tarifs]
+        tarif_names = [tarif_name for _, tarif_name in seat_tarifs]
+
+        tickets_query = """
+            WITH locked AS MATERIALIZED (
+                SELECT es.seat_id
+                FROM event_seat es
+                WHERE es.event_id = %s AND es.seat_id = ANY(%s)
+                ORDER BY es.seat_id
+                FOR UPDATE
+            )
             INSERT INTO ticket (reservation_id, event_id, seat_id, tarif_name)
-            VALUES (%s, %s, %s, %s)
+            SELECT %s, %s, s.seat_id, s.tarif_name
+            FROM unnest(%s::INTEGER[], %s::VARCHAR[]) AS s(seat_id, tarif_name)
+            JOIN locked l ON l.seat_id = s.seat_id
+            ORDER BY s.seat_id
             RETURNING id
         """
-        cursor.execute(ticket_query, (reservation_id, event_id, seat_id, tarif_name))
+        cursor.execute(tickets_query, (event_id, seat_ids, reservation_id, event_id, seat_ids, tarif_names))
+
+        # A seat missing from the event: nothing is kept
+        if cursor.rowcount != len(seat_tarifs):
+            print(f"Error adding tickets: {cursor.rowcount}/{len(seat_tarifs)} seats found for event {event_id}")
+            connection.rollback()
+            cursor.close()
+            return False
+
         connection.commit()
         cursor.close()
         return True
-        
+
     except Exception as e:
-        print(f"Error adding ticket: {e}")
+        print(f"Error adding tickets: {e}")
         if connection:
             connection.rollback()
         return False
@@ -311,19 +661,261 @@ def add_ticket_to_reservation(reservation_id, event_id, seat_id, tarif_name):
         if connection:
             connection.close()
 
-def create_payment(reservation_id, total, method='card'):
+def hold_seats(event_id, reservation_id, seat_ids, seconds):
+    """
+    Hold seats picked on the seat map for `seconds`.
+    Seats already held by this reservation get their hold renewed,
+    expired holds of other reservations can be taken.
+    Returns the seat ids held, a seat taken by someone else is missing. None if the hold failed.
+    """
+    connection = None
+    try:
+        connection = _get_connection()
+        cursor = connection.cursor()
+
+        query = """
+            WITH free AS MATERIALIZED (
+                SELECT es.seat_id
+                FROM event_seat es
+                WHERE es.event_id = %s
+                  AND es.seat_id = ANY(%s)
+                  AND (es.status = 'AVAILABLE'
+                       OR (es.status = 'HOLD'
+                           AND (es.held_by = %s OR es.hold_expires_at < now())))
+                ORDER BY es.seat_id
+                -- Waits for a seat being changed, then checks it is still free
+                FOR UPDATE
+            )
+            UPDATE event_seat es
+            SET status = 'HOLD',
+                hold_expires_at = now() + make_interval(secs => %s),
+                held_by = %s
+            FROM free
+            WHERE es.event_id = %s AND es.seat_id = free.seat_id
+            RETURNING es.seat_id
+        """
+        cursor.execute(query, (event_id, list(seat_ids), reservation_id, seconds, reservation_id, event_id))
+        held = [row[0] for row in cursor.fetchall()]
+        connection.commit()
+
+        cursor.close()
+        return held
+
+    except Exception as e:
+        print(f"Error holding seats: {e}")
+        if connection:
+            connection.rollback()
+        return None
+    finally:
+        if connection:
+            connection.close()
+
+def extend_holds(reservation_id, seconds):
+    """Push back the expiry of every seat held by the reservation. Returns the number of seats."""
     connection = None
     try:
         connection = _get_connection()
         cursor = connection.cursor()
 
         query = """
+                UPDATE event_seat
+                SET hold_expires_at = now() + make_interval(secs => %s)
+                WHERE held_by = %s
+                  AND status = 'HOLD' \
+                """
+        cursor.execute(query, (seconds, reservation_id))
+        extended = cursor.rowcount
+        connection.commit()
+
+        cursor.close()
+        return extended
+
+    except Exception as e:
+        print(f"Error extending holds: {e}")
+        if connection:
+            connection.rollback()
+        return 0
+    finally:
+        if connection:
+            connection.close()
+
+def release_holds(reservation_id, seat_ids=None):
+    """Give back seats held by the reservation (all of them if seat_ids is None). Returns the number of seats."""
+    connection = None
+    try:
+        connection = _get_connection()
+        cursor = connection.cursor()
+
+        query = """
+                UPDATE event_seat
+                SET status = 'AVAILABLE', hold_expires_at = NULL, held_by = NULL
+                WHERE held_by = %s
+                  AND status = 'HOLD'
+                  AND (%s::INTEGER[] IS NULL OR seat_id = ANY(%s::INTEGER[])) \
+                """
+        seat_ids = list(seat_ids) if seat_ids is not None else None
+        cursor.execute(query, (reservation_id, seat_ids, seat_ids))
+        released = cursor.rowcount
+        connection.commit()
+
+        cursor.close()
+        return released
+
+    except Exception as e:
+        print(f"Error releasing holds: {e}")
+        if connection:
+            connection.rollback()
+        return 0
+    finally:
+        if connection:
+            connection.close()
+
+def sweep_expired_holds(pending_minutes):
+    """
+    Put expired holds back on sale and expire reservations still pending after `pending_minutes`.
+    Returns {'holds': seats released, 'reservations': reservations expired}.
+    """
+    connection = None
+    try:
+        connection = _get_connection()
+        cursor = connection.cursor()
+
+        query = """
+                SELECT release_expired_holds(),
+                       expire_pending_reservations(make_interval(mins => %s)) \
+                """
+        cursor.execute(query, (pending_minutes,))
+        holds, reservations = cursor.fetchone()
+        connection.commit()
+
+        cursor.close()
+        return {'holds': holds, 'reservations': reservations}
+
+    except Exception as e:
+        print(f"Error sweeping expired holds: {e}")
+        if connection:
+            connection.rollback()
+        return {'holds': 0, 'reservations': 0}
+    finally:
+        if connection:
+            connection.close()
+
+def allocate_seats(event_id, n, reservation_id, preferences=None, hold_seconds=SEAT_HOLD_SECONDS):
+    """
+    Let the server pick the best available seats and hold them for the reservation.
+    Concurrent allocations never get the same seats (SKIP LOCKED), the inventory stays on the server.
+    preferences: {'sector': name, 'contiguous': bool} (contiguous: one block in one sector if possible).
+    Returns the allocated seats [{'id', 'name', 'sector', 'supplement'}], [] if not enough seats.
+    """
+    connection = None
+    try:
+        connection = _get_connection()
+        cursor = connection.cursor()
+
+        preferences = preferences or {}
+
+        query = """
+                SELECT seat_id, seat_name, sector_name, supplement
+                FROM allocate_seats(%s, %s, %s, %s, %s, %s) \
+                """
+        cursor.execute(query, (
+            event_id,
+            n,
+            reservation_id,
+            preferences.get('sector'),
+            preferences.get('contiguous', False),
+            hold_seconds
+        ))
+        rows = cursor.fetchall()
+        connection.commit()
+
+        seats = []
+        for row in rows:
+            seats.append({
+                'id': row[0],
+                'name': row[1],
+                'sector': row[2],
+                'supplement': float(row[3]) if row[3] else 0.0
+            })
+
+        cursor.close()
+        return seats
+
+    except Exception as e:
+        print(f"Error allocating seats: {e}")
+        if connection:
+            connection.rollback()
+        return []
+    finally:
+        if connection:
+            connection.close()
+
+def checkout(event_id, client, tarif_quantities, seat_ids=None, vendor_id=1, preferences=None):
+    """
+    Create the client, the reservation and its tickets in one transaction (one round trip).
+    client: dict with email/firstname/lastname, or None for staff sales.
+    tarif_quantities: {tarif_name: quantity}.
+    seat_ids: seats chosen by the buyer, or None to let the server allocate them (see allocate_seats).
+    preferences: for allocated seats, {'sector': name, 'contiguous': bool}.
+    Returns {'reservation_id', 'ticket_ids', 'total'} or None on error.
+    """
+    connection = None
+    try:
+        connection = _get_connection()
+        cursor = connection.cursor()
+
+        tarifs = [{'name': name, 'quantity': quantity}
+                  for name, quantity in tarif_quantities.items() if quantity > 0]
+        client = client or {}
+        preferences = preferences or {}
+
+        query = """
+                SELECT reservation_id, ticket_ids, total
+                FROM checkout(%s, %s, %s, %s, %s, %s, %s, %s, %s) \
+                """
+        cursor.execute(query, (
+            event_id,
+            vendor_id,
+            client.get('email'),
+            client.get('firstname'),
+            client.get('lastname'),
+            Json(tarifs),
+            list(seat_ids) if seat_ids is not None else None,
+            preferences.get('sector'),
+            preferences.get('contiguous', False)
+        ))
+        row = cursor.fetchone()
+        connection.commit()
+
+        cursor.close()
+        return {
+            'reservation_id': row[0],
+            'ticket_ids': list(row[1]),
+            'total': float(row[2]) if row[2] else 0.0
+        }
+
+    except Exception as e:
+        print(f"Error during checkout: {e}")
+        if connection:
+            connection.rollback()
+        return None
+    finally:
+        if connection:
+            connection.close()
+
+CREATE_PAYMENT = prepared_statement("create_payment", """
                 INSERT INTO payment (reservation_id, total, method)
                 VALUES (%s, %s, %s)
                 RETURNING id \
-                """
+                """)
+
+def create_payment(reservation_id, total, method='card'):
+    connection = None
+    try:
+        connection = _get_connection()
+        cursor = connection.cursor()
 
-        cursor.execute(query, (reservation_id, total, method))
+        execute_prepared(cursor, CREATE_PAYMENT, (reservation_id, total, method))
         payment_id = cursor.fetchone()[0]
         connection.commit()
 
@@ -339,10 +931,11 @@ def create_payment(reservation_id, total, method='card'):
         if connection:
             connection.close()
 
+@cached(ttl=EVENT_DATA_CACHE_SECONDS)
 def get_sector_supplements_for_event(event_id):
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
 
         query = """
@@ -372,19 +965,21 @@ def get_sector_supplements_for_event(event_id):
 
     except Exception as e:
         print(f"Error fetching sector supplements: {e}")
+        dont_cache()
         return {}
     finally:
         if connection:
             connection.close()
 
+@cached(ttl=EVENT_DATA_CACHE_SECONDS)
 def get_need_reservation_for_event(event_id):
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
 
         query = """
-                SELECT t.need_reservation
+                SELECT t.need_reservation AND NOT e.general_admission
                 FROM event e
                          JOIN type_of_event t ON e.type_id = t.id
                 WHERE e.id = %s \
@@ -398,6 +993,7 @@ def get_need_reservation_for_event(event_id):
 
     except Exception as e:
         print(f"Error fetching need_reservation: {e}")
+        dont_cache()
         return True  # Safe default
     finally:
         if connection:
@@ -439,7 +1035,28 @@ def delete_reservation(reservation_id):
         connection = _get_connection()
         cursor = connection.cursor()
 
-        # First delete all tickets associated with this reservation
+        # Give back the seats held on the seat map
+        release_holds_query = """
+                              UPDATE event_seat
+                              SET status = 'AVAILABLE', hold_expires_at = NULL, held_by = NULL
+                              WHERE held_by = %s
+                                AND status = 'HOLD' \
+                              """
+        cursor.execute(release_holds_query, (reservation_id,))
+
+        # And the seats reserved by its tickets
+        release_seats_query = """
+                              UPDATE event_seat es
+                              SET status = 'AVAILABLE'
+                              FROM ticket t
+                              WHERE t.reservation_id = %s
+                                AND es.event_id = t.event_id
+                                AND es.seat_id = t.seat_id
+                                AND es.status = 'RESERVED' \
+                              """
+        cursor.execute(release_seats_query, (reservation_id,))
+
+        # Then delete all tickets associated with this reservation
         delete_tickets_query = """
                                DELETE \
                                FROM ticket
@@ -475,7 +1092,7 @@ def delete_reservation(reservation_id):
 def get_all_rooms_names():
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
 
         query = """
@@ -498,7 +1115,7 @@ def get_all_rooms_names():
 def get_all_config_names():
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
 
         query = """
@@ -521,7 +1138,7 @@ def get_all_config_names():
 def get_type_id(type_name):
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
 
         query = """
@@ -544,7 +1161,7 @@ def get_type_id(type_name):
 def get_room_id(room_name):
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
 
         query = """
@@ -567,7 +1184,7 @@ def get_room_id(room_name):
 def get_config_id(config_name):
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
 
         query = """
@@ -587,18 +1204,35 @@ def get_config_id(config_name):
         if connection:
             connection.close()
 
-def create_event(name, type_id, start_at, end_at, room_id, config_id, tarifs, status='on_sale'):
+def _invalidate_event(event_id):
+    """
+    Drop the cached reads of one event. Sales, holds, payments and cancellations change none of them
+    (seats and reservations are never cached), only creating an event does.
+    """
+    for read in (get_all_events_details, get_tarifs_for_event, get_event_room_config,
+                 get_sector_supplements_for_event, get_need_reservation_for_event):
+        read.invalidate(event_id)
+
+def create_event(name, type_id, start_at, end_at, room_id, config_id, tarifs, status='on_sale',
+                 general_admission=False, capacity=None):
+    """
+    Create an event with its tarifs.
+    General admission events get no seats, only a capacity counter
+    (capacity=None: as many places as seats in the configuration).
+    """
     connection = None
     try:
         connection = _get_connection()
         cursor = connection.cursor()
 
         query = """
-                INSERT INTO event (type_id, name, start_at, end_at, room_id, config_id, status)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                INSERT INTO event (type_id, name, start_at, end_at, room_id, config_id, status,
+                                   general_admission, capacity)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
                 RETURNING id \
                 """
-        cursor.execute(query, (type_id, name, start_at, end_at, room_id, config_id, status))
+        cursor.execute(query, (type_id, name, start_at, end_at, room_id, config_id, status,
+                               general_admission, capacity))
         event_id = cursor.fetchone()[0]
 
         # Insert tarifs for the event
@@ -611,6 +1245,8 @@ def create_event(name, type_id, start_at, end_at, room_id, config_id, tarifs, st
 
 
         connection.commit()
+        _invalidate_event(event_id)
+        get_all_events.invalidate()
 
         cursor.close()
         return event_id
@@ -625,7 +1261,7 @@ def create_event(name, type_id, start_at, end_at, room_id, config_id, tarifs, st
 
 def get_type_of_event_details(type_name):
     try:
-        conn = _get_connection()
+        conn = _get_connection(readonly=True)
         cursor = conn.cursor()
         cursor.execute("""
             SELECT id, name, is_free, need_reservation
@@ -648,6 +1284,51 @@ def get_type_of_event_details(type_name):
         print(f"Error getting event type details: {e}")
         return None
 
+def get_reference_data():
+    """
+    Event types, rooms, configurations and the tarifs of the events not over yet, in one round trip.
+    Loaded by src/db/reference_cache.py, None on error.
+    """
+    connection = None
+    try:
+        connection = _get_connection(readonly=True)
+        cursor = connection.cursor()
+
+        query = """
+                SELECT (SELECT COALESCE(json_agg(json_build_object(
+                            'id', t.id, 'name', t.name, 'is_free', t.is_free,
+                            'need_reservation', t.need_reservation) ORDER BY t.id), '[]')
+                        FROM type_of_event t),
+                       (SELECT COALESCE(json_agg(json_build_object(
+                            'id', r.id, 'name', r.name, 'address', r.address) ORDER BY r.name), '[]')
+                        FROM room r),
+                       (SELECT COALESCE(json_agg(json_build_object(
+                            'id', c.id, 'name', c.name) ORDER BY c.name), '[]')
+                        FROM configuration c),
+                       (SELECT COALESCE(json_agg(json_build_object(
+                            'id', tr.id, 'event_id', tr.event_id, 'name', tr.name,
+                            'price', COALESCE(tr.price, 0)) ORDER BY tr.event_id, tr.price DESC), '[]')
+                        FROM tarif tr
+                                 JOIN event e ON e.id = tr.event_id
+                        WHERE e.end_at > now()) \
+                """
+        cursor.execute(query)
+        types, rooms, configs, tarifs = cursor.fetchone()
+
+        cursor.close()
+        return {
+            'types': types,
+            'rooms': rooms,
+            'configs': configs,
+            'tarifs': [dict(tarif, price=float(tarif['price'])) for tarif in tarifs],
+        }
+    except Exception as e:
+        print(f"Error fetching reference data: {e}")
+        return None
+    finally:
+        if connection:
+            connection.close()
+
 #staff
 def add_staff_member(name):
     connection = None
@@ -659,6 +1340,7 @@ def add_staff_member(name):
         cursor.execute(query, (name,))
         staff_id = cursor.fetchone()[0]
         connection.commit()
+        get_all_staff.invalidate()
 
         cursor.close()
         return staff_id
@@ -676,22 +1358,23 @@ def get_event_statistics():
     """Get statistics for all events."""
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
 
+        # event_counters is kept current by triggers: one row per event, no join on tickets/seats
         query = """
                 SELECT e.id, \
                        e.name, \
                        e.start_at, \
                        e.status, \
-                       COUNT(DISTINCT t.id)       as tickets_sold, \
-                       COUNT(DISTINCT st.id)      as tickets_scanned, \
-                       COUNT(DISTINCT es.seat_id) as total_seats
+                       COALESCE(c.sold, 0)            as tickets_sold, \
+                       COALESCE(c.scanned, 0)         as tickets_scanned, \
+                       COALESCE(c.seats_total, 0)     as total_seats, \
+                       COALESCE(c.seats_available, 0) as seats_available, \
+                       COALESCE(c.reserved, 0)        as tickets_reserved, \
+                       COALESCE(c.revenue, 0)         as revenue
                 FROM event e
-                         LEFT JOIN ticket t ON e.id = t.event_id
-                         LEFT JOIN scan_ticket st ON t.id = st.ticket_id
-                         LEFT JOIN event_seat es ON e.id = es.event_id
-                GROUP BY e.id, e.name, e.start_at, e.status
+                         LEFT JOIN event_counters c ON c.event_id = e.id
                 ORDER BY e.start_at DESC \
                 """
 
@@ -707,7 +1390,10 @@ def get_event_statistics():
                 'status': row[3],
                 'tickets_sold': row[4],
                 'tickets_scanned': row[5],
-                'total_seats': row[6]
+                'total_seats': row[6],
+                'seats_available': row[7],
+                'tickets_reserved': row[8],
+                'revenue': float(row[9])
             })
 
         cursor.close()
@@ -722,7 +1408,7 @@ def get_event_statistics():
 def get_all_type_of_event_names():
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
 
         query = """
@@ -747,10 +1433,11 @@ def get_all_type_of_event_names():
             connection.close()
 
 # Staff functions
+@cached(ttl=STAFF_CACHE_SECONDS, maxsize=1)
 def get_all_staff():
     connection = None
     try:
-        connection = _get_connection()
+        connection = _get_connection(readonly=True)
         cursor = connection.cursor()
 
         query = "SELECT id, name FROM staff WHERE id != 1 ORDER BY name"
@@ -761,54 +1448,60 @@ def get_all_staff():
         return rows
     except Exception as e:
         print(f"Error fetching staff: {e}")
+        dont_cache()
         return []
     finally:
         if connection:
             connection.close()
 
-def scan_ticket(ticket_id, staff_id, door):
+# Messages shown at the door for each scan outcome
+SCAN_MESSAGES = {
+    'valid': "Billet #{ticket_id} validé",
+    'unknown': "Billet invalide",
+    'wrong_event': "Billet pour un autre événement",
+    'unpaid': "Billet non payé",
+    'already_scanned': "Billet déjà scanné à {scan_time} (porte {door})",
+}
+
+SCAN_TICKET = prepared_statement("scan_ticket", """
+                SELECT outcome, scanned_at, scanned_door
+                FROM record_ticket_scan(%s, %s, %s, %s) \
+                """)
+
+def scan_ticket(ticket_id, staff_id, door, event_id=None):
+    """
+    Scan a ticket in one round trip (record_ticket_scan), safe when two doors scan the same ticket.
+    event_id: event scanned at the door, None to accept any event.
+    Returns {'success', 'message', 'outcome', 'scan_time', 'door'},
+    scan_time/door being the first scan for already scanned tickets.
+    """
     connection = None
     try:
         connection = _get_connection()
         cursor = connection.cursor()
 
-        # Check if ticket exists and is valid
-        check_query = """
-                      SELECT t.id, r.status
-                      FROM ticket t
-                               JOIN reservation r ON t.reservation_id = r.id
-                      WHERE t.id = %s \
-                      """
-        cursor.execute(check_query, (ticket_id,))
-        result = cursor.fetchone()
-
-        if not result:
-            return {"success": False, "message": "Billet invalide"}
-
-        if result[1] != 'paid':
-            return {"success": False, "message": "Billet non payé"}
-
-        # Check if already scanned
-        scan_check = "SELECT id FROM scan_ticket WHERE ticket_id = %s"
-        cursor.execute(scan_check, (ticket_id,))
-        if cursor.fetchone():
-            return {"success": False, "message": "Billet déjà scanné"}
-
-        # Record scan
-        insert_query = """
-                       INSERT INTO scan_ticket (staff_id, door, ticket_id)
-                       VALUES (%s, %s, %s) \
-                       """
-        cursor.execute(insert_query, (staff_id, door, ticket_id))
+        execute_prepared(cursor, SCAN_TICKET, (ticket_id, staff_id, door, event_id))
+        outcome, scan_time, scan_door = cursor.fetchone()
         connection.commit()
-
         cursor.close()
-        return {"success": True, "message": f"Billet #{ticket_id} validé"}
+
+        message = SCAN_MESSAGES[outcome].format(
+            ticket_id=ticket_id,
+            scan_time=scan_time.strftime("%H:%M:%S") if scan_time else "",
+            door=scan_door
+        )
+        return {
+            "success": outcome == 'valid',
+            "message": message,
+            "outcome": outcome,
+            "scan_time": scan_time,
+            "door": scan_door
+        }
     except Exception as e:
         print(f"Error scanning ticket: {e}")
         if connection:
             connection.rollback()
-        return {"success": False, "message": "Erreur système"}
+        return {"success": False, "message": "Erreur système", "outcome": 'error', "scan_time": None, "door": None}
     finally:
         if connection:
             connection.close()
\ No newline at end of file
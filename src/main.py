@@ -1,38 +1,30 @@
+import time
+LAUNCH_STARTED_AT = time.perf_counter()
+
 import sys
 import os
 
-from PyQt6.uic import loadUi
 from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QWidget
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QPixmap
 
 # project constants
 from constants import (WINDOW_WIDTH,WINDOW_HEIGHT,MENU_BTN_WIDTH,MENU_BTN_HEIGHT,ICON_WIDTH,ICON_HEIGHT)
-from src.qt.confirmation_widget import ConfirmationWidget
-
-# Import all widgets
-from src.qt.home_widget import HomeWidget
-from src.qt.reservation_widget import ReservationWidget
-from src.qt.seatmap_widget import ConcertHall
-from src.qt.payment_widget import PaymentWidget
-from src.qt.admin_home_widget import AdminHomeWidget
-from src.qt.admin_new_event_widget import AdminNewEventWidget
-from src.qt.admin_new_staff_widget import AdminNewStaffWidget
-from src.qt.admin_stats_widget import AdminStatsWidget
-from src.qt.staff_home_widget import StaffHomeWidget
-from src.qt.staff_payment_widget import StaffPaymentWidget
-from src.qt.staff_sell_widget import StaffSellWidget
-from src.qt.staff_scan_widget import StaffScanWidget
+
+# Screen modules are imported when first shown
+from src.qt.navigation import ScreenStack
+from src.qt.startup import load_main_window_ui, start_live_updates_later, start_hold_sweeper_later, \
+    StartupProfiler, STARTUP_PROFILE_FLAG
+
+LAUNCH_IMPORTED_AT = time.perf_counter()
 
 
 class TicketBester(QMainWindow):
     def __init__(self):
         super().__init__()
 
-        ui_path = os.path.join(os.path.dirname(__file__), 'qt', 'GUI.ui')
-
         # Chargement du fichier .ui dans la classe
-        loadUi(ui_path, self)
+        load_main_window_ui(self)
 
         self.setWindowTitle("TicketBester")
         self.resize(WINDOW_WIDTH, WINDOW_HEIGHT)
@@ -40,6 +32,10 @@ class TicketBester(QMainWindow):
         if self.centralwidget.layout() is None:
             self.centralwidget.setLayout(QVBoxLayout())
 
+        # Screens: home pages are kept and refreshed when shown again, the others are rebuilt
+        self.screens = ScreenStack(self)
+        self.centralwidget.layout().addWidget(self.screens)
+
         # Gestionnaire de Vues
         self.current_widget = None
 
@@ -51,17 +47,16 @@ class TicketBester(QMainWindow):
         self.show_launcher_widget()
 
     def clear_central_widget(self):
-        """Clear central widget to display new view."""
-        if self.current_widget:
-            self.centralwidget.layout().removeWidget(self.current_widget)
-            self.current_widget.deleteLater()
-            self.current_widget = None
+        """Remove the current view if it is rebuilt on each visit."""
+        self.screens.discard_transient()
+        self.current_widget = None
 
     """launcher widget"""
     def show_launcher_widget(self):
-        self.clear_central_widget()
+        self.current_widget = self.screens.show_screen(self.create_launcher_widget, key="launcher")
+        self.setWindowTitle("TicketBester - Launcher")
 
-        # Create launcher widget
+    def create_launcher_widget(self):
         launcher_widget = QWidget()
         layout = QVBoxLayout()
         layout.setSpacing(40)
@@ -105,10 +100,7 @@ class TicketBester(QMainWindow):
         layout.addStretch()
 
         launcher_widget.setLayout(layout)
-
-        self.current_widget = launcher_widget
-        self.centralwidget.layout().addWidget(self.current_widget)
-        self.setWindowTitle("TicketBester - Launcher")
+        return launcher_widget
 
     def create_menu_button(self, emoji_or_icon, title, description, is_icon=False):
         """Create a styled menu button with emoji or icon, title, and description."""
@@ -167,86 +159,73 @@ class TicketBester(QMainWindow):
     """client widgets"""
     def show_home_widget(self):
         """Show client home page."""
-        self.clear_central_widget()
-        self.current_widget = HomeWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.home_widget import HomeWidget
+        self.current_widget = self.screens.show_screen(lambda: HomeWidget(self), key="home")
         self.setWindowTitle("TicketBester - Client")
 
     def show_reservation_widget(self, event_id, event_name):
-        self.clear_central_widget()
-        self.current_widget = ReservationWidget(self, event_id=event_id, event_name=event_name)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.reservation_widget import ReservationWidget
+        self.current_widget = self.screens.show_screen(lambda: ReservationWidget(self, event_id=event_id, event_name=event_name))
         self.setWindowTitle(f"TicketBester - Réservation #{event_id}")
 
     def show_seatmap_widget(self, reservation_data):
-        self.clear_central_widget()
-        self.current_widget = ConcertHall(reservation_data, parent=self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.seatmap_widget import ConcertHall
+        self.current_widget = self.screens.show_screen(lambda: ConcertHall(reservation_data, parent=self))
         self.setWindowTitle("TicketBester - Sélection des sièges")
 
     def show_payment_widget(self,reservation_data):
-        self.clear_central_widget()
-        self.current_widget = PaymentWidget(reservation_data,parent=self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.payment_widget import PaymentWidget
+        self.current_widget = self.screens.show_screen(lambda: PaymentWidget(reservation_data,parent=self))
         total_price = reservation_data['total']
         self.setWindowTitle(f"TicketBester - Paiement ({total_price:.2f} CHF)")
 
     def show_confirmation_widget(self,reservation_data):
-        self.clear_central_widget()
-        self.current_widget = ConfirmationWidget(reservation_data,parent=self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.confirmation_widget import ConfirmationWidget
+        self.current_widget = self.screens.show_screen(lambda: ConfirmationWidget(reservation_data,parent=self))
         self.setWindowTitle(f"TicketBester - Confirmation réservation")
 
 
     """admin widgets"""
     def show_admin_home_widget(self):
-        self.clear_central_widget()
-        self.current_widget = AdminHomeWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.admin_home_widget import AdminHomeWidget
+        self.current_widget = self.screens.show_screen(lambda: AdminHomeWidget(self), key="admin_home")
         self.setWindowTitle("TicketBester - Administration")
 
     def show_admin_new_event_widget(self):
-        self.clear_central_widget()
-        self.current_widget = AdminNewEventWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.admin_new_event_widget import AdminNewEventWidget
+        self.current_widget = self.screens.show_screen(lambda: AdminNewEventWidget(self))
         self.setWindowTitle("TicketBester - Nouvel événement")
 
     def show_admin_new_staff_widget(self):
-        self.clear_central_widget()
-        self.current_widget = AdminNewStaffWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.admin_new_staff_widget import AdminNewStaffWidget
+        self.current_widget = self.screens.show_screen(lambda: AdminNewStaffWidget(self))
         self.setWindowTitle("TicketBester - Nouveau personnel")
 
     def show_admin_stats_widget(self):
-        self.clear_central_widget()
-        self.current_widget = AdminStatsWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.admin_stats_widget import AdminStatsWidget
+        self.current_widget = self.screens.show_screen(lambda: AdminStatsWidget(self), key="admin_stats")
         self.setWindowTitle("TicketBester - Statistiques")
 
     """Staff widgets"""
     def show_staff_home_widget(self):
-        self.clear_central_widget()
-        self.current_widget = StaffHomeWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.staff_home_widget import StaffHomeWidget
+        self.current_widget = self.screens.show_screen(lambda: StaffHomeWidget(self), key="staff_home")
         self.setWindowTitle("TicketBester - Personnel")
 
     def show_staff_sell_widget(self):
-        self.clear_central_widget()
-        self.current_widget = StaffSellWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.staff_sell_widget import StaffSellWidget
+        self.current_widget = self.screens.show_screen(lambda: StaffSellWidget(self))
         self.setWindowTitle("TicketBester - Vente de billets")
 
     def show_staff_payment_widget(self, reservation_data):
-        self.clear_central_widget()
-        self.current_widget = StaffPaymentWidget(reservation_data, parent=self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.staff_payment_widget import StaffPaymentWidget
+        self.current_widget = self.screens.show_screen(lambda: StaffPaymentWidget(reservation_data, parent=self))
         total_price = reservation_data['total']
         self.setWindowTitle(f"TicketBester - Paiement Personnel ({total_price:.2f} CHF)")
 
     def show_staff_scan_widget(self):
-        self.clear_central_widget()
-        self.current_widget = StaffScanWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.staff_scan_widget import StaffScanWidget
+        self.current_widget = self.screens.show_screen(lambda: StaffScanWidget(self), key="staff_scan")
         self.setWindowTitle("TicketBester - Scanner les billets")
 
     def set_staff_info(self, staff_id, staff_name):
@@ -266,6 +245,13 @@ def main():
         print(f"QSS file not found: ({style_path})")
 
     window = TicketBester()
+    if STARTUP_PROFILE_FLAG in sys.argv:
+        StartupProfiler("main", LAUNCH_STARTED_AT, LAUNCH_IMPORTED_AT, window)
+    else:
+        # Screens follow the database changes (new events, sales, cancellations)
+        start_live_updates_later(window)
+        # Seats held and reservations left unpaid go back on sale, seat map open or not
+        start_hold_sweeper_later(window)
     window.show()
 
     sys.exit(app.exec())
@@ -1,25 +1,25 @@
+import time
+LAUNCH_STARTED_AT = time.perf_counter()
+
 import sys
 import os
 
-from PyQt6.uic import loadUi
 from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout
 
 from constants import (WINDOW_WIDTH,WINDOW_HEIGHT)
 
-from src.qt.admin_home_widget import AdminHomeWidget
-from src.qt.admin_new_event_widget import AdminNewEventWidget
-from src.qt.admin_new_staff_widget import AdminNewStaffWidget
-from src.qt.admin_stats_widget import AdminStatsWidget
+from src.qt.navigation import ScreenStack
+from src.qt.startup import load_main_window_ui, start_live_updates_later, StartupProfiler, STARTUP_PROFILE_FLAG
+
+LAUNCH_IMPORTED_AT = time.perf_counter()
 
 
 class TicketBesterAdmin(QMainWindow):
     def __init__(self):
         super().__init__()
 
-        ui_path = os.path.join(os.path.dirname(__file__), 'qt', 'GUI.ui')
-
         # Load UI file
-        loadUi(ui_path, self)
+        load_main_window_ui(self)
 
         self.setWindowTitle("TicketBester - Administration")
         self.resize(WINDOW_WIDTH, WINDOW_HEIGHT)
@@ -27,38 +27,36 @@ class TicketBesterAdmin(QMainWindow):
         if self.centralwidget.layout() is None:
             self.centralwidget.setLayout(QVBoxLayout())
 
+        # Screens: home pages are kept and refreshed when shown again, the others are rebuilt
+        self.screens = ScreenStack(self)
+        self.centralwidget.layout().addWidget(self.screens)
+
         # View manager
         self.current_widget = None
         self.show_admin_home_widget()
 
     def clear_central_widget(self):
-        if self.current_widget:
-            self.centralwidget.layout().removeWidget(self.current_widget)
-            self.current_widget.deleteLater()
-            self.current_widget = None
+        self.screens.discard_transient()
+        self.current_widget = None
 
     def show_admin_home_widget(self):
-        self.clear_central_widget()
-        self.current_widget = AdminHomeWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.admin_home_widget import AdminHomeWidget
+        self.current_widget = self.screens.show_screen(lambda: AdminHomeWidget(self), key="admin_home")
         self.setWindowTitle("TicketBester - Administration")
 
     def show_admin_new_event_widget(self):
-        self.clear_central_widget()
-        self.current_widget = AdminNewEventWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.admin_new_event_widget import AdminNewEventWidget
+        self.current_widget = self.screens.show_screen(lambda: AdminNewEventWidget(self))
         self.setWindowTitle("TicketBester - Nouvel événement")
 
     def show_admin_new_staff_widget(self):
-        self.clear_central_widget()
-        self.current_widget = AdminNewStaffWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.admin_new_staff_widget import AdminNewStaffWidget
+        self.current_widget = self.screens.show_screen(lambda: AdminNewStaffWidget(self))
         self.setWindowTitle("TicketBester - Nouveau personnel")
 
     def show_admin_stats_widget(self):
-        self.clear_central_widget()
-        self.current_widget = AdminStatsWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.admin_stats_widget import AdminStatsWidget
+        self.current_widget = self.screens.show_screen(lambda: AdminStatsWidget(self), key="admin_stats")
         self.setWindowTitle("TicketBester - Statistiques")
 
 
@@ -74,6 +72,11 @@ def main():
         print(f"QSS file not found: ({style_path})")
 
     window = TicketBesterAdmin()
+    if STARTUP_PROFILE_FLAG in sys.argv:
+        StartupProfiler("main_admin", LAUNCH_STARTED_AT, LAUNCH_IMPORTED_AT, window)
+    else:
+        # Screens follow the database changes (new events, sales, cancellations)
+        start_live_updates_later(window)
     window.show()
 
     sys.exit(app.exec())
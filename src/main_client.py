@@ -1,25 +1,26 @@
+import time
+LAUNCH_STARTED_AT = time.perf_counter()
+
 import sys
 import os
 
-from PyQt6.uic import loadUi
 from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget
 
 from constants import (WINDOW_WIDTH,WINDOW_HEIGHT)
 
-from src.qt.home_widget import HomeWidget
-from src.qt.payment_widget import PaymentWidget
-from src.qt.reservation_widget import ReservationWidget
-from src.qt.seatmap_widget import ConcertHall
+from src.qt.navigation import ScreenStack
+from src.qt.startup import load_main_window_ui, start_live_updates_later, start_hold_sweeper_later, \
+    StartupProfiler, STARTUP_PROFILE_FLAG
+
+LAUNCH_IMPORTED_AT = time.perf_counter()
 
 class TicketBester(QMainWindow):
 
     def __init__(self):
         super().__init__()
 
-        ui_path = os.path.join(os.path.dirname(__file__), 'qt', 'GUI.ui')
-
         # Chargement du fichier .ui dans la classe
-        loadUi(ui_path, self)
+        load_main_window_ui(self)
 
         self.setWindowTitle("TicketBester")
         self.resize(WINDOW_WIDTH, WINDOW_HEIGHT)
@@ -27,6 +28,10 @@ class TicketBester(QMainWindow):
         if self.centralwidget.layout() is None:
             self.centralwidget.setLayout(QVBoxLayout())
 
+        # Screens: home pages are kept and refreshed when shown again, the others are rebuilt
+        self.screens = ScreenStack(self)
+        self.centralwidget.layout().addWidget(self.screens)
+
         # Gestionnaire de Vues
         self.current_widget = None
         self.show_home_widget()
@@ -34,36 +39,30 @@ class TicketBester(QMainWindow):
 
     def clear_central_widget(self):
         """Nettoie le widget central pour afficher une nouvelle vue."""
-        if self.current_widget:
-            self.centralwidget.layout().removeWidget(self.current_widget)
-            self.current_widget.deleteLater()
-            self.current_widget = None
+        self.screens.discard_transient()
+        self.current_widget = None
 
     def show_reservation_widget(self, event_id, event_name):
         """Affiche la page de réservation pour un événement donné."""
-        self.clear_central_widget()
-        self.current_widget = ReservationWidget(self, event_id=event_id, event_name=event_name)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.reservation_widget import ReservationWidget
+        self.current_widget = self.screens.show_screen(lambda: ReservationWidget(self, event_id=event_id, event_name=event_name))
         self.setWindowTitle(f"TicketBester - Réservation #{event_id}")
 
     def show_home_widget(self):
         """Revient à la page d'accueil."""
-        self.clear_central_widget()
-        self.current_widget = HomeWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.home_widget import HomeWidget
+        self.current_widget = self.screens.show_screen(lambda: HomeWidget(self), key="home")
         self.setWindowTitle("TicketBester")
 
     def show_seatmap_widget(self,reservation_data):
-        self.clear_central_widget()
-        self.current_widget = ConcertHall(reservation_data, parent=self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.seatmap_widget import ConcertHall
+        self.current_widget = self.screens.show_screen(lambda: ConcertHall(reservation_data, parent=self))
         self.setWindowTitle(f"TicketBester - Sélection des sièges")
 
     def show_payment_widget(self,reservation_data): # ToDo Faire le widget
-        self.clear_central_widget()
+        from src.qt.payment_widget import PaymentWidget
         # On crée le widget de paiement avec le prix reçu
-        self.current_widget = PaymentWidget(reservation_data, parent=self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        self.current_widget = self.screens.show_screen(lambda: PaymentWidget(reservation_data, parent=self))
         total_price = reservation_data['total']
         self.setWindowTitle("TicketBester - Paiement ({total_price:.2f} CHF)")
 
@@ -82,6 +81,13 @@ def main():
         print(f"QSS file not found: ({style_path})")
 
     window = TicketBester()
+    if STARTUP_PROFILE_FLAG in sys.argv:
+        StartupProfiler("main_client", LAUNCH_STARTED_AT, LAUNCH_IMPORTED_AT, window)
+    else:
+        # Screens follow the database changes (new events, sales, cancellations)
+        start_live_updates_later(window)
+        # Seats held and reservations left unpaid go back on sale, seat map open or not
+        start_hold_sweeper_later(window)
     window.show()
 
     sys.exit(app.exec())
@@ -1,24 +1,26 @@
+import time
+LAUNCH_STARTED_AT = time.perf_counter()
+
 import sys
 import os
 
-from PyQt6.uic import loadUi
 from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout
 
 from constants import (WINDOW_WIDTH,WINDOW_HEIGHT)
 
-from src.qt.staff_home_widget import StaffHomeWidget
-from src.qt.staff_sell_widget import StaffSellWidget
-from src.qt.staff_scan_widget import StaffScanWidget
+from src.qt.navigation import ScreenStack
+from src.qt.startup import load_main_window_ui, start_live_updates_later, start_hold_sweeper_later, \
+    StartupProfiler, STARTUP_PROFILE_FLAG
+
+LAUNCH_IMPORTED_AT = time.perf_counter()
 
 
 class TicketBesterStaff(QMainWindow):
     def __init__(self):
         super().__init__()
 
-        ui_path = os.path.join(os.path.dirname(__file__), 'qt', 'GUI.ui')
-
         # Load UI file
-        loadUi(ui_path, self)
+        load_main_window_ui(self)
 
         self.setWindowTitle("TicketBester - Personnel")
         self.resize(WINDOW_WIDTH, WINDOW_HEIGHT)
@@ -26,6 +28,10 @@ class TicketBesterStaff(QMainWindow):
         if self.centralwidget.layout() is None:
             self.centralwidget.setLayout(QVBoxLayout())
 
+        # Screens: home pages are kept and refreshed when shown again, the others are rebuilt
+        self.screens = ScreenStack(self)
+        self.centralwidget.layout().addWidget(self.screens)
+
         # View manager
         self.current_widget = None
 
@@ -37,30 +43,25 @@ class TicketBesterStaff(QMainWindow):
 
     def clear_central_widget(self):
         """Clear central widget to display new view."""
-        if self.current_widget:
-            self.centralwidget.layout().removeWidget(self.current_widget)
-            self.current_widget.deleteLater()
-            self.current_widget = None
+        self.screens.discard_transient()
+        self.current_widget = None
 
     def show_staff_home_widget(self):
         """Show staff dashboard."""
-        self.clear_central_widget()
-        self.current_widget = StaffHomeWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.staff_home_widget import StaffHomeWidget
+        self.current_widget = self.screens.show_screen(lambda: StaffHomeWidget(self), key="staff_home")
         self.setWindowTitle("TicketBester - Personnel")
 
     def show_staff_sell_widget(self):
         """Show ticket selling page."""
-        self.clear_central_widget()
-        self.current_widget = StaffSellWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.staff_sell_widget import StaffSellWidget
+        self.current_widget = self.screens.show_screen(lambda: StaffSellWidget(self))
         self.setWindowTitle("TicketBester - Vente de billets")
 
     def show_staff_scan_widget(self):
         """Show ticket scanning page."""
-        self.clear_central_widget()
-        self.current_widget = StaffScanWidget(self)
-        self.centralwidget.layout().addWidget(self.current_widget)
+        from src.qt.staff_scan_widget import StaffScanWidget
+        self.current_widget = self.screens.show_screen(lambda: StaffScanWidget(self), key="staff_scan")
         self.setWindowTitle("TicketBester - Scanner les billets")
 
     def set_staff_info(self, staff_id, staff_name):
@@ -81,6 +82,13 @@ def main():
         print(f"QSS file not found: ({style_path})")
 
     window = TicketBesterStaff()
+    if STARTUP_PROFILE_FLAG in sys.argv:
+        StartupProfiler("main_staff", LAUNCH_STARTED_AT, LAUNCH_IMPORTED_AT, window)
+    else:
+        # Screens follow the database changes (new events, sales, cancellations)
+        start_live_updates_later(window)
+        # Seats held and reservations left unpaid go back on sale, seat map open or not
+        start_hold_sweeper_later(window)
     window.show()
 
     sys.exit(app.exec())
@@ -21,7 +21,11 @@ class AdminHomeWidget(QWidget):
         back_layout = QHBoxLayout()
         self.btn_launcher = QPushButton("← Retour au menu")
         self.btn_launcher.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.btn_launcher.clicked.connect(self.main_window.show_launcher_widget)
+        if hasattr(self.main_window, "show_launcher_widget"):
+            self.btn_launcher.clicked.connect(self.main_window.show_launcher_widget)
+        else:
+            # Standalone launcher: no menu to go back to
+            self.btn_launcher.hide()
         self.btn_launcher.setObjectName("backBtn")
         back_layout.addWidget(self.btn_launcher)
         back_layout.addStretch()
@@ -1,19 +1,44 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QLineEdit, QComboBox, QDateTimeEdit,
-                             QMessageBox, QFormLayout, QDoubleSpinBox)
+                             QMessageBox, QFormLayout, QDoubleSpinBox, QCheckBox, QSpinBox)
 from PyQt6.QtCore import Qt, QDateTime
 
 from src.constants import (BACK_BTN_WIDTH,CANCEL_BTN_WIDTH,CONTINUE_BTN_WIDTH)
 
-from src.db.requests import create_event, get_all_type_of_event_names, get_all_rooms_names, get_all_config_names, \
-    get_type_id, get_room_id, get_config_id, get_type_of_event_details
+from src.db.requests import create_event
+from src.db.reference_cache import get_type_names, get_room_names, get_config_names, get_type_id, get_room_id, \
+    get_config_id, get_type_details, invalidate_reference_cache
+from src.qt.db_tasks import DbTaskRunner
+
+
+def create_event_from_form(event_name, type_name, room_name, config_name, start_at, end_at, prices,
+                           general_admission, capacity):
+    """Resolve the names chosen in the form and create the event, run off the GUI thread."""
+    type_details = get_type_details(type_name)
+    is_free = type_details.get('is_free', False) if type_details else False
+
+    # Prepare tariffs
+    if is_free:
+        prices = {'Normal': 0.00, 'Student': 0.00, 'Staff': 0.00}
+    tarifs = [{'name': name, 'price': price} for name, price in prices.items()]
+
+    event_id = create_event(event_name, get_type_id(type_name), start_at, end_at, get_room_id(room_name),
+                            get_config_id(config_name), tarifs,
+                            general_admission=general_admission, capacity=capacity)
+    if event_id:
+        # The new event's tarifs
+        invalidate_reference_cache()
+    return event_id
 
 
 class AdminNewEventWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = parent
+        self.db = DbTaskRunner(self)
         self.init_ui()
+        self.db.busy_changed.connect(self.set_loading)
+        self.load_choices()
 
     def init_ui(self):
         # Main layout
@@ -47,7 +72,6 @@ class AdminNewEventWidget(QWidget):
         self.type_combo = QComboBox()
         self.type_combo.addItem("Sélectionner un type")
         self.type_combo.model().item(0).setEnabled(False)
-        self.type_combo.addItems(get_all_type_of_event_names())
         self.type_combo.setMinimumWidth(400)
         self.type_combo.currentIndexChanged.connect(self.on_type_changed)
 
@@ -88,7 +112,6 @@ class AdminNewEventWidget(QWidget):
         self.room_combo.setObjectName("comboBox")
         self.room_combo.addItem("Choisissez une salle")
         self.room_combo.model().item(0).setEnabled(False) #can't choose "Choisissez une salle"
-        self.room_combo.addItems(get_all_rooms_names())
         self.room_combo.setMinimumWidth(400)
         form_layout.addRow("Salle *:", self.room_combo)
 
@@ -97,10 +120,23 @@ class AdminNewEventWidget(QWidget):
         self.config_combo.setObjectName("comboBox")
         self.config_combo.addItem("Choisissez une configuration")
         self.config_combo.model().item(0).setEnabled(False)
-        self.config_combo.addItems(get_all_config_names())
         self.config_combo.setMinimumWidth(400)
         form_layout.addRow("Configuration *:", self.config_combo)
 
+        # General admission (no seat map, only a number of places)
+        self.general_admission_check = QCheckBox("Placement libre")
+        self.general_admission_check.toggled.connect(self.on_general_admission_toggled)
+        form_layout.addRow("Placement:", self.general_admission_check)
+
+        self.capacity_spin = QSpinBox()
+        self.capacity_spin.setMinimum(0)
+        self.capacity_spin.setMaximum(100000)
+        self.capacity_spin.setSingleStep(50)
+        self.capacity_spin.setSpecialValueText("Selon la configuration")
+        self.capacity_spin.setEnabled(False)
+        self.capacity_spin.setMinimumWidth(400)
+        form_layout.addRow("Capacité:", self.capacity_spin)
+
         self.layout.addLayout(form_layout)
         self.layout.addSpacing(20)
 
@@ -176,16 +212,26 @@ class AdminNewEventWidget(QWidget):
         cancel_btn.clicked.connect(self.go_back)
         button_layout.addWidget(cancel_btn)
 
-        create_btn = QPushButton("Créer l'événement")
-        create_btn.setFixedWidth(CONTINUE_BTN_WIDTH)
-        create_btn.setObjectName("continueBtn")
-        create_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        create_btn.clicked.connect(self.create_event_action)
-        button_layout.addWidget(create_btn)
+        self.create_btn = QPushButton("Créer l'événement")
+        self.create_btn.setFixedWidth(CONTINUE_BTN_WIDTH)
+        self.create_btn.setObjectName("continueBtn")
+        self.create_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.create_btn.clicked.connect(self.create_event_action)
+        button_layout.addWidget(self.create_btn)
 
         self.layout.addLayout(button_layout)
         self.layout.addStretch()
 
+    def load_choices(self):
+        """Fill the type, room and configuration lists in the background."""
+        self.db.run(get_type_names, on_success=self.type_combo.addItems)
+        self.db.run(get_room_names, on_success=self.room_combo.addItems)
+        self.db.run(get_config_names, on_success=self.config_combo.addItems)
+
+    def set_loading(self, loading):
+        self.create_btn.setEnabled(not loading)
+        self.create_btn.setText("Chargement..." if loading else "Créer l'événement")
+
     def on_type_changed(self, index):
         """Handle event type selection change."""
         if index == 0:
@@ -195,9 +241,10 @@ class AdminNewEventWidget(QWidget):
             return
 
         type_name = self.type_combo.currentText().strip()
-        type_details = get_type_of_event_details(type_name)
+        self.db.run(get_type_details, type_name, on_success=self.show_type_pricing, key="type_details")
 
-        if type_details:
+    def show_type_pricing(self, type_details):
+        if type_details and self.type_combo.currentIndex() != 0:
             is_free = type_details.get('is_free', False)
             self.pricing_title.show()
 
@@ -209,6 +256,9 @@ class AdminNewEventWidget(QWidget):
                 self.pricing_widget.show()
 
 
+    def on_general_admission_toggled(self, checked):
+        self.capacity_spin.setEnabled(checked)
+
     def create_event_action(self):
         # Validation
         if not self.name_input.text().strip():
@@ -231,43 +281,31 @@ class AdminNewEventWidget(QWidget):
             QMessageBox.warning(self, "Erreur", "La date de fin doit être après la date de début.")
             return
 
-        # Get event type details
-        type_name = self.type_combo.currentText().strip()
-        type_details = get_type_of_event_details(type_name)
-        is_free = type_details.get('is_free', False) if type_details else False
-
-        # Prepare tariffs
-        if is_free:
-            tarifs = [
-                {'name': 'Normal', 'price': 0.00},
-                {'name': 'Student', 'price': 0.00},
-                {'name': 'Staff', 'price': 0.00}
-            ]
-        else:
-            tarifs = [
-                {'name': 'Normal', 'price': self.normal_price.value()},
-                {'name': 'Student', 'price': self.student_price.value()},
-                {'name': 'Staff', 'price': self.staff_price.value()}
-            ]
-
+        prices = {
+            'Normal': self.normal_price.value(),
+            'Student': self.student_price.value(),
+            'Staff': self.staff_price.value()
+        }
 
         # Create event
         event_name = self.name_input.text().strip()
-
         type_name = self.type_combo.currentText().strip()
-        type_id = get_type_id(type_name)
+        room_name = self.room_combo.currentText().strip()
+        config_name = self.config_combo.currentText().strip()
 
         start_at = self.start_datetime.dateTime().toPyDateTime().replace(second=0, microsecond=0)
         end_at = self.end_datetime.dateTime().toPyDateTime().replace(second=0, microsecond=0)
 
-        room_name = self.room_combo.currentText().strip()
-        room_id = get_room_id(room_name)
-
-        config_name = self.config_combo.currentText().strip()
-        config_id = get_config_id(config_name)
+        general_admission = self.general_admission_check.isChecked()
+        # 0 = as many places as seats in the configuration
+        capacity = (self.capacity_spin.value() or None) if general_admission else None
 
-        event_id = create_event(event_name, type_id, start_at, end_at, room_id, config_id, tarifs)
+        self.db.run(create_event_from_form, event_name, type_name, room_name, config_name, start_at, end_at,
+                    prices, general_admission, capacity,
+                    on_success=lambda event_id: self.on_event_created(event_name, event_id),
+                    on_error=self.on_event_created_error, key="create_event")
 
+    def on_event_created(self, event_name, event_id):
         if event_id:
             QMessageBox.information(
                 self,
@@ -276,11 +314,14 @@ class AdminNewEventWidget(QWidget):
             )
             self.clear_form()
         else:
-            QMessageBox.critical(
-                self,
-                "Erreur",
-                "Une erreur est survenue lors de la création de l'événement."
-            )
+            self.on_event_created_error()
+
+    def on_event_created_error(self, error=None):
+        QMessageBox.critical(
+            self,
+            "Erreur",
+            "Une erreur est survenue lors de la création de l'événement."
+        )
 
     def clear_form(self):
         """Clear all form fields."""
@@ -291,6 +332,8 @@ class AdminNewEventWidget(QWidget):
         self.end_datetime.setDateTime(min_start_at.addSecs(7200))
         self.room_combo.setCurrentIndex(0)
         self.config_combo.setCurrentIndex(0)
+        self.general_admission_check.setChecked(False)
+        self.capacity_spin.setValue(0)
         self.normal_price.setValue(0.00)
         self.student_price.setValue(0.00)
         self.staff_price.setValue(0.00)
@@ -4,13 +4,16 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
 from PyQt6.QtCore import Qt
 
 from src.db.requests import add_staff_member, get_all_staff
+from src.qt.db_tasks import DbTaskRunner
 
 
 class AdminNewStaffWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = parent
+        self.db = DbTaskRunner(self)
         self.init_ui()
+        self.db.busy_changed.connect(self.set_loading)
         self.load_staff_list()
 
     def init_ui(self):
@@ -61,10 +64,10 @@ class AdminNewStaffWidget(QWidget):
         add_btn_layout = QHBoxLayout()
         add_btn_layout.addStretch()
 
-        add_btn = QPushButton("Ajouter le membre")
-        add_btn.setObjectName("continueBtn")
-        add_btn.clicked.connect(self.add_staff_action)
-        add_btn_layout.addWidget(add_btn)
+        self.add_btn = QPushButton("Ajouter le membre")
+        self.add_btn.setObjectName("continueBtn")
+        self.add_btn.clicked.connect(self.add_staff_action)
+        add_btn_layout.addWidget(self.add_btn)
 
         layout.addLayout(add_btn_layout)
 
@@ -100,8 +103,11 @@ class AdminNewStaffWidget(QWidget):
             QMessageBox.warning(self, "Erreur", "Veuillez entrer un nom.")
             return
 
-        staff_id = add_staff_member(name)
+        self.db.run(add_staff_member, name,
+                    on_success=lambda staff_id: self.on_staff_added(name, staff_id),
+                    on_error=self.on_staff_added_error)
 
+    def on_staff_added(self, name, staff_id):
         if staff_id:
             QMessageBox.information(
                 self,
@@ -111,16 +117,25 @@ class AdminNewStaffWidget(QWidget):
             self.name_input.clear()
             self.load_staff_list()
         else:
-            QMessageBox.critical(
-                self,
-                "Erreur",
-                "Une erreur est survenue lors de l'ajout du membre."
-            )
+            self.on_staff_added_error()
+
+    def on_staff_added_error(self, error=None):
+        QMessageBox.critical(
+            self,
+            "Erreur",
+            "Une erreur est survenue lors de l'ajout du membre."
+        )
+
+    def set_loading(self, loading):
+        self.add_btn.setEnabled(not loading)
+        self.staff_table.setEnabled(not loading)
 
     def load_staff_list(self):
-        """Load and display all staff members."""
-        staff_list = get_all_staff()
+        """Load all staff members in the background."""
+        self.db.run(get_all_staff, on_success=self.show_staff_list, key="staff")
 
+    def show_staff_list(self, staff_list):
+        """Display all staff members."""
         self.staff_table.setRowCount(len(staff_list))
 
         for row, staff in enumerate(staff_list):
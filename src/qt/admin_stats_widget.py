@@ -1,16 +1,32 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QTableWidget, QTableWidgetItem, QHeaderView,
                              QProgressBar)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
+from src.constants import LIVE_UPDATE_DELAY_MS
 from src.db.requests import get_event_statistics
+from src.qt.db_tasks import DbTaskRunner
+from src.qt.live_updates import live_updates
 
 
 class AdminStatsWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = parent
+        self.db = DbTaskRunner(self)
         self.init_ui()
+        self.db.busy_changed.connect(self.set_loading)
+
+        # Sales, cancellations and new events are counted without pressing "Actualiser"
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_UPDATE_DELAY_MS)
+        self.live_timer.timeout.connect(self.load_statistics)
+        updates = live_updates()
+        updates.events_changed.connect(self.on_database_changed)
+        updates.seats_changed.connect(self.on_database_changed)
+        updates.reservations_changed.connect(self.on_database_changed)
+
         self.load_statistics()
 
     def init_ui(self):
@@ -28,10 +44,10 @@ class AdminStatsWidget(QWidget):
 
         header_layout.addStretch()
 
-        refresh_btn = QPushButton("🔄 Actualiser")
-        refresh_btn.setFixedWidth(120)
-        refresh_btn.clicked.connect(self.load_statistics)
-        header_layout.addWidget(refresh_btn)
+        self.refresh_btn = QPushButton("🔄 Actualiser")
+        self.refresh_btn.setFixedWidth(120)
+        self.refresh_btn.clicked.connect(self.load_statistics)
+        header_layout.addWidget(self.refresh_btn)
 
         layout.addLayout(header_layout)
 
@@ -45,7 +61,7 @@ class AdminStatsWidget(QWidget):
 
         # Statistics table
         self.stats_table = QTableWidget()
-        self.stats_table.setColumnCount(8)
+        self.stats_table.setColumnCount(9)
         self.stats_table.setHorizontalHeaderLabels([
             "ID",
             "Événement",
@@ -54,6 +70,7 @@ class AdminStatsWidget(QWidget):
             "Billets vendus",
             "Billets scannés",
             "Places totales",
+            "Recettes",
             "Taux de remplissage"
         ])
 
@@ -84,20 +101,31 @@ class AdminStatsWidget(QWidget):
         self.total_scanned_label.setStyleSheet("font-size: 14px; font-weight: bold;")
         summary_layout.addWidget(self.total_scanned_label)
 
+        self.total_revenue_label = QLabel("Recettes totales: 0.00 CHF")
+        self.total_revenue_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        summary_layout.addWidget(self.total_revenue_label)
+
         summary_layout.addStretch()
         layout.addLayout(summary_layout)
 
         self.setLayout(layout)
 
     def load_statistics(self):
-        """Load and display event statistics."""
-        stats = get_event_statistics()
+        """Load event statistics in the background, they are shown by show_statistics."""
+        self.db.run(get_event_statistics, on_success=self.show_statistics, key="statistics")
 
+    def set_loading(self, loading):
+        self.refresh_btn.setEnabled(not loading)
+        self.refresh_btn.setText("Chargement..." if loading else "🔄 Actualiser")
+
+    def show_statistics(self, stats):
+        """Display event statistics."""
         self.stats_table.setRowCount(len(stats))
         self.stats_table.setSortingEnabled(False)  # Disable while populating
 
         total_tickets = 0
         total_scanned = 0
+        total_revenue = 0.0
 
         for row, event_stat in enumerate(stats):
             # ID
@@ -156,6 +184,13 @@ class AdminStatsWidget(QWidget):
             seats_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
             self.stats_table.setItem(row, 6, seats_item)
 
+            # Revenue
+            revenue = event_stat['revenue']
+            revenue_item = QTableWidgetItem(f"{revenue:.2f} CHF")
+            revenue_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.stats_table.setItem(row, 7, revenue_item)
+            total_revenue += revenue
+
             # Fill rate with progress bar
             if total_seats > 0:
                 fill_rate = (tickets_sold / total_seats) * 100
@@ -181,21 +216,31 @@ class AdminStatsWidget(QWidget):
 
                 fill_layout.addWidget(progress)
                 fill_widget.setLayout(fill_layout)
-                self.stats_table.setCellWidget(row, 7, fill_widget)
+                self.stats_table.setCellWidget(row, 8, fill_widget)
             else:
                 fill_item = QTableWidgetItem("N/A")
                 fill_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.stats_table.setItem(row, 7, fill_item)
+                self.stats_table.setItem(row, 8, fill_item)
 
         # Update summary labels
         self.total_events_label.setText(f"Total d'événements: {len(stats)}")
         self.total_tickets_label.setText(f"Total de billets vendus: {total_tickets}")
         self.total_scanned_label.setText(f"Total de billets scannés: {total_scanned}")
+        self.total_revenue_label.setText(f"Recettes totales: {total_revenue:.2f} CHF")
 
         # Adjust column widths
         self.stats_table.resizeColumnsToContents()
         self.stats_table.setSortingEnabled(True)  # Re-enable sorting
 
+    def on_database_changed(self, change):
+        # Hidden screens are refreshed when shown again
+        if self.isVisible():
+            self.live_timer.start()
+
+    def refresh_on_show(self):
+        """Called when the kept screen is shown again."""
+        self.load_statistics()
+
     def go_back(self):
         """Return to admin home."""
         self.main_window.show_admin_home_widget()
\ No newline at end of file
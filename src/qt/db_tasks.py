@@ -0,0 +1,179 @@
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QApplication
+
+_pools_waited_on_quit = set()
+
+
+class DbTask(QObject):
+    """
+    A database call running on a thread pool.
+    succeeded / failed are emitted on the GUI thread, never after the task was cancelled.
+    """
+
+    started = pyqtSignal()
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    # Emitted from the pool thread, delivered on the GUI thread
+    _started = pyqtSignal()
+    _done = pyqtSignal(object, object)
+
+    def __init__(self, func, args, kwargs, key=None, parent=None):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.cancelled = False
+        self.done = False
+        self._pool = None
+        self._runnable = None
+        self._started.connect(self._on_started)
+        self._done.connect(self._on_done)
+
+    def same_call(self, func, args, kwargs):
+        return self.func is func and self.args == args and self.kwargs == kwargs
+
+    def cancel(self):
+        """Drop the result; the call is not made at all if it has not started yet."""
+        if self.cancelled or self.done:
+            return
+        self.cancelled = True
+        if self._runnable is not None:
+            self._pool.tryTake(self._runnable)
+        self._finish()
+
+    def _execute(self):
+        """Runs on the pool thread."""
+        if sip.isdeleted(self) or self.cancelled:
+            return
+        try:
+            self._started.emit()
+            try:
+                result, error = self.func(*self.args, **self.kwargs), None
+            except Exception as e:
+                result, error = None, e
+            self._done.emit(result, error)
+        except RuntimeError:
+            # The widget, and its runner, were deleted in the meantime
+            pass
+
+    @pyqtSlot()
+    def _on_started(self):
+        if not (self.cancelled or self.done):
+            self.started.emit()
+
+    @pyqtSlot(object, object)
+    def _on_done(self, result, error):
+        if self.cancelled or self.done:
+            return
+        if error is None:
+            self.succeeded.emit(result)
+        else:
+            print(f"Error in {self.func.__name__}: {error}")
+            self.failed.emit(str(error))
+        self._finish()
+
+    def _finish(self):
+        self.done = True
+        self.finished.emit()
+
+
+class _DbRunnable(QRunnable):
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+
+    def run(self):
+        self.task._execute()
+
+
+_detached_runner = None
+
+
+def run_detached(func, *args, **kwargs):
+    """Run a call nobody waits for (cleanup when leaving a page), it outlives the widget that started it."""
+    global _detached_runner
+    if _detached_runner is None:
+        _detached_runner = DbTaskRunner(QApplication.instance())
+    return _detached_runner.run(func, *args, **kwargs)
+
+
+class DbTaskRunner(QObject):
+    """
+    Runs the src.db.requests calls of a widget on a QThreadPool so the window never freezes.
+    Give a key to coalesce requests: the same call with the same key already running is shared,
+    a different one cancels it (only the latest selection, search... is shown).
+    Tasks belong to the runner, they are dropped with it when the widget is deleted.
+    """
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._pending = []
+        self._keyed = {}
+
+        # Let the running calls end before the connection pool is closed
+        app = QApplication.instance()
+        if app and id(self.pool) not in _pools_waited_on_quit:
+            _pools_waited_on_quit.add(id(self.pool))
+            app.aboutToQuit.connect(self.pool.waitForDone)
+
+    @property
+    def busy(self):
+        return bool(self._pending)
+
+    def run(self, func, *args, on_success=None, on_error=None, on_started=None, key=None, **kwargs):
+        """Call func(*args, **kwargs) on the pool and return its DbTask."""
+        replaced = self._keyed.get(key) if key is not None else None
+        if replaced is not None and replaced.same_call(func, args, kwargs):
+            self._connect(replaced, on_success, on_error)
+            return replaced
+
+        task = DbTask(func, args, kwargs, key, parent=self)
+        self._connect(task, on_success, on_error)
+        if on_started is not None:
+            task.started.connect(on_started)
+        task.finished.connect(lambda: self._forget(task))
+        task._pool = self.pool
+        task._runnable = _DbRunnable(task)
+
+        self._pending.append(task)
+        if key is not None:
+            self._keyed[key] = task
+        if len(self._pending) == 1:
+            self.busy_changed.emit(True)
+
+        if replaced is not None:
+            replaced.cancel()
+
+        self.pool.start(task._runnable)
+        return task
+
+    def cancel(self, key):
+        """Cancel the pending task started with this key, if any."""
+        if key in self._keyed:
+            self._keyed[key].cancel()
+
+    def cancel_all(self):
+        for task in list(self._pending):
+            task.cancel()
+
+    def _connect(self, task, on_success, on_error):
+        if on_success is not None:
+            task.succeeded.connect(on_success)
+        if on_error is not None:
+            task.failed.connect(on_error)
+
+    def _forget(self, task):
+        if task in self._pending:
+            self._pending.remove(task)
+        if task.key is not None and self._keyed.get(task.key) is task:
+            del self._keyed[task.key]
+        task.deleteLater()
+        if not self._pending:
+            self.busy_changed.emit(False)
@@ -0,0 +1,41 @@
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from src.constants import HOLD_SWEEP_INTERVAL_MS, PENDING_RESERVATION_MINUTES
+from src.db.requests import sweep_expired_holds
+from src.qt.db_tasks import DbTaskRunner
+
+
+class HoldSweeper(QObject):
+    """
+    Puts expired seat holds back on sale and expires abandoned pending reservations
+    (general admission ones too) every HOLD_SWEEP_INTERVAL_MS, off the GUI thread.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.db = DbTaskRunner(self)
+        self.timer = QTimer(self)
+        self.timer.setInterval(HOLD_SWEEP_INTERVAL_MS)
+        self.timer.timeout.connect(self.sweep)
+
+    def start(self):
+        """Sweep now, then on the timer until the app quits."""
+        if self.timer.isActive():
+            return
+        self.timer.start()
+        self.sweep()
+
+    def sweep(self):
+        # A sweep still running is not started a second time
+        self.db.run(sweep_expired_holds, PENDING_RESERVATION_MINUTES, key="sweep")
+
+
+_hold_sweeper = None
+
+
+def start_hold_sweeper():
+    global _hold_sweeper
+    if _hold_sweeper is None:
+        _hold_sweeper = HoldSweeper(QApplication.instance())
+    _hold_sweeper.start()
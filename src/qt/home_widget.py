@@ -1,12 +1,274 @@
-from PyQt6.QtGui import QBrush, QColor
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
-                             QTableWidgetItem, QHeaderView, QLabel, QPushButton, QFrame, QAbstractItemView, QMessageBox)
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QBrush, QColor, QFont, QFontMetrics
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, QStyledItemDelegate, QStyle,
+                             QStyleOptionViewItem, QStyleOptionButton, QHeaderView, QLabel, QPushButton, QFrame,
+                             QAbstractItemView, QMessageBox, QLineEdit)
+from PyQt6.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex, QEvent, QRect, pyqtSignal
 
-from src.db.requests import get_all_events
+from src.constants import EVENT_LIST_BATCH_SIZE, EVENT_ROW_HEIGHT, SEARCH_DEBOUNCE_MS, LIVE_UPDATE_DELAY_MS
+from src.db.requests import get_events_page, search_events
+from src.qt.db_tasks import DbTaskRunner
+from src.qt.live_updates import live_updates
 
 from src.qt.reservation_widget import ReservationWidget
 
+EVENT_TYPE_ROLE = Qt.ItemDataRole.UserRole
+
+
+class EventTableModel(QAbstractTableModel):
+    """
+    Upcoming events, fetched one page of get_events_page() at a time as the view scrolls.
+    Pages, refreshes and searches are loaded in the background, the latest request wins.
+    """
+
+    HEADERS = ["ÉVÈNEMENT / TYPE", "DATE", "HEURE", ""]
+
+    def __init__(self, parent=None, **filters):
+        super().__init__(parent)
+        # type_id / room_id / date_from / date_to of get_events_page()
+        self.filters = filters
+        self._events = []
+        # Keyset of the next page, None when the last page is loaded
+        self._next_cursor = None
+        self.db = DbTaskRunner(self)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._events)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._next_cursor is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        # Never replaces a refresh or a search still loading
+        if parent.isValid() or self._next_cursor is None or self.db.busy:
+            return
+        self.db.run(get_events_page, after=self._next_cursor, **self.filters,
+                    on_success=self._append_page, key="events")
+
+    def _append_page(self, page):
+        rows, self._next_cursor = page
+        rows = [tuple(row) for row in rows]
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self._events), len(self._events) + len(rows) - 1)
+            self._events.extend(rows)
+            self.endInsertRows()
+
+    def search(self, text):
+        """Show the search results instead of the catalog pages once loaded."""
+        self.db.run(search_events, text, on_success=self.show_search_results, key="events")
+
+    def show_search_results(self, rows):
+        self._next_cursor = None
+        self.set_events(rows)
+
+    def refresh(self, on_done=None):
+        """Fetch again the pages loaded so far, on_done(events) is called once they are shown."""
+        limit = max(len(self._events), EVENT_LIST_BATCH_SIZE)
+        self.db.run(get_events_page, limit=limit, **self.filters,
+                    on_success=lambda page: self._show_refreshed(page, on_done), key="events")
+
+    def _show_refreshed(self, page, on_done=None):
+        rows, self._next_cursor = page
+        self.set_events(rows)
+        if on_done is not None:
+            on_done(rows)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._events):
+            return None
+        evt_id, evt_name, type_name, date, hour = self._events[index.row()][:5]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return [str(evt_name), str(date), str(hour), "Réserver"][column]
+        if role == EVENT_TYPE_ROLE:
+            return str(type_name)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in (1, 2):
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.FontRole and column == 1:
+            font = QFont()
+            font.setPointSize(14)
+            font.setBold(True)
+            return font
+        if role == Qt.ItemDataRole.ForegroundRole and column == 1:
+            return QBrush(QColor("#fab387"))
+        if role == Qt.ItemDataRole.ForegroundRole and column == 2:
+            return QBrush(QColor("#a6adc8"))
+        return None
+
+    def event_at(self, row):
+        """(id, name) of the event on this row."""
+        return self._events[row][0], self._events[row][1]
+
+    def set_events(self, events):
+        """
+        Replace the events without resetting the view:
+        only the removed, added, moved and changed rows are signalled.
+        """
+        events = [tuple(event) for event in events]
+        if not self._events:
+            self.beginResetModel()
+            self._events = events
+            self.endResetModel()
+            return
+
+        # Events gone
+        new_ids = {event[0] for event in events}
+        for row in reversed(range(len(self._events))):
+            if self._events[row][0] not in new_ids:
+                self._remove_row(row)
+
+        # New, moved and changed events, in the new order
+        for row, event in enumerate(events):
+            if row < len(self._events) and self._events[row][0] == event[0]:
+                if self._events[row] != event:
+                    self._events[row] = event
+                    self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+                continue
+
+            current_ids = [e[0] for e in self._events[row:]]
+            if event[0] in current_ids:
+                self._remove_row(row + current_ids.index(event[0]))
+            self._insert_row(row, event)
+
+    def _remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._events[row]
+        self.endRemoveRows()
+
+    def _insert_row(self, row, event):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._events.insert(row, event)
+        self.endInsertRows()
+
+
+def _draw_item_background(option, index, delegate, painter):
+    """Background, alternate and selected colors of the table, without text."""
+    opt = QStyleOptionViewItem(option)
+    delegate.initStyleOption(opt, index)
+    opt.text = ""
+    style = opt.widget.style()
+    style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+    return opt, style
+
+
+class EventNameDelegate(QStyledItemDelegate):
+    """Event name with its type below."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont()
+        self.name_font.setPixelSize(15)
+        self.name_font.setBold(True)
+        self.type_font = QFont()
+        self.type_font.setPixelSize(10)
+        self.type_font.setItalic(True)
+
+    def paint(self, painter, option, index):
+        opt, style = _draw_item_background(option, index, self, painter)
+        rect = style.subElementRect(QStyle.SubElement.SE_ItemViewItemText, opt, opt.widget)
+
+        name_height = QFontMetrics(self.name_font).height()
+        type_height = QFontMetrics(self.type_font).height()
+        top = rect.top() + (rect.height() - name_height - 2 - type_height) // 2
+
+        painter.save()
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("#cdd6f4"))
+        painter.drawText(QRect(rect.left(), top, rect.width(), name_height),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         index.data(Qt.ItemDataRole.DisplayRole))
+        painter.setFont(self.type_font)
+        painter.setPen(QColor("#a6adc8"))
+        painter.drawText(QRect(rect.left(), top + name_height + 2, rect.width(), type_height),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         f"Type: {index.data(EVENT_TYPE_ROLE)}")
+        painter.restore()
+
+
+class ReserveButtonDelegate(QStyledItemDelegate):
+    """"Réserver" button painted in the cell, styled like QPushButton#reserveBtn."""
+
+    clicked = pyqtSignal(QModelIndex)
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        # Never shown, gives the stylesheet rules and size of the painted buttons
+        self._button = QPushButton("Réserver", view)
+        self._button.setObjectName("reserveBtn")
+        self._button.hide()
+        self._hovered_row = None
+        self._pressed_row = None
+        view.setMouseTracking(True)
+        view.viewport().installEventFilter(self)
+
+    def _button_rect(self, cell):
+        size = self._button.sizeHint()
+        return QRect(cell.center().x() - size.width() // 2, cell.center().y() - size.height() // 2,
+                     size.width(), size.height())
+
+    def paint(self, painter, option, index):
+        _draw_item_background(option, index, self, painter)
+
+        button = QStyleOptionButton()
+        button.initFrom(self._button)
+        button.rect = self._button_rect(option.rect)
+        button.text = index.data(Qt.ItemDataRole.DisplayRole)
+        button.state = QStyle.StateFlag.State_Enabled
+        if index.row() == self._hovered_row:
+            button.state |= QStyle.StateFlag.State_MouseOver
+        if index.row() == self._pressed_row:
+            button.state |= QStyle.StateFlag.State_Sunken
+        self._button.style().drawControl(QStyle.ControlElement.CE_PushButton, button, painter, self._button)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseMove, QEvent.Type.MouseButtonPress,
+                                QEvent.Type.MouseButtonRelease):
+            return False
+
+        on_button = self._button_rect(option.rect).contains(event.position().toPoint())
+        if event.type() == QEvent.Type.MouseMove:
+            self._set_hovered(index.row() if on_button else None)
+            return False
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self._pressed_row = index.row() if on_button else None
+            self.view.viewport().update()
+            return on_button
+
+        was_pressed = self._pressed_row == index.row()
+        self._pressed_row = None
+        self.view.viewport().update()
+        if was_pressed and on_button:
+            self.clicked.emit(index)
+            return True
+        return False
+
+    def eventFilter(self, obj, event):
+        # Hover ends when the mouse leaves the table or the column
+        if event.type() == QEvent.Type.Leave:
+            self._set_hovered(None)
+        elif event.type() == QEvent.Type.MouseMove:
+            if self.view.indexAt(event.position().toPoint()).column() != 3:
+                self._set_hovered(None)
+        return False
+
+    def _set_hovered(self, row):
+        if row != self._hovered_row:
+            self._hovered_row = row
+            self.view.viewport().update()
+
+
 class HomeWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -22,7 +284,11 @@ class HomeWidget(QWidget):
         # Bouton Retour au launcher
         self.btn_launcher = QPushButton("← Retour au menu")
         self.btn_launcher.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.btn_launcher.clicked.connect(self.window().show_launcher_widget)
+        if hasattr(self.window(), "show_launcher_widget"):
+            self.btn_launcher.clicked.connect(self.window().show_launcher_widget)
+        else:
+            # Standalone launcher: no menu to go back to
+            self.btn_launcher.hide()
         self.btn_launcher.setObjectName("backBtn")
         header_layout.addWidget(self.btn_launcher)
 
@@ -50,15 +316,37 @@ class HomeWidget(QWidget):
         line.setStyleSheet("color: #45475a;")
         self.layout.addWidget(line)
 
+        # --- Recherche ---
+        self.search_input = QLineEdit()
+        self.search_input.setObjectName("inputLine")
+        self.search_input.setPlaceholderText("Rechercher un évènement ou un type…")
+        self.search_input.setClearButtonEnabled(True)
+        self.layout.addWidget(self.search_input)
+
+        # The search runs once typing pauses, results of older searches are dropped
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+
         # --- Tableau des Événements ---
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["ÉVÈNEMENT / TYPE", "DATE", "HEURE", ""])
+        self.model = EventTableModel(self)
+        self.model.db.busy_changed.connect(self.set_loading)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+
+        # Name / type and button cells are painted by delegates, no widget per row
+        self.table.setItemDelegateForColumn(0, EventNameDelegate(self.table))
+        self.reserve_delegate = ReserveButtonDelegate(self.table)
+        self.reserve_delegate.clicked.connect(self.on_reserve_clicked)
+        self.table.setItemDelegateForColumn(3, self.reserve_delegate)
 
         # Configuration visuelle du tableau
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
         self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(EVENT_ROW_HEIGHT)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
 
         # On va personnaliser la largeur des colonnes
@@ -73,107 +361,54 @@ class HomeWidget(QWidget):
         self.table.setFocusPolicy(Qt.FocusPolicy.NoFocus)
 
         self.layout.addWidget(self.table)
-        self.refresh_data()
 
-    def create_reserve_button(self, evt_id, evt_name):
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
+        # New, changed or cancelled events show up without pressing "Actualiser"
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_UPDATE_DELAY_MS)
+        self.live_timer.timeout.connect(self.run_search)
+        live_updates().events_changed.connect(self.on_events_changed)
 
-        btn = QPushButton("Réserver")
-        btn.setObjectName("reserveBtn")
+        self.refresh_data()
 
-        btn.clicked.connect(lambda: QTimer.singleShot(0, lambda: self.window().show_reservation_widget(evt_id, evt_name)))
+    def on_reserve_clicked(self, index):
+        evt_id, evt_name = self.model.event_at(index.row())
+        QTimer.singleShot(0, lambda: self.window().show_reservation_widget(evt_id, evt_name))
 
-        layout.addWidget(btn)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.setContentsMargins(0, 0, 0, 0)
+    def set_loading(self, loading):
+        self.btn_refresh.setEnabled(not loading)
+        self.btn_refresh.setText("Chargement..." if loading else "Actualiser")
 
-        widget.setLayout(layout)
-        return widget
+    def run_search(self):
+        text = self.search_input.text().strip()
+        if not text:
+            # Back to the catalog
+            self.model.refresh()
+            return
+        self.model.search(text)
 
     def refresh_data(self):
-        try:
-            # Fetch real data from database
-            data = get_all_events()
-
-            if not data:
-                # Show message if no events found
-                QMessageBox.information(
-                    self,
-                    "Information",
-                    "Aucun événement disponible pour le moment."
-                )
-                self.table.setRowCount(0)
-                return
-
-            self.table.setRowCount(0)
-
-            for row_idx, row_data in enumerate(data):
-                evt_id = row_data[0]
-                evt_name = row_data[1]
-                type_name = row_data[2]
-                date = row_data[3]
-                hour = row_data[4]
-
-                # Format date and time for display
-                if hasattr(date, 'strftime'):
-                    date_str = date.strftime('%d/%m/%Y')
-                else:
-                    date_str = str(date)
-
-                if hasattr(hour, 'strftime'):
-                    hour_str = hour.strftime('%H:%M')
-                else:
-                    hour_str = str(hour)[:5]  # Take first 5 chars (HH:MM)
-
-                self.table.insertRow(row_idx)
-                self.table.setRowHeight(row_idx, 70)
-
-                # 1. ÉVÈNEMENT / TYPE
-                cell_widget = QWidget()
-                cell_layout = QVBoxLayout(cell_widget)
-                cell_layout.setContentsMargins(0, 0, 0, 0)
-                cell_layout.setSpacing(2)
-
-                # Nom
-                name_label = QLabel(str(evt_name))
-                name_label.setStyleSheet("font-weight: bold; font-size: 15px; color: #cdd6f4;")
-
-                # Type
-                type_label = QLabel(f"Type: {str(type_name)}")
-                type_label.setStyleSheet("font-style: italic; color: #a6adc8; font-size: 10px;")
-
-                cell_layout.addWidget(name_label)
-                cell_layout.addWidget(type_label)
-                cell_layout.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-
-                self.table.setCellWidget(row_idx, 0, cell_widget)
-
-                # 2. DATE
-                item_date = QTableWidgetItem(str(date))
-                item_date.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                font = item_date.font()
-                font.setPointSize(14)
-                font.setBold(True)
-                item_date.setFont(font)
-
-                item_date.setForeground(QBrush(QColor("#fab387")))
-                self.table.setItem(row_idx, 1, item_date)
-
-                # 3. HEURE
-                item_hour = QTableWidgetItem(str(hour))
-                item_hour.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                item_hour.setForeground(QBrush(QColor("#a6adc8")))
-                self.table.setItem(row_idx, 2, item_hour)
-
-                # 4. Bouton "Réserver"
-                self.table.setCellWidget(row_idx, 3, self.create_reserve_button(evt_id, evt_name))
-
-        except Exception as e:
-            QMessageBox.critical(
+        if self.search_input.text().strip():
+            self.run_search()
+            return
+
+        # Fetch real data from database, only the rows that changed are updated
+        self.model.refresh(on_done=self.on_events_loaded)
+
+    def on_events_changed(self, change):
+        # Hidden screens are refreshed when shown again
+        if self.isVisible():
+            self.live_timer.start()
+
+    def on_events_loaded(self, data):
+        if not data:
+            # Show message if no events found
+            QMessageBox.information(
                 self,
-                "Erreur",
-                f"Impossible de charger les événements:\n{str(e)}"
+                "Information",
+                "Aucun événement disponible pour le moment."
             )
-            print(f"Error in refresh_data: {e}")
\ No newline at end of file
+
+    def refresh_on_show(self):
+        """Called when the kept screen is shown again."""
+        self.refresh_data()
@@ -0,0 +1,57 @@
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QApplication
+
+from src.db.change_feed import get_change_listener, stop_change_listener, EVENT_CHANGES, SEAT_CHANGES, \
+    RESERVATION_CHANGES
+
+
+class LiveUpdates(QObject):
+    """
+    Database changes (src/db/change_feed.py) as Qt signals, emitted on the GUI thread.
+    The change is the decoded NOTIFY payload, None when everything should be reloaded.
+    """
+
+    events_changed = pyqtSignal(object)
+    seats_changed = pyqtSignal(object)
+    reservations_changed = pyqtSignal(object)
+
+    # Emitted from the listener thread, delivered on the GUI thread
+    _received = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._signals = {
+            EVENT_CHANGES: self.events_changed,
+            SEAT_CHANGES: self.seats_changed,
+            RESERVATION_CHANGES: self.reservations_changed,
+        }
+        self._received.connect(self._on_received)
+        self.listener = None
+
+    def start(self):
+        """Start listening, until the app quits."""
+        if self.listener is not None:
+            return
+        self.listener = get_change_listener()
+        for channel in self._signals:
+            self.listener.subscribe(channel, lambda change, channel=channel: self._received.emit(channel, change))
+        QApplication.instance().aboutToQuit.connect(stop_change_listener)
+
+    @pyqtSlot(str, object)
+    def _on_received(self, channel, change):
+        self._signals[channel].emit(change)
+
+
+_live_updates = None
+
+
+def live_updates():
+    """Signals of the app, they only fire once start_live_updates() was called."""
+    global _live_updates
+    if _live_updates is None:
+        _live_updates = LiveUpdates(QApplication.instance())
+    return _live_updates
+
+
+def start_live_updates():
+    live_updates().start()
@@ -0,0 +1,45 @@
+from PyQt6.QtWidgets import QStackedWidget
+
+
+class ScreenStack(QStackedWidget):
+    """
+    Screens of a main window.
+    Screens shown with a key are built once and kept: showing them again only calls their
+    refresh_on_show() if they have one. Screens without key (reservation, payment, forms...)
+    are built on each visit and deleted when another screen is shown.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._kept = {}
+        self._transient = None
+
+    def show_screen(self, factory, key=None):
+        """Show the kept screen `key`, or a new one from factory(). Returns the screen."""
+        widget = self._kept.get(key) if key is not None else None
+        reused = widget is not None
+        if not reused:
+            widget = factory()
+            self.addWidget(widget)
+            if key is not None:
+                self._kept[key] = widget
+
+        previous = self._transient
+        self._transient = None if key is not None else widget
+        self.setCurrentWidget(widget)
+        if previous is not None and previous is not widget:
+            self._discard(previous)
+
+        if reused and hasattr(widget, "refresh_on_show"):
+            widget.refresh_on_show()
+        return widget
+
+    def discard_transient(self):
+        """Delete the current screen if it is not a kept one."""
+        if self._transient is not None:
+            self._discard(self._transient)
+            self._transient = None
+
+    def _discard(self, widget):
+        self.removeWidget(widget)
+        widget.deleteLater()
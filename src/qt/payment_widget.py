@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButt
 from PyQt6.QtCore import Qt
 
 from src.db.requests import create_payment
+from src.qt.db_tasks import DbTaskRunner
 from src.constants import BACK_BTN_WIDTH
 
 
@@ -11,6 +12,7 @@ class PaymentWidget(QWidget):
         self.main_window = parent
         self.reservation_data = reservation_data
         self.total_price = self.reservation_data.get('total', 0.0)
+        self.db = DbTaskRunner(self)
 
         # Main Layout
         self.layout = QVBoxLayout(self)
@@ -184,40 +186,44 @@ class PaymentWidget(QWidget):
                 QMessageBox.warning(self, "Erreur", "Aucune réservation trouvée.")
                 return
 
-            payment_id = create_payment(
-                reservation_id=reservation_id,
-                total=self.total_price,
-                method=method
-            )
-
-            if not payment_id:
-                QMessageBox.warning(self, "Erreur", "Erreur lors du paiement.")
-                return
-
-            # Show success message
-            QMessageBox.information(
-                self,
-                "Paiement réussi",
-                f"Votre paiement de {self.total_price:.2f} CHF a été accepté!\n"
-                f"Réservation #{reservation_id}"
-            )
-
-            if self.main_window:
-                self.main_window.show_confirmation_widget(self.reservation_data)
+            self.btn_pay.setText("Paiement en cours...")
+            self.db.run(create_payment, reservation_id=reservation_id, total=self.total_price, method=method,
+                        on_success=self._on_payment_done, on_error=self._on_payment_error, key="payment")
 
         except Exception as e:
             import traceback
             print(f"ERROR in _finalize_payment: {e}")
             print(traceback.format_exc())
-
-            #if error enable back buttons to try again paying
-            self._enable_buttons()
-
-            QMessageBox.critical(
-                self,
-                "Erreur",
-                f"Une erreur est survenue lors du paiement: {str(e)}"
-            )
+            self._on_payment_error(str(e))
+
+    def _on_payment_done(self, payment_id):
+        self.btn_pay.setText(f"Payer {self.total_price:.2f} CHF")
+        if not payment_id:
+            QMessageBox.warning(self, "Erreur", "Erreur lors du paiement.")
+            return
+
+        # Show success message
+        QMessageBox.information(
+            self,
+            "Paiement réussi",
+            f"Votre paiement de {self.total_price:.2f} CHF a été accepté!\n"
+            f"Réservation #{self.reservation_data.get('reservation_id')}"
+        )
+
+        if self.main_window:
+            self.main_window.show_confirmation_widget(self.reservation_data)
+
+    def _on_payment_error(self, error):
+        self.btn_pay.setText(f"Payer {self.total_price:.2f} CHF")
+
+        #if error enable back buttons to try again paying
+        self._enable_buttons()
+
+        QMessageBox.critical(
+            self,
+            "Erreur",
+            f"Une erreur est survenue lors du paiement: {error}"
+        )
 
     def _enable_buttons(self):
         """Re-enable payment buttons (only call on error)"""
@@ -5,8 +5,24 @@ from PyQt6.QtGui import QFont, QColor, QBrush
 
 from src.constants import (CONTINUE_BTN_WIDTH)
 
-from src.db.requests import get_tarifs_for_event, get_need_reservation_for_event, create_client, create_reservation, \
-    get_available_seats_for_event, add_ticket_to_reservation, cancel_reservation
+from src.db.requests import get_need_reservation_for_event, create_client, create_reservation, checkout, \
+    cancel_reservation
+from src.db.reference_cache import get_event_tarifs
+from src.qt.db_tasks import DbTaskRunner, run_detached
+
+
+def load_event_options(event_id):
+    """Seat selection need and tarifs of an event, run off the GUI thread."""
+    tarifs = get_event_tarifs(event_id) if event_id else []
+    return get_need_reservation_for_event(event_id), tarifs
+
+
+def create_pending_reservation(event_id, email, firstname, lastname):
+    """Create or get the client, then its pending reservation. Returns (client_id, reservation_id)."""
+    client_id = create_client(email=email, firstname=firstname, lastname=lastname)
+    if not client_id:
+        return None, None
+    return client_id, create_reservation(event_id=event_id, client_id=client_id)
 
 
 class ReservationWidget(QWidget):
@@ -18,7 +34,8 @@ class ReservationWidget(QWidget):
         self.event_name = event_name
         self.tarifs = []
         self.prix_total = 0.00
-        self.need_reservation = get_need_reservation_for_event(self.event_id)
+        self.need_reservation = False
+        self.db = DbTaskRunner(self)
 
         # --- Layout Principal ---
         self.layout = QVBoxLayout(self)
@@ -28,27 +45,39 @@ class ReservationWidget(QWidget):
         # --- Titre et Navigation ---
         self._setup_header()
 
-        # Load tarifs from database
-        self._load_tarifs()
-
         # --- Contenu Principal (Tarifs) ---
         self._setup_tarifs_section()
 
         # --- Section Récapitulatif et Paiement ---
         self._setup_footer()
 
-    def _load_tarifs(self):
-        try:
-            if self.event_id:
-                self.tarifs = get_tarifs_for_event(self.event_id)
+        # Load tarifs from database
+        self.db.busy_changed.connect(self._set_loading)
+        self._load_tarifs()
 
-        except Exception as e:
-            print(f"Error loading tarifs: {e}")
-            # Use dummy data on error
-            self.tarifs = [
-                {"id": 1, "name": "Normal", "price": 12.00},
-                {"id": 2, "name": "Student", "price": 10.00},
-            ]
+    def _load_tarifs(self):
+        self.db.run(load_event_options, self.event_id,
+                    on_success=self._show_event_options, on_error=self._show_default_tarifs)
+
+    def _show_default_tarifs(self, error):
+        # Use dummy data on error
+        self._show_event_options((self.need_reservation, [
+            {"id": 1, "name": "Normal", "price": 12.00},
+            {"id": 2, "name": "Student", "price": 10.00},
+        ]))
+
+    def _show_event_options(self, options):
+        self.need_reservation, self.tarifs = options
+        self.tarifs_loading_label.hide()
+        self._fill_tarifs_grid()
+        self._set_loading(self.db.busy)
+
+    def _set_loading(self, loading):
+        if loading:
+            self.btn_continue.setText("Chargement...")
+        else:
+            self.btn_continue.setText("Continuer →" if self.need_reservation else "Aller au paiement →")
+        self.update_can_continue()
 
     def _setup_header(self):
         header_layout = QHBoxLayout()
@@ -82,12 +111,27 @@ class ReservationWidget(QWidget):
         tarifs_label.setObjectName("littleSection")
         content_layout.addWidget(tarifs_label)
 
-        tarifs_grid = QGridLayout()
-        tarifs_grid.setHorizontalSpacing(40)
-        tarifs_grid.setVerticalSpacing(15)
+        self.tarifs_loading_label = QLabel("Chargement des tarifs...")
+        self.tarifs_loading_label.setObjectName("infosInput")
+        content_layout.addWidget(self.tarifs_loading_label)
+
+        self.tarifs_grid = QGridLayout()
+        self.tarifs_grid.setHorizontalSpacing(40)
+        self.tarifs_grid.setVerticalSpacing(15)
 
         self.quantity_spinboxes = {}  # Pour stocker les champs de quantité
 
+        content_layout.addLayout(self.tarifs_grid)
+        content_layout.addSpacing(30)
+        content_layout.addLayout(self._get_client_infos_section())
+
+
+        content_layout.addStretch()
+
+        self.layout.addWidget(content_frame)
+
+    def _fill_tarifs_grid(self):
+        tarifs_grid = self.tarifs_grid
         for i, tarif in enumerate(self.tarifs):
             # Ligne 1: Nom et Prix
             price = tarif['price']
@@ -115,15 +159,6 @@ class ReservationWidget(QWidget):
                 details_label.setObjectName("starNote")
                 tarifs_grid.addWidget(details_label, i, 2, Qt.AlignmentFlag.AlignLeft)
 
-        content_layout.addLayout(tarifs_grid)
-        content_layout.addSpacing(30)
-        content_layout.addLayout(self._get_client_infos_section())
-
-
-        content_layout.addStretch()
-
-        self.layout.addWidget(content_frame)
-
     def _setup_footer(self):
         footer_frame = QFrame()
         footer_frame.setStyleSheet("border-top: 2px solid #313244;")
@@ -238,27 +273,26 @@ class ReservationWidget(QWidget):
             self._go_to_payment()
 
     def _go_to_seatmap(self):
-        try:
-            # 1. Collect reservation data
-            reservation_data = self._get_reservation_data()
+        # 1. Collect reservation data
+        reservation_data = self._get_reservation_data()
 
-            # 2. Create or get client
-            client_id = create_client(
-                email=reservation_data['email'],
-                firstname=reservation_data['firstname'],
-                lastname=reservation_data['lastname']
-            )
+        # 2. Create or get client, 3. Create reservation (status will be 'pending')
+        self.db.run(create_pending_reservation, self.event_id, reservation_data['email'],
+                    reservation_data['firstname'], reservation_data['lastname'],
+                    on_success=lambda ids: self._on_reservation_created(reservation_data, ids),
+                    on_error=self._on_continue_error, key="continue")
+
+    def _on_continue_error(self, error):
+        QMessageBox.critical(self, "Erreur", f"Une erreur est survenue: {error}")
+
+    def _on_reservation_created(self, reservation_data, ids):
+        try:
+            client_id, reservation_id = ids
 
             if not client_id:
                 QMessageBox.warning(self, "Erreur", "Impossible de créer le client.")
                 return
 
-            # 3. Create reservation (status will be 'pending')
-            reservation_id = create_reservation(
-                event_id=self.event_id,
-                client_id=client_id
-            )
-
             if not reservation_id:
                 QMessageBox.warning(self, "Erreur", "Impossible de créer la réservation.")
                 return
@@ -273,76 +307,45 @@ class ReservationWidget(QWidget):
 
         except Exception as e:
             import traceback
-            print(f"ERROR in _go_to_seatmap: {e}")
+            print(f"ERROR in _on_reservation_created: {e}")
             print(traceback.format_exc())
             QMessageBox.critical(self, "Erreur", f"Une erreur est survenue: {str(e)}")
 
     def _go_to_payment(self):
-        try:
-            # 1. Collect reservation data
-            reservation_data = self._get_reservation_data()
-
-            # 2. Create or get client
-            client_id = create_client(
-                email=reservation_data['email'],
-                firstname=reservation_data['firstname'],
-                lastname=reservation_data['lastname']
-            )
-
-            if not client_id:
-                QMessageBox.warning(self, "Erreur", "Impossible de créer le client.")
-                return
-
-            # 3. Create reservation
-            reservation_id = create_reservation(
-                event_id=self.event_id,
-                client_id=client_id
-            )
-
-            if not reservation_id:
-                QMessageBox.warning(self, "Erreur", "Impossible de créer la réservation.")
-                return
-
-            # 4. For events without seat selection, assign random available seats
-            available_seats = get_available_seats_for_event(self.event_id)
+        # 1. Collect reservation data
+        reservation_data = self._get_reservation_data()
+
+        # 2. Client, reservation and tickets in one transaction (seats picked by the server)
+        self.db.run(
+            checkout,
+            event_id=self.event_id,
+            client={
+                'email': reservation_data['email'],
+                'firstname': reservation_data['firstname'],
+                'lastname': reservation_data['lastname']
+            },
+            tarif_quantities={name: info['quantity'] for name, info in reservation_data['tarifs'].items()},
+            preferences={'contiguous': True},
+            on_success=lambda result: self._on_checkout_done(reservation_data, result),
+            on_error=self._on_continue_error, key="continue"
+        )
 
-            if not available_seats:
-                QMessageBox.warning(self, "Erreur", "Aucun siège disponible.")
+    def _on_checkout_done(self, reservation_data, result):
+        try:
+            if not result:
+                QMessageBox.warning(self, "Erreur", "Impossible de créer la réservation (pas assez de sièges disponibles ?).")
                 return
 
-            # 5. Create tickets for each tarif quantity
-            seat_index = 0
-            for tarif_name, tarif_info in reservation_data['tarifs'].items():
-                quantity = tarif_info['quantity']
-
-                for _ in range(quantity):
-                    if seat_index >= len(available_seats):
-                        QMessageBox.warning(self, "Erreur", "Pas assez de sièges disponibles.")
-                        return
-
-                    seat = available_seats[seat_index]
-                    success = add_ticket_to_reservation(
-                        reservation_id=reservation_id,
-                        event_id=self.event_id,
-                        seat_id=seat['id'],
-                        tarif_name=tarif_name
-                    )
-
-                    if not success:
-                        QMessageBox.warning(self, "Erreur", f"Impossible d'ajouter le billet {seat['name']}.")
-                        return
-
-                    seat_index += 1
-
-            # 6. Store reservation data and navigate to payment
-            reservation_data['reservation_id'] = reservation_id
-            reservation_data['client_id'] = client_id
+            # 3. Store reservation data and navigate to payment
+            reservation_data['reservation_id'] = result['reservation_id']
+            reservation_data['ticket_ids'] = result['ticket_ids']
+            reservation_data['total'] = result['total']
             self.main_window.reservation_data = reservation_data
 
             self.main_window.show_payment_widget(reservation_data)
 
         except Exception as e:
-            print(f"Error in _go_to_payment: {e}")
+            print(f"Error in _on_checkout_done: {e}")
             QMessageBox.critical(self, "Erreur", f"Une erreur est survenue: {str(e)}")
 
     def _update_total(self):
@@ -368,7 +371,7 @@ class ReservationWidget(QWidget):
         self.firstname_input.text().strip() != "" and
         self.lastname_input.text().strip() != ""
         )
-        self.btn_continue.setEnabled(has_tickets and has_identity)
+        self.btn_continue.setEnabled(has_tickets and has_identity and not self.db.busy)
 
     def _handle_back(self):
         """If go back to home, delete pending reservation"""
@@ -377,7 +380,7 @@ class ReservationWidget(QWidget):
                 'reservation_id' in self.reservation_data):
             reservation_id = self.reservation_data['reservation_id']
             print(f"Cancelling pending reservation #{reservation_id}")
-            cancel_reservation(reservation_id)
+            run_detached(cancel_reservation, reservation_id)
             self.reservation_data = None
             self.main_window.show_home_widget()
         self.main_window.show_home_widget()
\ No newline at end of file
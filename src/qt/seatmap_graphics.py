@@ -0,0 +1,306 @@
+import math
+
+from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt6.QtCore import Qt, QRectF, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QPen, QBrush, QFont, QImage
+
+from src.constants import SEAT_WIDTH, SEAT_HEIGHT, SEAT_GRID_SPACING, SEAT_LARGE_WIDTH
+from src.qt.venue_geometry import place_sectors
+
+# Same colors as the Seat buttons / legend
+BACKGROUND_COLOR = QColor("#1e1e2e")
+SECTOR_BACKGROUND_COLOR = QColor("#181825")
+SOLD_COLOR = QColor("#6c7086")
+RESERVED_COLOR = QColor("#b4befe")
+TEXT_COLOR = QColor("#ffffff")
+
+SECTOR_PADDING = 10
+SECTOR_TITLE_HEIGHT = 24
+SECTOR_SPACING = 40
+# Sectors are laid out left to right and wrap after this width (scene units)
+MAP_MAX_WIDTH = 2400
+
+# Level of detail thresholds (scale of the view)
+LOD_LABELS = 0.9  # rounded seats with their names
+LOD_OUTLINES = 0.35  # plain rectangles, below: one pixel per seat image of the sector
+MAX_ZOOM = 4.0
+
+
+class GraphicsSeat:
+    """Seat painted by a SectorItem, same interface as the Seat button used by ConcertHall."""
+
+    __slots__ = ('seat_id', 'name', 'category', 'status', 'checked', 'x', 'y', 'sector_item')
+
+    def __init__(self, seat_data, x, y, sector_item):
+        self.seat_id = seat_data['id']
+        self.name = seat_data['name']
+        self.category = seat_data['sector']
+        self.status = seat_data['status']
+        self.checked = False
+        # Position in the sector, in seats
+        self.x = x
+        self.y = y
+        self.sector_item = sector_item
+
+    def text(self):
+        return self.name
+
+    def isChecked(self):
+        return self.checked
+
+    def isEnabled(self):
+        return self.status == 'AVAILABLE'
+
+    def setChecked(self, checked):
+        self.checked = checked
+        self.sector_item.update_seat(self)
+
+    def mark_taken(self):
+        """Seat held by another buyer in the meantime."""
+        self.set_status('HOLD')
+
+    def set_status(self, status):
+        """Repaint the seat after a change made by another buyer."""
+        self.status = status
+        if status != 'AVAILABLE':
+            self.checked = False
+        self.sector_item.update_seat(self)
+
+
+class SectorItem(QGraphicsItem):
+    """All the seats of a sector in one item, at their position from the venue geometry."""
+
+    def __init__(self, sector_geometry, color_hex, seats_data, positions,
+                 seat_width=SEAT_WIDTH, seat_height=SEAT_HEIGHT):
+        super().__init__()
+        self.name = sector_geometry['name']
+        self.color = QColor(color_hex)
+        self.dim_color = self.color.darker(170)
+        self.seat_width = seat_width
+        self.seat_height = seat_height
+        self.step_x = seat_width + SEAT_GRID_SPACING
+        self.step_y = seat_height + SEAT_GRID_SPACING
+
+        self.seats = [GraphicsSeat(seat_data, *positions[seat_data['id']], self)
+                      for seat_data in sorted(seats_data, key=lambda x: x['id'])]
+        self.cols = max(1, math.ceil(sector_geometry['width']))
+        self.rows = max(1, math.ceil(sector_geometry['height']))
+
+        # Spatial index: seats by the grid cell of their top left corner
+        self._cells = {(int(seat.y), int(seat.x)): seat for seat in self.seats}
+
+        self._rect = QRectF(0, 0,
+                            2 * SECTOR_PADDING + self.cols * self.step_x - SEAT_GRID_SPACING,
+                            2 * SECTOR_PADDING + SECTOR_TITLE_HEIGHT + self.rows * self.step_y - SEAT_GRID_SPACING)
+
+        # Repaints are grouped: one update per sector per event loop turn
+        self._dirty = None
+        # Zoomed out view, rebuilt after a change
+        self._overview = None
+        self._seats_area = QRectF(SECTOR_PADDING, SECTOR_PADDING + SECTOR_TITLE_HEIGHT,
+                                  self.cols * self.step_x - SEAT_GRID_SPACING,
+                                  self.rows * self.step_y - SEAT_GRID_SPACING)
+
+        # Only the exposed seats are painted
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+        self.setCacheMode(QGraphicsItem.CacheMode.NoCache)
+
+    def boundingRect(self):
+        return self._rect
+
+    def seat_rect(self, seat):
+        return QRectF(SECTOR_PADDING + seat.x * self.step_x,
+                      SECTOR_PADDING + SECTOR_TITLE_HEIGHT + seat.y * self.step_y,
+                      self.seat_width, self.seat_height)
+
+    def seat_at(self, pos):
+        """Seat under a point in item coordinates (looks at the cell and its top / left neighbours)."""
+        col = math.floor((pos.x() - SECTOR_PADDING) / self.step_x)
+        row = math.floor((pos.y() - SECTOR_PADDING - SECTOR_TITLE_HEIGHT) / self.step_y)
+        for cell in [(row, col), (row, col - 1), (row - 1, col), (row - 1, col - 1)]:
+            seat = self._cells.get(cell)
+            if seat is not None and self.seat_rect(seat).contains(pos):
+                return seat
+        return None
+
+    def update_seat(self, seat):
+        self._overview = None
+        rect = self.seat_rect(seat)
+        if self._dirty is None:
+            self._dirty = rect
+            QTimer.singleShot(0, self._flush_updates)
+        else:
+            self._dirty = self._dirty.united(rect)
+
+    def _flush_updates(self):
+        if self._dirty is not None:
+            self.update(self._dirty)
+            self._dirty = None
+
+    def _seat_state(self, seat):
+        if seat.status == 'SOLD':
+            return 'sold'
+        if seat.status in ['RESERVED', 'HOLD']:
+            return 'reserved'
+        return 'checked' if seat.checked else 'available'
+
+    def _state_colors(self):
+        """(fill, border) per seat state."""
+        return {
+            'sold': (SOLD_COLOR, SOLD_COLOR),
+            'reserved': (RESERVED_COLOR, RESERVED_COLOR),
+            'checked': (self.color, self.color),
+            'available': (SECTOR_BACKGROUND_COLOR, self.color),
+        }
+
+    def _overview_image(self):
+        if self._overview is None:
+            pixels = {'sold': SOLD_COLOR.rgb(), 'reserved': RESERVED_COLOR.rgb(),
+                      'checked': self.color.rgb(), 'available': self.dim_color.rgb()}
+            image = QImage(self.cols, self.rows, QImage.Format.Format_RGB32)
+            image.fill(SECTOR_BACKGROUND_COLOR)
+            for seat in self.seats:
+                image.setPixel(min(int(seat.x), self.cols - 1), min(int(seat.y), self.rows - 1),
+                               pixels[self._seat_state(seat)])
+            self._overview = image
+        return self._overview
+
+    def paint(self, painter, option, widget=None):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        exposed = option.exposedRect
+
+        # Sector frame and name
+        painter.setPen(QPen(self.color, 1))
+        painter.setBrush(QBrush(SECTOR_BACKGROUND_COLOR))
+        painter.drawRoundedRect(self._rect.adjusted(0.5, 0.5, -0.5, -0.5), 8, 8)
+        if lod >= LOD_OUTLINES:
+            painter.setPen(self.color)
+            painter.setFont(QFont("", 10, QFont.Weight.Bold))
+            painter.drawText(QRectF(SECTOR_PADDING, SECTOR_PADDING / 2, self._rect.width(), SECTOR_TITLE_HEIGHT),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, self.name)
+
+        if lod < LOD_OUTLINES:
+            # Zoomed out: the sector image, one pixel per seat
+            painter.drawImage(self._seats_area, self._overview_image())
+            return
+
+        # Seats intersecting the exposed area (one cell more for the seats between two cells),
+        # grouped by state to draw each group at once
+        top = SECTOR_PADDING + SECTOR_TITLE_HEIGHT
+        first_row = max(0, int((exposed.top() - top) // self.step_y) - 1)
+        last_row = min(self.rows - 1, int((exposed.bottom() - top) // self.step_y))
+        first_col = max(0, int((exposed.left() - SECTOR_PADDING) // self.step_x) - 1)
+        last_col = min(self.cols - 1, int((exposed.right() - SECTOR_PADDING) // self.step_x))
+
+        groups = {}
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                seat = self._cells.get((row, col))
+                if seat is not None:
+                    groups.setdefault(self._seat_state(seat), []).append(seat)
+
+        detailed = lod >= LOD_LABELS
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, detailed)
+        for state, (fill, border) in self._state_colors().items():
+            seats = groups.get(state)
+            if not seats:
+                continue
+            painter.setPen(QPen(border, 2))
+            painter.setBrush(QBrush(fill))
+            if detailed:
+                for seat in seats:
+                    painter.drawRoundedRect(self.seat_rect(seat).adjusted(1, 1, -1, -1), 4, 4)
+            else:
+                painter.drawRects([self.seat_rect(seat).adjusted(1, 1, -1, -1) for seat in seats])
+
+        if detailed:
+            painter.setPen(TEXT_COLOR)
+            painter.setFont(QFont("", 8))
+            for seats in groups.values():
+                for seat in seats:
+                    painter.drawText(self.seat_rect(seat), Qt.AlignmentFlag.AlignCenter, seat.name)
+
+
+class SeatMapView(QGraphicsView):
+    """
+    Seat map for large venues: one painted SectorItem per sector instead of one button per seat.
+    Clicks toggle the seat and emit seat_clicked(seat), the seats have the Seat button interface.
+    """
+
+    seat_clicked = pyqtSignal(object)
+
+    def __init__(self, geometry, sector_seats, sector_colors, default_color="#6cbdf9", parent=None):
+        super().__init__(parent)
+        self.setScene(QGraphicsScene(self))
+        # Sector lookup for clicks goes through the scene's BSP tree
+        self.scene().setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+        self.setBackgroundBrush(QBrush(BACKGROUND_COLOR))
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setStyleSheet("border: none;")
+
+        self.sector_items = []
+        self.seats_by_id = {}
+        self._press_pos = None
+        self._fitted = False
+
+        for sector_geometry in geometry['sectors']:
+            name = sector_geometry['name']
+            item = SectorItem(sector_geometry, sector_colors.get(name, default_color),
+                              sector_seats.get(name, []), geometry['seats'],
+                              seat_width=SEAT_LARGE_WIDTH if sector_geometry['wide_seats'] else SEAT_WIDTH)
+            self.scene().addItem(item)
+            self.sector_items.append(item)
+            for seat in item.seats:
+                self.seats_by_id[seat.seat_id] = seat
+
+        # Sectors placed on the grid of the venue geometry
+        sizes = {item.name: (item.boundingRect().width(), item.boundingRect().height())
+                 for item in self.sector_items}
+        origins = place_sectors(geometry['sectors'], sizes, SECTOR_SPACING, MAP_MAX_WIDTH)
+        for item in self.sector_items:
+            item.setPos(*origins[item.name])
+
+        self.scene().setSceneRect(self.scene().itemsBoundingRect())
+
+    def seat_at(self, view_pos):
+        scene_pos = self.mapToScene(view_pos)
+        for item in self.scene().items(scene_pos):
+            if isinstance(item, SectorItem):
+                return item.seat_at(item.mapFromScene(scene_pos))
+        return None
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._fitted:
+            self.fitInView(self.scene().sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
+            self._fitted = True
+
+    def wheelEvent(self, event):
+        factor = 1.15 ** (event.angleDelta().y() / 120)
+        scale = self.transform().m11() * factor
+        fit_scale = min(self.viewport().width() / max(self.sceneRect().width(), 1),
+                        self.viewport().height() / max(self.sceneRect().height(), 1))
+        if fit_scale * 0.5 <= scale <= MAX_ZOOM:
+            self.scale(factor, factor)
+
+    def mousePressEvent(self, event):
+        self._press_pos = event.position().toPoint()
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if self._press_pos is None or event.button() != Qt.MouseButton.LeftButton:
+            return
+
+        # A click, not the end of a drag
+        pos = event.position().toPoint()
+        if (pos - self._press_pos).manhattanLength() <= 4:
+            seat = self.seat_at(pos)
+            if seat is not None and seat.isEnabled():
+                seat.setChecked(not seat.isChecked())
+                self.seat_clicked.emit(seat)
+        self._press_pos = None
@@ -1,12 +1,75 @@
 import sys
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                              QFrame, QGridLayout, QApplication, QScrollArea, QMessageBox)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QThreadPool
 
-from src.constants import (SEAT_WIDTH,SEAT_HEIGHT,SEAT_GRID_SPACING,SEAT_LARGE_WIDTH,BACK_BTN_WIDTH,CONFIRM_BTN_HEIGHT,SIDE_PANEL_WIDTH)
+from src.constants import (SEAT_WIDTH,SEAT_HEIGHT,SEAT_GRID_SPACING,SEAT_LARGE_WIDTH,BACK_BTN_WIDTH,CONFIRM_BTN_HEIGHT,SIDE_PANEL_WIDTH,
+                           SEAT_HOLD_SECONDS,SEAT_HOLD_RENEW_MS,PENDING_RESERVATION_MINUTES,SEAT_MAP_REFRESH_MS,
+                           SEAT_MAP_GRAPHICS_THRESHOLD)
 
 from src.db.requests import get_seats_with_status_for_event, get_sector_supplements_for_event, \
-    add_ticket_to_reservation, cancel_reservation, delete_reservation
+    add_tickets_to_reservation, cancel_reservation, delete_reservation, hold_seats, extend_holds, \
+    release_holds, sweep_expired_holds, get_seat_changes_since, get_event_room_config
+from src.qt.db_tasks import DbTaskRunner, run_detached
+from src.qt.live_updates import live_updates
+from src.qt.seatmap_graphics import SeatMapView
+from src.qt.venue_geometry import get_venue_geometry, geometry_from_seats, grid_cells
+
+# Sector colors of the seat map and legend (other sectors: DEFAULT_SECTOR_COLOR)
+DEFAULT_SECTOR_COLOR = "#6cbdf9"
+SECTOR_COLORS = {
+    "Balcon Haut": "#f9e2af",
+    "Balcon Gauche": "#f9e2af",
+    "Balcon Droit": "#f9e2af",
+    "VIP": "#f38ba8",
+    "SPC Gauche": "#a6e3a1",
+    "SPC Droit": "#a6e3a1",
+    "Standard": "#6cbdf9",
+}
+# seatColor property of the colors styled in styles.qss, other colors get their own stylesheet
+SEAT_COLOR_NAMES = {
+    "#f9e2af": "yellow",
+    "#f38ba8": "red",
+    "#a6e3a1": "green",
+    "#6cbdf9": "blue",
+}
+
+_seat_hold_pool = None
+
+
+def seat_hold_pool():
+    """One thread for the holds and releases, so they reach the database in click order."""
+    global _seat_hold_pool
+    if _seat_hold_pool is None:
+        _seat_hold_pool = QThreadPool()
+        _seat_hold_pool.setMaxThreadCount(1)
+    return _seat_hold_pool
+
+
+def load_seat_map(event_id):
+    """Seats, geometry and sector supplements of an event, run off the GUI thread."""
+    # Put expired holds back on sale before loading the seats
+    sweep_expired_holds(PENDING_RESERVATION_MINUTES)
+
+    seats_data, seat_version = get_seats_with_status_for_event(event_id, with_watermark=True)
+
+    # Sector placement and seat positions of the room configuration (cached)
+    room_config = get_event_room_config(event_id)
+    geometry = None
+    if room_config:
+        geometry = get_venue_geometry(*room_config, seat_ids=[s['id'] for s in seats_data])
+    if geometry is None:
+        geometry = geometry_from_seats(seats_data)
+
+    # Kept for the selection total
+    try:
+        sector_supplements = get_sector_supplements_for_event(event_id)
+    except Exception as e:
+        print(f"Error loading supplements: {e}")
+        sector_supplements = {}
+
+    return {'seats': seats_data, 'seat_version': seat_version, 'geometry': geometry,
+            'supplements': sector_supplements}
 
 
 # QPushButton for seats with a style
@@ -22,52 +85,64 @@ class Seat(QPushButton):
         self.setFixedSize(width, height)
         self.setCheckable(True)
 
+        # Colors come from styles.qss through the seatStatus / seatColor properties
+        self.setObjectName("seat")
+        color_name = SEAT_COLOR_NAMES.get(color_hex.lower())
+        if color_name:
+            self.setProperty("seatColor", color_name)
+        else:
+            self.setStyleSheet(f"""
+                QPushButton#seat[seatStatus="available"] {{ border: 2px solid {color_hex}; }}
+                QPushButton#seat[seatStatus="available"]:hover {{ border: 2px solid #ffffff; }}
+                QPushButton#seat[seatStatus="available"]:checked {{
+                    background-color: {color_hex};
+                    border: 2px solid {color_hex};
+                }}
+            """)
+
         # Disable if not available
-        if self.status in ['SOLD', 'RESERVED']:
+        if self.status in ['SOLD', 'RESERVED', 'HOLD']:
             self.setEnabled(False)
 
-        self.apply_style()
+        self.setProperty("seatStatus", self._status_property())
+
+    def mark_taken(self):
+        """Seat held by another buyer in the meantime."""
+        self.set_status('HOLD')
+
+    def set_status(self, status):
+        """Restyle the seat after a change made by another buyer."""
+        self.status = status
+        if status != 'AVAILABLE':
+            self.setChecked(False)
+        self.setEnabled(status == 'AVAILABLE')
+        self.setProperty("seatStatus", self._status_property())
+        # Only this seat is polished again
+        self.style().unpolish(self)
+        self.style().polish(self)
 
-    def apply_style(self):
+    def _status_property(self):
         if self.status == 'SOLD':
             # Grey for sold seats
-            self.setObjectName("seatSold")
-        elif self.status == 'RESERVED' :
+            return "sold"
+        elif self.status in ['RESERVED', 'HOLD']:
             # Light purple for reserved/hold seats
-            self.setObjectName("seatReserved")
-        else:
-            # Original style for available seats
-            self.setObjectName("seatAvailable")
-            # But colors change dynamically
-            self.setStyleSheet(f"""
-                        QPushButton#seatAvailable {{
-                            color: #ffffff;
-                            border: 2px solid {self.color_hex};
-                        }}
-                        QPushButton#seatAvailable:hover {{
-                            color: #ffffff;
-                            border: 2px solid #ffffff;
-                        }}
-                        QPushButton#seatAvailable:checked {{
-                            background-color: {self.color_hex};
-                            border: 2px solid {self.color_hex};
-                        }}
-                    """)
+            return "reserved"
+        return "available"
 
 
 # Seating sector
 class Sector(QFrame):
     """Conteneur de groupe de sieges avec alignement interne."""
 
-    def __init__(self, color_hex, seats_data, category="", sw=SEAT_WIDTH, sh=SEAT_HEIGHT):
+    def __init__(self, color_hex, seats_data, category="", sw=SEAT_WIDTH, sh=SEAT_HEIGHT, positions=None):
         super().__init__()
-        self.setStyleSheet(f"""
-            QFrame {{ 
-                border: 1px solid {color_hex}; 
-                background: #181825; 
-                border-radius: 8px; 
-            }}
-        """)
+        self.setObjectName("sector")
+        color_name = SEAT_COLOR_NAMES.get(color_hex.lower())
+        if color_name:
+            self.setProperty("seatColor", color_name)
+        else:
+            self.setStyleSheet(f"QFrame#sector {{ border: 1px solid {color_hex}; }}")
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
@@ -81,26 +156,16 @@ class Sector(QFrame):
         # Sort seats by ID to ensure proper order
         sorted_seats = sorted(seats_data, key=lambda x: x['id'])
 
-        # Calculate grid dimensions based on sector
-        num_seats = len(sorted_seats)
-        if category == "Balcon Haut":
-            rows, cols = 2, 15
-        elif category in ["Balcon Gauche", "Balcon Droit"]:
-            rows, cols = 10, 2
-        elif category == "VIP":
-            rows, cols = 2, 10
-        elif category in ["SPC Gauche", "SPC Droit"]:
-            rows, cols = 2, 2
-        elif category == "Standard":
-            rows, cols = 5, 10
-        else:
-            # Default calculation
-            cols = int(num_seats ** 0.5) + 1
-            rows = (num_seats + cols - 1) // cols
+        # Default calculation when the venue geometry has no position for the seats
+        cols = int(len(sorted_seats) ** 0.5) + 1
 
         for idx, seat_data in enumerate(sorted_seats):
-            r = idx // cols
-            c = idx % cols
+            if positions and seat_data['id'] in positions:
+                x, y = positions[seat_data['id']]
+                r, c = round(y), round(x)
+            else:
+                r = idx // cols
+                c = idx % cols
             btn = Seat(seat_data, color_hex, category, sw, sh)
             grid.addWidget(btn, r, c)
             self.seats.append(btn)
@@ -118,14 +183,21 @@ class ConcertHall(QWidget):
         self.total_price = self.reservation_data["total"]
         self.actual_total_price = self.total_price
 
+        # Selection kept up to date on each click (seat_id -> Seat, in click order)
+        self.selected_seats = {}
+        self.sector_supplements = {}
+
         self.is_staff_sell = reservation_data.get('vendor_id') != 1
 
         self.setWindowTitle("Systeme de Reservation - Salle de Concert")
-        self.setStyleSheet("background-color: #1e1e2e;")
+        # Checked seats keep the background of their sector from styles.qss
+        self.setStyleSheet("QWidget:!checked { background-color: #1e1e2e; }")
 
-        # Load seats from database
-        self.seats_data = get_seats_with_status_for_event(self.event_id)
-        self._organize_seats_by_sector()
+        self.db = DbTaskRunner(self)
+        # Holds and releases of the clicked seats then the tickets, in click order
+        self.holds = DbTaskRunner(self, pool=seat_hold_pool())
+        self.seats_by_id = {}
+        self.seat_map = None
 
         # Main layout
         self.main_layout = QHBoxLayout(self)
@@ -170,32 +242,11 @@ class ConcertHall(QWidget):
                 """)
         self.plan_container.addWidget(self.main_title)
 
-        # Grid for organizing sectors
-        self.hall_grid = QGridLayout()
-        self.hall_grid.setSpacing(10)
-
-        # Creation of sectors from DB data
-        self.balcon_haut = Sector("#f9e2af", self.sector_seats.get("Balcon Haut", []), "Balcon Haut")
-        self.balcon_gauche = Sector("#f9e2af", self.sector_seats.get("Balcon Gauche", []), "Balcon Gauche")
-        self.balcon_droit = Sector("#f9e2af", self.sector_seats.get("Balcon Droit", []), "Balcon Droit")
-        self.vip = Sector("#f38ba8", self.sector_seats.get("VIP", []), "VIP")
-        self.spc_gauche = Sector("#a6e3a1", self.sector_seats.get("SPC Gauche", []), "SPC Gauche", sw=SEAT_LARGE_WIDTH )
-        self.spc_droit = Sector("#a6e3a1", self.sector_seats.get("SPC Droit", []), "SPC Droit", sw=SEAT_LARGE_WIDTH )
-        self.standard = Sector("#6cbdf9", self.sector_seats.get("Standard", []), "Standard")
-
-        # Adding sectors to the grid
-        self.hall_grid.addWidget(self.balcon_haut, 0, 1, 1, 3)
-        self.hall_grid.addWidget(self.balcon_gauche, 0, 0, 3, 1)
-        self.hall_grid.addWidget(self.balcon_droit, 0, 4, 3, 1)
-        self.hall_grid.addWidget(self.spc_gauche, 1, 1)
-        self.hall_grid.addWidget(self.vip, 1, 2)
-        self.hall_grid.addWidget(self.spc_droit, 1, 3)
-        self.hall_grid.addWidget(self.standard, 2, 1, 1, 3)
-
-        # Stretch Management
-        self.hall_grid.setRowStretch(3, 1)
-
-        self.plan_container.addLayout(self.hall_grid)
+        # Replaced by the seat map once loaded
+        self.loading_label = QLabel("Chargement du plan de salle...")
+        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.setStyleSheet("color: #bac2de; font-size: 18px;")
+        self.plan_container.addWidget(self.loading_label, stretch=1)
 
         # Stage label
         scene_lbl = QLabel("SCÈNE")
@@ -222,9 +273,6 @@ class ConcertHall(QWidget):
                 """)
         self.plan_container.addWidget(self.nbr_selection_left_lbl)
 
-        # Stretch Management
-        self.plan_container.addStretch()
-
         self.main_layout.addLayout(self.plan_container, stretch=4)
 
         # Right side with two panels
@@ -241,13 +289,75 @@ class ConcertHall(QWidget):
 
         self.main_layout.addLayout(right_side_layout)
 
-        # Connections
-        self._connect_all_seats()
+        # Live availability: only the seats changed since the last poll are restyled
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self._refresh_seats)
+        # and right away when the database notifies a change of this event's seats
+        live_updates().seats_changed.connect(self._on_seats_changed)
+
+        # Selected seats stay held as long as the seat map is open
+        self.hold_timer = QTimer(self)
+        self.hold_timer.timeout.connect(self._renew_holds)
+        self.hold_timer.start(SEAT_HOLD_RENEW_MS)
 
         # Link for confirm button
         if parent and hasattr(parent, 'show_payment_widget'):
             self.btn_confirm.clicked.connect(self._on_confirm_clicked)
 
+        self.db.run(load_seat_map, self.event_id, on_success=self._show_seat_map,
+                    on_error=lambda error: self.loading_label.setText("Impossible de charger le plan de salle."))
+
+    def _show_seat_map(self, seat_map_data):
+        """Build the seat map from the loaded seats and start the live availability."""
+        self.seats_data = seat_map_data['seats']
+        self.geometry = seat_map_data['geometry']
+        self.seat_version = seat_map_data['seat_version']
+        self._organize_seats_by_sector()
+        self._show_supplements(seat_map_data['supplements'])
+
+        index = self.plan_container.indexOf(self.loading_label)
+        self.plan_container.removeWidget(self.loading_label)
+        self.loading_label.deleteLater()
+
+        if len(self.seats_data) > SEAT_MAP_GRAPHICS_THRESHOLD:
+            # Large venues: one painted item per sector instead of one button per seat
+            self.seat_map = SeatMapView(self.geometry, self.sector_seats, SECTOR_COLORS, DEFAULT_SECTOR_COLOR)
+            self.seat_map.seat_clicked.connect(self._on_seat_toggled)
+            self.seats_by_id = self.seat_map.seats_by_id
+            self.plan_container.insertWidget(index, self.seat_map, stretch=1)
+        else:
+            self._setup_hall_grid(index)
+            # Stretch Management
+            self.plan_container.addStretch()
+
+        self.refresh_timer.start(SEAT_MAP_REFRESH_MS)
+
+    def _setup_hall_grid(self, index):
+        """One Sector frame of seat buttons per sector, placed as in the venue geometry."""
+        # Grid for organizing sectors
+        self.hall_grid = QGridLayout()
+        self.hall_grid.setSpacing(10)
+
+        self.sectors = []
+        cells = grid_cells(self.geometry['sectors'])
+        for sector_geometry in self.geometry['sectors']:
+            name = sector_geometry['name']
+            sector = Sector(SECTOR_COLORS.get(name, DEFAULT_SECTOR_COLOR), self.sector_seats.get(name, []), name,
+                            sw=SEAT_LARGE_WIDTH if sector_geometry['wide_seats'] else SEAT_WIDTH,
+                            positions=self.geometry['seats'])
+            self.hall_grid.addWidget(sector, *cells[name])
+            self.sectors.append(sector)
+
+        # Stretch Management
+        self.hall_grid.setRowStretch(max((row + row_span for row, _, row_span, _ in cells.values()), default=0), 1)
+
+        self.plan_container.insertLayout(index, self.hall_grid)
+
+        self.seats_by_id = {s.seat_id: s for sector in self.sectors for s in sector.seats}
+
+        # Connections
+        self._connect_all_seats()
+
     def _organize_seats_by_sector(self):
         """Organize seats by sector name."""
         self.sector_seats = {}
@@ -338,36 +448,39 @@ class ConcertHall(QWidget):
             sector_layout.addStretch()
             legend_layout.addLayout(sector_layout)
 
-        # Check if there are supplements in the data
-        try:
-            sector_supplements = get_sector_supplements_for_event(self.event_id)
-        except Exception as e:
-            print(f"Error loading supplements: {e}")
-            sector_supplements = {}
-
-        if sector_supplements:
-            # Separator
-            line3 = QFrame()
-            line3.setFrameShape(QFrame.Shape.HLine)
-            line3.setStyleSheet("background-color: #313244; border: none;")
-            line3.setFixedHeight(1)
-            legend_layout.addWidget(line3)
-
-            # Supplements section
-            supplements_title = QLabel("Suppléments")
-            supplements_title.setStyleSheet("color: #cdd6f4; font-weight: bold; font-size: 13px; border: none; margin-top: 5px;")
-            legend_layout.addWidget(supplements_title)
-
-            for sector_name, supplement in sector_supplements.items():
-                supp_layout = QHBoxLayout()
-                supp_text = QLabel(f"{sector_name}: +{supplement:.2f} CHF")
-                supp_text.setStyleSheet("color: #bac2de; font-size: 12px; border: none;")
-                supp_layout.addWidget(supp_text)
-                supp_layout.addStretch()
-                legend_layout.addLayout(supp_layout)
+        # Supplements, filled once the seat map is loaded
+        self.supplements_layout = QVBoxLayout()
+        self.supplements_layout.setSpacing(10)
+        legend_layout.addLayout(self.supplements_layout)
 
         legend_layout.addStretch()
 
+    def _show_supplements(self, sector_supplements):
+        """Supplements legend (kept for the selection total)."""
+        self.sector_supplements = sector_supplements
+        if not self.sector_supplements:
+            return
+
+        # Separator
+        line3 = QFrame()
+        line3.setFrameShape(QFrame.Shape.HLine)
+        line3.setStyleSheet("background-color: #313244; border: none;")
+        line3.setFixedHeight(1)
+        self.supplements_layout.addWidget(line3)
+
+        # Supplements section
+        supplements_title = QLabel("Suppléments")
+        supplements_title.setStyleSheet("color: #cdd6f4; font-weight: bold; font-size: 13px; border: none; margin-top: 5px;")
+        self.supplements_layout.addWidget(supplements_title)
+
+        for sector_name, supplement in self.sector_supplements.items():
+            supp_layout = QHBoxLayout()
+            supp_text = QLabel(f"{sector_name}: +{supplement:.2f} CHF")
+            supp_text.setStyleSheet("color: #bac2de; font-size: 12px; border: none;")
+            supp_layout.addWidget(supp_text)
+            supp_layout.addStretch()
+            self.supplements_layout.addLayout(supp_layout)
+
     def _setup_side_panel(self):
         self.side_panel = QFrame()
         self.side_panel.setFixedWidth(SIDE_PANEL_WIDTH)
@@ -405,60 +518,75 @@ class ConcertHall(QWidget):
         side_layout.addWidget(self.btn_confirm)
 
     def _connect_all_seats(self):
-        sectors = [self.balcon_haut, self.balcon_gauche, self.balcon_droit,
-                   self.spc_gauche, self.spc_droit, self.vip, self.standard]
-        for sector in sectors:
-            for s in sector.seats:
-                s.clicked.connect(self.update_info)
+        for s in self.seats_by_id.values():
+            s.clicked.connect(self.update_info)
 
     def update_info(self):
-        clicked_seat = self.sender()
-
-        # Count how much seats are check
-        currently_selected = []
-        for sector in [self.balcon_haut, self.balcon_gauche, self.balcon_droit,
-                       self.spc_gauche, self.spc_droit, self.vip, self.standard]:
-            for s in sector.seats:
-                if s.isChecked():
-                    currently_selected.append(s)
-
-        # If there's more than seat to choose, we uncheck the last checked
-        if len(currently_selected) > self.nbr_seat_to_choose:
-            if clicked_seat:
-                clicked_seat.setChecked(False)
-            return
-
-        selected = []
-        sectors = [self.balcon_haut, self.balcon_gauche, self.balcon_droit,
-                   self.spc_gauche, self.spc_droit, self.vip, self.standard]
+        self._on_seat_toggled(self.sender())
 
-        actual_nbr_selection = 0
-        self.actual_total_price = self.total_price
+    def _on_seat_toggled(self, clicked_seat):
+        """Seat button or seat of the graphics map checked / unchecked."""
+        if clicked_seat.isChecked():
+            # If there's more than seat to choose, we uncheck the last checked
+            if len(self.selected_seats) >= self.nbr_seat_to_choose:
+                clicked_seat.setChecked(False)
+                return
+            self._select(clicked_seat)
+        else:
+            self._deselect(clicked_seat)
 
-        for sector in sectors:
-            for s in sector.seats:
-                if s.isChecked():
-                    sector_supplements = get_sector_supplements_for_event(self.event_id)
+        # Hold the selection (renews the previous holds), or give back the unchecked seat
+        reservation_id = self.reservation_data.get('reservation_id')
+        if reservation_id:
+            if clicked_seat.isChecked():
+                # A newer hold replaces the one still waiting: it renews the whole selection
+                seat_ids = list(self.selected_seats)
+                self.holds.run(hold_seats, self.event_id, reservation_id, seat_ids, SEAT_HOLD_SECONDS,
+                               on_success=lambda held: self._on_seats_held(seat_ids, held), key="hold")
+            else:
+                self.holds.run(release_holds, reservation_id, [clicked_seat.seat_id])
 
-                    actual_nbr_selection += 1
+        self._update_selection_display()
 
-                    if s.category in sector_supplements:
-                        for sector_name, supplement in sector_supplements.items():
-                            if sector_name == s.category:
-                                self.actual_total_price += supplement
-                                print(f"{supplement} of supplement added")
+    def _renew_holds(self):
+        reservation_id = self.reservation_data.get('reservation_id')
+        if reservation_id and self.selected_seats:
+            self.holds.run(extend_holds, reservation_id, SEAT_HOLD_SECONDS)
 
-                    selected.append(f"• {s.category} : {s.text()}")
+    def _on_seats_held(self, seat_ids, held):
+        if held is None:
+            # Database error: the seats are not known to be taken, keep them selected
+            return
+        # Only the seats of this hold, others were selected after it was sent
+        lost = [s for s in self.selected_seats.values() if s.seat_id in seat_ids and s.seat_id not in held]
+        for s in lost:
+            self._deselect(s)
+            s.mark_taken()
+        if lost:
+            self._update_selection_display()
+            QMessageBox.information(self, "Siège indisponible",
+                                    "Ce siège vient d'être pris par un autre client.")
+
+    def _select(self, seat):
+        self.selected_seats[seat.seat_id] = seat
+        self.actual_total_price += self.sector_supplements.get(seat.category, 0)
+
+    def _deselect(self, seat):
+        if self.selected_seats.pop(seat.seat_id, None) is not None:
+            self.actual_total_price -= self.sector_supplements.get(seat.category, 0)
+
+    def _update_selection_display(self):
+        nbr_left = self.nbr_seat_to_choose - len(self.selected_seats)
 
         self.nbr_selection_left_lbl.setText(
-            f"Sélectionnez encore {self.nbr_seat_to_choose - actual_nbr_selection}"
-            if self.nbr_seat_to_choose - actual_nbr_selection != 0
+            f"Sélectionnez encore {nbr_left}"
+            if nbr_left != 0
             else "Tous les sièges ont été sélectionnés"
         )
 
         self.btn_confirm.setText(f"Confirmer la selection ({self.actual_total_price} CHF)")
 
-        if self.nbr_seat_to_choose - actual_nbr_selection == 0:
+        if nbr_left == 0:
             self.btn_confirm.setStyleSheet("background-color: #89b4fa; color: white;")
             self.btn_confirm.setEnabled(True)
             self.nbr_selection_left_lbl.setStyleSheet("""
@@ -475,18 +603,47 @@ class ConcertHall(QWidget):
                                 font-size: 26px; font-weight: bold;
                             """)
 
+        selected = [f"• {s.category} : {s.text()}" for s in self.selected_seats.values()]
         self.info_list.setText("\n".join(selected) if selected else "Aucun siege sélectionné")
 
+    def _refresh_seats(self):
+        self.db.run(get_seat_changes_since, self.event_id, self.seat_version,
+                    on_success=self._apply_seat_changes, key="refresh")
+
+    def _on_seats_changed(self, change):
+        if not self.refresh_timer.isActive():
+            return  # seat map not loaded yet
+        events = change.get('events') if change else None
+        # Changes of transactions from the watermark on are not loaded yet
+        if events is None or events.get(str(self.event_id), -1) >= self.seat_version:
+            self._refresh_seats()
+
+    def _apply_seat_changes(self, result):
+        changes, self.seat_version = result
+
+        lost_selection = False
+        for change in changes:
+            seat = self.seats_by_id.get(change['id'])
+            if seat is None:
+                continue
+
+            # Checked seats are held by this reservation, only a sale by someone else takes them away
+            if seat.isChecked():
+                if change['status'] in ['SOLD', 'RESERVED']:
+                    self._deselect(seat)
+                    seat.set_status(change['status'])
+                    lost_selection = True
+            elif seat.status != change['status']:
+                seat.set_status(change['status'])
+
+        if lost_selection:
+            self._update_selection_display()
+            QMessageBox.information(self, "Siège indisponible",
+                                    "Un des sièges sélectionnés vient d'être vendu à un autre client.")
+
     def get_selected_seats(self):
         """Return list of selected seat IDs."""
-        selected_ids = []
-        sectors = [self.balcon_haut, self.balcon_gauche, self.balcon_droit,
-                   self.spc_gauche, self.spc_droit, self.vip, self.standard]
-        for sector in sectors:
-            for s in sector.seats:
-                if s.isChecked():
-                    selected_ids.append(s.seat_id)
-        return selected_ids
+        return list(self.selected_seats)
 
     # Send actual price to main.py
     def _on_confirm_clicked(self):
@@ -531,24 +688,44 @@ class ConcertHall(QWidget):
                 QMessageBox.warning(self, "Erreur", "Nombre de sièges ne correspond pas aux tarifs.")
                 return
 
-            # Create a ticket for each selected seat
-            for i, seat_id in enumerate(selected_seat_ids):
-                tarif_name = tarif_list[i]
+            # Create all the tickets at once (all or nothing), after the holds still waiting
+            self.btn_confirm.setEnabled(False)
+            self.btn_confirm.setText("Confirmation en cours...")
+            self.holds.run(
+                add_tickets_to_reservation,
+                reservation_id=reservation_id,
+                event_id=event_id,
+                seat_tarifs=list(zip(selected_seat_ids, tarif_list)),
+                on_success=lambda success: self._on_tickets_added(success, selected_seat_ids),
+                on_error=self._on_confirm_error, key="confirm"
+            )
 
-                success = add_ticket_to_reservation(
-                    reservation_id=reservation_id,
-                    event_id=event_id,
-                    seat_id=seat_id,
-                    tarif_name=tarif_name
-                )
+        except Exception as e:
+            import traceback
+            print(f"ERROR in _on_confirm_clicked: {e}")
+            print(traceback.format_exc())
+            self._on_confirm_error(str(e))
+
+    def _on_confirm_error(self, error):
+        self._update_selection_display()
+        QMessageBox.critical(
+            self,
+            "Erreur",
+            f"Une erreur est survenue lors de la confirmation: {error}"
+        )
 
-                if not success:
-                    QMessageBox.warning(
-                        self,
-                        "Erreur",
-                        f"Impossible d'ajouter le billet pour le siège #{seat_id}."
-                    )
-                    return
+    def _on_tickets_added(self, success, selected_seat_ids):
+        try:
+            main_win = self.window()
+
+            if not success:
+                self._update_selection_display()
+                QMessageBox.warning(
+                    self,
+                    "Erreur",
+                    "Impossible d'ajouter les billets, un des sièges n'est plus disponible."
+                )
+                return
 
             # Update reservation data with actual total (including supplements)
             self.reservation_data['total'] = self.actual_total_price
@@ -561,13 +738,9 @@ class ConcertHall(QWidget):
 
         except Exception as e:
             import traceback
-            print(f"ERROR in _on_confirm_clicked: {e}")
+            print(f"ERROR in _on_tickets_added: {e}")
             print(traceback.format_exc())
-            QMessageBox.critical(
-                self,
-                "Erreur",
-                f"Une erreur est survenue lors de la confirmation: {str(e)}"
-            )
+            self._on_confirm_error(str(e))
 
     def _handle_home(self):
         """home --> drop pending reservation"""
@@ -576,7 +749,7 @@ class ConcertHall(QWidget):
         reservation_id = self.reservation_data.get('reservation_id')
         if reservation_id:
             print(f"Cancelling pending reservation #{reservation_id}")
-            cancel_reservation(reservation_id)
+            run_detached(cancel_reservation, reservation_id)
 
         # Get the main window (use window() instead of parent())
         main_win = self.window()
@@ -598,7 +771,7 @@ class ConcertHall(QWidget):
         reservation_id = self.reservation_data.get('reservation_id')
         if reservation_id:
             print(f"Deleting pending reservation #{reservation_id} (user going back to tarifs)")
-            delete_reservation(reservation_id)
+            run_detached(delete_reservation, reservation_id)
 
             # Clear reservation data from main window
             if main_win and hasattr(main_win, 'reservation_data'):
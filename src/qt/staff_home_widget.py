@@ -7,13 +7,16 @@ from PyQt6.QtGui import QFont,QPixmap
 from src.constants import (MENU_BTN_WIDTH,MENU_BTN_HEIGHT,ICON_WIDTH,ICON_HEIGHT)
 
 from src.db.requests import get_all_staff
+from src.qt.db_tasks import DbTaskRunner
 
 
 class StaffHomeWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = parent
+        self.db = DbTaskRunner(self)
         self.init_ui()
+        self.db.busy_changed.connect(lambda loading: self.staff_combo.setEnabled(not loading))
         self.load_staff_list()
 
     def init_ui(self):
@@ -25,7 +28,11 @@ class StaffHomeWidget(QWidget):
         back_layout = QHBoxLayout()
         self.btn_launcher = QPushButton("← Retour au menu")
         self.btn_launcher.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.btn_launcher.clicked.connect(self.main_window.show_launcher_widget)
+        if hasattr(self.main_window, "show_launcher_widget"):
+            self.btn_launcher.clicked.connect(self.main_window.show_launcher_widget)
+        else:
+            # Standalone launcher: no menu to go back to
+            self.btn_launcher.hide()
         self.btn_launcher.setObjectName("backBtn")
         back_layout.addWidget(self.btn_launcher)
         back_layout.addStretch()
@@ -143,15 +150,28 @@ class StaffHomeWidget(QWidget):
         return button
 
     def load_staff_list(self):
-        """Load staff members into combo box."""
-        staff_list = get_all_staff()
+        """Load staff members in the background."""
+        self.db.run(get_all_staff, on_success=self.show_staff_list, key="staff")
+
+    def show_staff_list(self, staff_list):
+        """Fill the combo box, keeping the selected staff member if still listed."""
+        selected = self.staff_combo.currentData()
 
+        self.staff_combo.blockSignals(True)
         self.staff_combo.clear()
         self.staff_combo.addItem("-- Sélectionner --", None)
 
         for staff_id, name in staff_list:
             self.staff_combo.addItem(name, staff_id)
 
+        self.staff_combo.setCurrentIndex(max(self.staff_combo.findData(selected), 0))
+        self.staff_combo.blockSignals(False)
+        self.on_staff_selected(self.staff_combo.currentIndex())
+
+    def refresh_on_show(self):
+        """Called when the kept screen is shown again."""
+        self.load_staff_list()
+
     def on_staff_selected(self, index):
         """Handle staff selection."""
         staff_data = self.staff_combo.currentData()
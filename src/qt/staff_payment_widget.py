@@ -4,6 +4,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import Qt
 
 from src.db.requests import create_payment
+from src.qt.db_tasks import DbTaskRunner
 
 
 class StaffPaymentWidget(QWidget):
@@ -12,6 +13,7 @@ class StaffPaymentWidget(QWidget):
         self.main_window = parent
         self.reservation_data = reservation_data
         self.total_price = self.reservation_data.get('total', 0.0)
+        self.db = DbTaskRunner(self)
 
         # Main Layout
         self.layout = QVBoxLayout(self)
@@ -213,42 +215,47 @@ class StaffPaymentWidget(QWidget):
                 QMessageBox.warning(self, "Erreur", "Aucune réservation trouvée.")
                 return
 
-            payment_id = create_payment(
-                reservation_id=reservation_id,
-                total=self.total_price,
-                method=method
-            )
-
-            if not payment_id:
-                QMessageBox.warning(self, "Erreur", "Erreur lors du paiement.")
-                return
-
-            # Show success message
-            method_text = "en espèces" if method == 'cash' else "par Twint"
-            QMessageBox.information(
-                self,
-                "Paiement réussi",
-                f"Paiement {method_text} de {self.total_price:.2f} CHF accepté!\n"
-                f"Réservation #{reservation_id}\n\n"
-                f"Les billets ont été vendus avec succès."
-            )
-
-            if self.main_window:
-                self.main_window.show_staff_home_widget()
+            self.btn_pay_cash.setText("Paiement en cours...")
+            self.db.run(create_payment, reservation_id=reservation_id, total=self.total_price, method=method,
+                        on_success=lambda payment_id: self._on_payment_done(method, payment_id),
+                        on_error=self._on_payment_error, key="payment")
 
         except Exception as e:
             import traceback
             print(f"ERROR in _finalize_payment: {e}")
             print(traceback.format_exc())
+            self._on_payment_error(str(e))
 
-            # If error, enable back buttons to try again paying
-            self._enable_buttons()
+    def _on_payment_done(self, method, payment_id):
+        self.btn_pay_cash.setText("Confirmer paiement")
+        if not payment_id:
+            QMessageBox.warning(self, "Erreur", "Erreur lors du paiement.")
+            return
 
-            QMessageBox.critical(
-                self,
-                "Erreur",
-                f"Une erreur est survenue lors du paiement: {str(e)}"
-            )
+        # Show success message
+        method_text = "en espèces" if method == 'cash' else "par Twint"
+        QMessageBox.information(
+            self,
+            "Paiement réussi",
+            f"Paiement {method_text} de {self.total_price:.2f} CHF accepté!\n"
+            f"Réservation #{self.reservation_data.get('reservation_id')}\n\n"
+            f"Les billets ont été vendus avec succès."
+        )
+
+        if self.main_window:
+            self.main_window.show_staff_home_widget()
+
+    def _on_payment_error(self, error):
+        self.btn_pay_cash.setText("Confirmer paiement")
+
+        # If error, enable back buttons to try again paying
+        self._enable_buttons()
+
+        QMessageBox.critical(
+            self,
+            "Erreur",
+            f"Une erreur est survenue lors du paiement: {error}"
+        )
 
     def _enable_buttons(self):
         """Re-enable payment buttons (only call on error)"""
@@ -1,18 +1,40 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QLineEdit, QComboBox, QTableWidget,
-                             QTableWidgetItem, QHeaderView, QMessageBox)
-from PyQt6.QtCore import Qt, QTimer
+                             QTableWidgetItem, QHeaderView, QMessageBox, QApplication)
+from PyQt6.QtCore import Qt, QTimer, QThreadPool
 from PyQt6.QtGui import QFont, QColor
-from src.db.requests import scan_ticket
+from src.db.requests import scan_ticket, get_scannable_events
+from src.qt.db_tasks import DbTaskRunner
 from datetime import datetime
 
 
+_scan_runner = None
+
+
+def get_scan_runner():
+    """
+    Runner shared by the scan pages: one thread, so the scans reach the database one after the
+    other, and it outlives the pages so queued scans are never dropped.
+    """
+    global _scan_runner
+    if _scan_runner is None:
+        pool = QThreadPool()
+        pool.setMaxThreadCount(1)
+        _scan_runner = DbTaskRunner(QApplication.instance(), pool=pool)
+    return _scan_runner
+
+
 class StaffScanWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = parent
         self.scan_history = []
+        # scan task -> history record of the scans not answered yet
+        self.pending_scans = {}
+        self.db = DbTaskRunner(self)
+        self.scan_runner = get_scan_runner()
         self.init_ui()
+        self.refresh_on_show()
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -29,9 +51,9 @@ class StaffScanWidget(QWidget):
 
         header_layout.addStretch()
 
-        staff_info = QLabel(f"Personnel: {self.main_window.staff_name or 'Non sélectionné'}")
-        staff_info.setStyleSheet("font-weight: bold; color: #4CAF50;")
-        header_layout.addWidget(staff_info)
+        self.staff_info = QLabel()
+        self.staff_info.setStyleSheet("font-weight: bold; color: #4CAF50;")
+        header_layout.addWidget(self.staff_info)
 
         layout.addLayout(header_layout)
 
@@ -60,6 +82,20 @@ class StaffScanWidget(QWidget):
         door_layout.addStretch()
         layout.addLayout(door_layout)
 
+        # Event selection (tickets for another event are refused)
+        event_layout = QHBoxLayout()
+        event_label = QLabel("Événement:")
+        event_label.setMinimumWidth(120)
+        event_label.setFont(door_font)
+
+        self.event_combo = QComboBox()
+        self.event_combo.setMinimumWidth(200)
+
+        event_layout.addWidget(event_label)
+        event_layout.addWidget(self.event_combo)
+        event_layout.addStretch()
+        layout.addLayout(event_layout)
+
         layout.addSpacing(20)
 
         # Scan section
@@ -120,6 +156,12 @@ class StaffScanWidget(QWidget):
         self.failed_scans_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #f44336;")
         stats_layout.addWidget(self.failed_scans_label)
 
+        stats_layout.addSpacing(30)
+
+        self.pending_scans_label = QLabel("En attente: 0")
+        self.pending_scans_label.setStyleSheet("font-size: 14px; font-weight: bold; color: #FF9800;")
+        stats_layout.addWidget(self.pending_scans_label)
+
         stats_layout.addStretch()
 
         clear_history_btn = QPushButton("Effacer l'historique")
@@ -166,23 +208,21 @@ class StaffScanWidget(QWidget):
         # Get selected door
         door = self.door_combo.currentText()[-1]
 
-        # Scan the ticket
-        result = scan_ticket(ticket_id, self.main_window.staff_id, door)
+        # Queue the scan, the input is free for the next ticket right away
+        event_id = self.event_combo.currentData()
+        task = self.scan_runner.run(scan_ticket, ticket_id, self.main_window.staff_id, door, event_id,
+                                    on_started=self.on_scan_started, on_success=self.on_scan_finished)
 
         # Add to history
         scan_record = {
             'time': datetime.now().strftime("%H:%M:%S"),
             'ticket_id': ticket_id,
-            'success': result['success'],
-            'message': result['message']
+            'state': 'pending',
+            'success': False,
+            'message': "En attente..."
         }
         self.scan_history.insert(0, scan_record)  # Add to beginning
-
-        # Update display
-        if result['success']:
-            self.show_status(f"✓ {result['message']}", "success")
-        else:
-            self.show_status(f"✗ {result['message']}", "error")
+        self.pending_scans[task] = scan_record
 
         self.update_history_table()
         self.update_statistics()
@@ -191,6 +231,35 @@ class StaffScanWidget(QWidget):
         self.ticket_input.clear()
         self.ticket_input.setFocus()
 
+    def on_scan_started(self):
+        """Scan sent to the database."""
+        scan_record = self.pending_scans.get(self.sender())
+        if scan_record is None:
+            return
+
+        scan_record['state'] = 'in_flight'
+        scan_record['message'] = "Vérification en cours..."
+        self.update_history_table()
+
+    def on_scan_finished(self, result):
+        """Result of a queued scan."""
+        scan_record = self.pending_scans.pop(self.sender(), None)
+        if scan_record is None:
+            return
+
+        scan_record['state'] = 'done'
+        scan_record['success'] = result['success']
+        scan_record['message'] = result['message']
+
+        # Update display
+        if result['success']:
+            self.show_status(f"✓ Billet #{scan_record['ticket_id']}: {result['message']}", "success")
+        else:
+            self.show_status(f"✗ Billet #{scan_record['ticket_id']}: {result['message']}", "error")
+
+        self.update_history_table()
+        self.update_statistics()
+
     def show_status(self, message, status_type):
         """Show status message with color coding."""
         self.status_label.setText(message)
@@ -227,12 +296,19 @@ class StaffScanWidget(QWidget):
             self.history_table.setItem(row, 1, id_item)
 
             # Status
-            status_item = QTableWidgetItem("✓ Réussi" if record['success'] else "✗ Échoué")
-            status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            if record['success']:
+            if record['state'] == 'pending':
+                status_item = QTableWidgetItem("… En attente")
+                status_item.setForeground(QColor("#FF9800"))
+            elif record['state'] == 'in_flight':
+                status_item = QTableWidgetItem("⟳ En cours")
+                status_item.setForeground(QColor("#FF9800"))
+            elif record['success']:
+                status_item = QTableWidgetItem("✓ Réussi")
                 status_item.setForeground(QColor("#4CAF50"))
             else:
+                status_item = QTableWidgetItem("✗ Échoué")
                 status_item.setForeground(QColor("#f44336"))
+            status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
             self.history_table.setItem(row, 2, status_item)
 
             # Message
@@ -241,13 +317,15 @@ class StaffScanWidget(QWidget):
 
     def update_statistics(self):
         """Update scan statistics."""
-        total = len(self.scan_history)
-        success = sum(1 for r in self.scan_history if r['success'])
+        done = [r for r in self.scan_history if r['state'] == 'done']
+        total = len(done)
+        success = sum(1 for r in done if r['success'])
         failed = total - success
 
         self.total_scans_label.setText(f"Total scans: {total}")
         self.success_scans_label.setText(f"Réussis: {success}")
         self.failed_scans_label.setText(f"Échoués: {failed}")
+        self.pending_scans_label.setText(f"En attente: {len(self.pending_scans)}")
 
     def clear_history(self):
         """Clear scan history."""
@@ -259,11 +337,27 @@ class StaffScanWidget(QWidget):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.scan_history = []
+            # Scans still waiting for their result stay listed
+            self.scan_history = [r for r in self.scan_history if r['state'] != 'done']
             self.update_history_table()
             self.update_statistics()
             self.status_label.setText("")
 
+    def refresh_on_show(self):
+        """Show the selected staff member and reload the events still open for scanning."""
+        self.staff_info.setText(f"Personnel: {self.main_window.staff_name or 'Non sélectionné'}")
+
+        self.db.run(get_scannable_events, on_success=self.show_events, key="events")
+
+    def show_events(self, events):
+        """Fill the event filter, keeping the selected event if still listed."""
+        selected = self.event_combo.currentData()
+        self.event_combo.clear()
+        self.event_combo.addItem("Tous les événements", None)
+        for event in events:
+            self.event_combo.addItem(f"{event[1]} ({event[3].strftime('%d.%m.%Y')})", event[0])
+        self.event_combo.setCurrentIndex(max(self.event_combo.findData(selected), 0))
+
     def go_back(self):
         """Return to staff home."""
         self.main_window.show_staff_home_widget()
\ No newline at end of file
@@ -3,10 +3,12 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                             QSpinBox, QFrame, QGridLayout)
 from PyQt6.QtCore import Qt
 
-from src.db.requests import (get_all_events, get_tarifs_for_event,
-                             get_available_seats_for_event,
-                             create_reservation, add_ticket_to_reservation,
-                             get_need_reservation_for_event)
+from src.db.requests import (get_events_page, create_reservation, checkout)
+from src.qt.db_tasks import DbTaskRunner
+from src.qt.reservation_widget import load_event_options
+
+# Data of the combo item loading the next page of events
+MORE_EVENTS = "more"
 
 
 class StaffSellWidget(QWidget):
@@ -19,6 +21,9 @@ class StaffSellWidget(QWidget):
         self.prix_total = 0.0
         self.need_reservation = False
         self.quantity_spinboxes = {}
+        # Keyset of the next page of events, None when all are loaded
+        self.next_events_cursor = None
+        self.db = DbTaskRunner(self)
 
         # --- Layout Principal ---
         self.layout = QVBoxLayout(self)
@@ -38,6 +43,7 @@ class StaffSellWidget(QWidget):
         self._setup_footer()
 
         # Load events
+        self.db.busy_changed.connect(self._set_loading)
         self.load_events()
 
     def _setup_header(self):
@@ -136,27 +142,63 @@ class StaffSellWidget(QWidget):
         self.layout.addWidget(footer_frame)
 
     def load_events(self):
-        """Load available events."""
-        events = get_all_events()
+        """Load the first page of available events."""
+        self.event_combo.blockSignals(True)
         self.event_combo.clear()
         self.event_combo.addItem("-- Sélectionner un événement --", None)
+        self.event_combo.blockSignals(False)
+        self.next_events_cursor = None
+        self._add_events_page()
+
+    def _set_loading(self, loading):
+        self.btn_continue.setText("Chargement..." if loading else "Continuer →")
+        self._update_can_continue()
+
+    def _add_events_page(self, select_index=None):
+        """Load the next page of events in the background, select_index is selected once it is shown."""
+        more_index = self.event_combo.findData(MORE_EVENTS)
+        if more_index >= 0:
+            self.event_combo.setItemText(more_index, "Chargement…")
+        self.db.run(get_events_page, after=self.next_events_cursor,
+                    on_success=lambda page: self._show_events_page(page, select_index), key="events")
+
+    def _show_events_page(self, page, select_index=None):
+        """Append a page of events, with a last item to load the one after."""
+        events, self.next_events_cursor = page
+
+        self.event_combo.blockSignals(True)
+        more_index = self.event_combo.findData(MORE_EVENTS)
+        if more_index >= 0:
+            self.event_combo.removeItem(more_index)
 
         for event in events:
             event_id, name, type_name, date, time = event
             display_text = f"{name} - {date} {time}"
             self.event_combo.addItem(display_text, event_id)
 
+        if self.next_events_cursor is not None:
+            self.event_combo.addItem("Plus d'événements…", MORE_EVENTS)
+        self.event_combo.blockSignals(False)
+
+        if select_index is not None:
+            self.event_combo.setCurrentIndex(select_index)
+
     def on_event_selected(self, index):
         """Handle event selection."""
         event_id  = self.event_combo.currentData()
 
+        if event_id == MORE_EVENTS:
+            # Next page, the first new event is selected
+            self._add_events_page(select_index=index)
+            return
+
         if event_id :
             self.selected_event_id = event_id
             self.selected_event_name = self.event_combo.currentText()
-            self.need_reservation = get_need_reservation_for_event(event_id)
             self.load_tarifs()
             self.tarifs_frame.setVisible(True)
         else:
+            self.db.cancel("tarifs")
             self.selected_event_id = None
             self.selected_event_name = None
             self.need_reservation = False
@@ -164,14 +206,20 @@ class StaffSellWidget(QWidget):
             self.tarifs_frame.setVisible(False)
 
     def load_tarifs(self):
-        try:
-            if self.selected_event_id:
-                self.tarifs = get_tarifs_for_event(self.selected_event_id)
-                self.clear_tarifs()
-                self._populate_tarifs()
-        except Exception as e:
-            print(f"Error loading tarifs: {e}")
-            QMessageBox.warning(self, "Erreur", "Impossible de charger les tarifs.")
+        """Load the tarifs of the selected event in the background, only the last selection is shown."""
+        self.tarifs = []
+        self.clear_tarifs()
+        if self.selected_event_id:
+            self.db.run(load_event_options, self.selected_event_id, on_success=self._show_tarifs,
+                        on_error=self._on_tarifs_error, key="tarifs")
+
+    def _show_tarifs(self, options):
+        self.need_reservation, self.tarifs = options
+        self.clear_tarifs()
+        self._populate_tarifs()
+
+    def _on_tarifs_error(self, error):
+        QMessageBox.warning(self, "Erreur", "Impossible de charger les tarifs.")
 
     def _populate_tarifs(self):
         """Populate tarif selection grid."""
@@ -232,7 +280,7 @@ class StaffSellWidget(QWidget):
         """Enable/disable continue button."""
         has_event = self.selected_event_id is not None
         has_tickets = any(spinbox.value() > 0 for spinbox in self.quantity_spinboxes.values())
-        self.btn_continue.setEnabled(has_event and has_tickets)
+        self.btn_continue.setEnabled(has_event and has_tickets and not self.db.busy)
 
     def _get_reservation_data(self):
         """Collect selected tarifs and quantities."""
@@ -277,12 +325,26 @@ class StaffSellWidget(QWidget):
                 return
 
             # Create reservation with staff_id
-            reservation_id = create_reservation(
+            self.db.run(
+                create_reservation,
                 event_id=self.selected_event_id,
                 client_id=None,
-                vendor_id=self.main_window.staff_id
+                vendor_id=self.main_window.staff_id,
+                on_success=lambda reservation_id: self._on_reservation_created(reservation_data, reservation_id),
+                on_error=self._on_continue_error, key="continue"
             )
 
+        except Exception as e:
+            import traceback
+            print(f"ERROR in _go_to_seatmap: {e}")
+            print(traceback.format_exc())
+            self._on_continue_error(str(e))
+
+    def _on_continue_error(self, error):
+        QMessageBox.critical(self, "Erreur", f"Une erreur est survenue: {error}")
+
+    def _on_reservation_created(self, reservation_data, reservation_id):
+        try:
             if not reservation_id:
                 QMessageBox.warning(self, "Erreur", "Erreur lors de la création de la réservation.")
                 return
@@ -296,9 +358,9 @@ class StaffSellWidget(QWidget):
 
         except Exception as e:
             import traceback
-            print(f"ERROR in _go_to_seatmap: {e}")
+            print(f"ERROR in _on_reservation_created: {e}")
             print(traceback.format_exc())
-            QMessageBox.critical(self, "Erreur", f"Une erreur est survenue: {str(e)}")
+            self._on_continue_error(str(e))
 
         def go_back(self):
             self.main_window.show_staff_home_widget()
@@ -313,50 +375,34 @@ class StaffSellWidget(QWidget):
                 QMessageBox.warning(self, "Erreur", "Veuillez sélectionner au moins un billet.")
                 return
 
-            # Create reservation
-            reservation_id = create_reservation(
+            # Reservation and tickets in one transaction (seats picked by the server)
+            self.db.run(
+                checkout,
                 event_id=self.selected_event_id,
-                client_id=None,
-                vendor_id=self.main_window.staff_id
+                client=None,
+                tarif_quantities={name: info['quantity'] for name, info in reservation_data['tarifs'].items()},
+                vendor_id=self.main_window.staff_id,
+                preferences={'contiguous': True},
+                on_success=lambda result: self._on_checkout_done(reservation_data, result),
+                on_error=self._on_continue_error, key="continue"
             )
 
-            if not reservation_id:
-                QMessageBox.warning(self, "Erreur", "Impossible de créer la réservation.")
-                return
-
-            # Assign random available seats
-            available_seats = get_available_seats_for_event(self.selected_event_id)
+        except Exception as e:
+            import traceback
+            print(f"ERROR in _go_to_payment: {e}")
+            print(traceback.format_exc())
+            self._on_continue_error(str(e))
 
-            if not available_seats:
-                QMessageBox.warning(self, "Erreur", "Aucun siège disponible.")
+    def _on_checkout_done(self, reservation_data, result):
+        try:
+            if not result:
+                QMessageBox.warning(self, "Erreur", "Impossible de créer la réservation (pas assez de sièges disponibles ?).")
                 return
 
-            # Create tickets for each tarif quantity
-            seat_index = 0
-            for tarif_name, tarif_info in reservation_data['tarifs'].items():
-                quantity = tarif_info['quantity']
-
-                for _ in range(quantity):
-                    if seat_index >= len(available_seats):
-                        QMessageBox.warning(self, "Erreur", "Pas assez de sièges disponibles.")
-                        return
-
-                    seat = available_seats[seat_index]
-                    success = add_ticket_to_reservation(
-                        reservation_id=reservation_id,
-                        event_id=self.selected_event_id,
-                        seat_id=seat['id'],
-                        tarif_name=tarif_name
-                    )
-
-                    if not success:
-                        QMessageBox.warning(self, "Erreur", f"Impossible d'ajouter le billet {seat['name']}.")
-                        return
-
-                    seat_index += 1
-
             # Add reservation_id, client_id and vendor_id to data
-            reservation_data['reservation_id'] = reservation_id
+            reservation_data['reservation_id'] = result['reservation_id']
+            reservation_data['ticket_ids'] = result['ticket_ids']
+            reservation_data['total'] = result['total']
             reservation_data['client_id'] = None
             reservation_data['vendor_id'] = self.main_window.staff_id
 
@@ -365,9 +411,9 @@ class StaffSellWidget(QWidget):
 
         except Exception as e:
             import traceback
-            print(f"ERROR in _go_to_payment: {e}")
+            print(f"ERROR in _on_checkout_done: {e}")
             print(traceback.format_exc())
-            QMessageBox.critical(self, "Erreur", f"Une erreur est survenue: {str(e)}")
+            self._on_continue_error(str(e))
 
     def go_back(self):
         """Return to staff home."""
@@ -0,0 +1,85 @@
+import os
+import time
+
+from PyQt6.QtCore import QObject, QEvent, QTimer
+from PyQt6.QtWidgets import QApplication, QWidget
+
+# Launchers started with this flag print their startup times and quit
+STARTUP_PROFILE_FLAG = "--startup-profile"
+
+GUI_UI_PATH = os.path.join(os.path.dirname(__file__), 'GUI.ui')
+
+
+def load_main_window_ui(window):
+    """
+    Build the main window from GUI.ui.
+    Uses the precompiled ui_gui.py (pyuic6 src/qt/GUI.ui -o src/qt/ui_gui.py),
+    GUI.ui is only parsed at runtime if that file is missing.
+    """
+    try:
+        from src.qt.ui_gui import Ui_TicketBester
+    except ImportError:
+        from PyQt6.uic import loadUi
+        loadUi(GUI_UI_PATH, window)
+        return
+
+    ui = Ui_TicketBester()
+    ui.setupUi(window)
+    # Same result as loadUi: the widgets of GUI.ui become attributes of the window
+    for name, widget in vars(ui).items():
+        setattr(window, name, widget)
+
+
+class AfterFirstPaint(QObject):
+    """Calls callback() once `window` has been painted for the first time."""
+
+    def __init__(self, window, callback):
+        super().__init__(window)
+        self.window = window
+        self.callback = callback
+        QApplication.instance().installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if (event.type() == QEvent.Type.Paint and isinstance(obj, QWidget)
+                and obj.window() is self.window):
+            QApplication.instance().removeEventFilter(self)
+            # Once the whole window has been painted
+            QTimer.singleShot(0, self.callback)
+        return False
+
+
+def _start_live_updates():
+    from src.qt.live_updates import start_live_updates
+    start_live_updates()
+
+
+def start_live_updates_later(window):
+    """Start the database change feed after the first paint, its imports and connection don't delay it."""
+    AfterFirstPaint(window, _start_live_updates)
+
+
+def _start_hold_sweeper():
+    from src.qt.hold_sweeper import start_hold_sweeper
+    start_hold_sweeper()
+
+
+def start_hold_sweeper_later(window):
+    """Start sweeping expired holds and pending reservations after the first paint."""
+    AfterFirstPaint(window, _start_hold_sweeper)
+
+
+class StartupProfiler(QObject):
+    """Prints the import time and the time to first paint of a launcher, then quits the app."""
+
+    def __init__(self, name, started_at, imported_at, window):
+        super().__init__(window)
+        self.name = name
+        self.started_at = started_at
+        self.imported_at = imported_at
+        AfterFirstPaint(window, self.report)
+
+    def report(self):
+        painted_at = time.perf_counter()
+        print(f"{self.name}: imports {(self.imported_at - self.started_at) * 1000:.1f} ms, "
+              f"first paint {(painted_at - self.started_at) * 1000:.1f} ms", flush=True)
+        QApplication.instance().quit()
@@ -0,0 +1,32 @@
+# Form implementation generated from reading ui file 'src/qt/GUI.ui'
+#
+# Created by: PyQt6 UI code generator 6.11.0
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class Ui_TicketBester(object):
+    def setupUi(self, TicketBester):
+        TicketBester.setObjectName("TicketBester")
+        TicketBester.resize(1000, 700)
+        self.centralwidget = QtWidgets.QWidget(parent=TicketBester)
+        self.centralwidget.setObjectName("centralwidget")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout.setSpacing(0)
+        self.verticalLayout.setObjectName("verticalLayout")
+        TicketBester.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(parent=TicketBester)
+        self.statusbar.setObjectName("statusbar")
+        TicketBester.setStatusBar(self.statusbar)
+
+        self.retranslateUi(TicketBester)
+        QtCore.QMetaObject.connectSlotsByName(TicketBester)
+
+    def retranslateUi(self, TicketBester):
+        _translate = QtCore.QCoreApplication.translate
+        TicketBester.setWindowTitle(_translate("TicketBester", "TicketBester"))
@@ -0,0 +1,202 @@
+"""
+Seat map geometry of a room configuration: where each sector goes and where each seat goes in its sector.
+Built once from the database, then cached in memory and on disk by (room_id, config_id).
+A cached geometry of an older room.layout_version (seats or sectors moved since) is rebuilt.
+"""
+
+import json
+import os
+import threading
+
+from src.db.requests import get_venue_geometry_rows
+
+# Bump when the cached format changes, older files are ignored
+GEOMETRY_FORMAT = 2
+CACHE_DIR = os.getenv("TICKETBESTER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ticketbester"))
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def build_venue_geometry(rows):
+    """
+    Geometry from get_venue_geometry_rows() rows.
+    Seats have (x, y) in seats from the top left of their sector: pos_x / pos_y if set,
+    else seat_col / seat_row. Sectors without positions get a square grid in seat id order.
+    """
+    sectors = {}
+    for (sector_name, grid_row, grid_col, row_span, col_span, wide_seats,
+         seat_id, seat_row, seat_col, pos_x, pos_y) in rows:
+        sector = sectors.setdefault(sector_name, {
+            'name': sector_name,
+            'grid_row': grid_row,
+            'grid_col': grid_col,
+            'row_span': row_span or 1,
+            'col_span': col_span or 1,
+            'wide_seats': bool(wide_seats),
+            'seat_rows': [],
+        })
+        sector['seat_rows'].append((seat_id, seat_row, seat_col, pos_x, pos_y))
+
+    seats = {}
+    for sector in sectors.values():
+        seat_rows = sorted(sector.pop('seat_rows'))
+
+        if all((row is not None and col is not None) or (x is not None and y is not None)
+               for _, row, col, x, y in seat_rows):
+            positions = {seat_id: (x if x is not None else col, y if y is not None else row)
+                         for seat_id, row, col, x, y in seat_rows}
+        else:
+            cols = int(len(seat_rows) ** 0.5) + 1
+            positions = {seat_id: (index % cols, index // cols)
+                         for index, (seat_id, *_) in enumerate(seat_rows)}
+
+        sector['width'] = max(x for x, _ in positions.values()) + 1
+        sector['height'] = max(y for _, y in positions.values()) + 1
+        seats.update(positions)
+
+    return {
+        'format': GEOMETRY_FORMAT,
+        'sectors': list(sectors.values()),
+        'seats': seats,
+    }
+
+
+def geometry_from_seats(seats_data):
+    """Fallback geometry when the room geometry can't be loaded: sectors in name order, square grids."""
+    rows = [(seat['sector'], None, None, 1, 1, False, seat['id'], None, None, None, None)
+            for seat in sorted(seats_data, key=lambda s: (s['sector'], s['id']))]
+    return build_venue_geometry(rows)
+
+
+def _cache_path(room_id, config_id):
+    return os.path.join(CACHE_DIR, f"venue_{room_id}_{config_id}.json")
+
+
+def _load_from_disk(room_id, config_id, layout_version):
+    try:
+        with open(_cache_path(room_id, config_id), "r", encoding="utf-8") as f:
+            geometry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if geometry.get('format') != GEOMETRY_FORMAT or geometry.get('layout_version') != layout_version:
+        return None
+    # JSON keys are strings
+    geometry['seats'] = {int(seat_id): tuple(position) for seat_id, position in geometry['seats'].items()}
+    return geometry
+
+
+def _save_to_disk(room_id, config_id, geometry):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = _cache_path(room_id, config_id)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(geometry, f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"Error saving venue geometry: {e}")
+
+
+def _covers(geometry, seat_ids):
+    return geometry is not None and all(seat_id in geometry['seats'] for seat_id in seat_ids)
+
+
+def get_venue_geometry(room_id, config_id, layout_version=None, seat_ids=()):
+    """
+    Geometry of the room configuration at `layout_version` (see get_event_room_config),
+    from memory, disk or the database in that order.
+    A cached geometry missing one of `seat_ids` is rebuilt as well.
+    """
+    key = (room_id, config_id)
+    with _cache_lock:
+        geometry = _cache.get(key)
+    if geometry is not None and geometry.get('layout_version') == layout_version and _covers(geometry, seat_ids):
+        return geometry
+
+    geometry = _load_from_disk(room_id, config_id, layout_version)
+    if not _covers(geometry, seat_ids):
+        rows = get_venue_geometry_rows(room_id, config_id)
+        if not rows:
+            return None
+        geometry = build_venue_geometry(rows)
+        geometry['layout_version'] = layout_version
+        _save_to_disk(room_id, config_id, geometry)
+
+    with _cache_lock:
+        _cache[key] = geometry
+    return geometry
+
+
+def place_sectors(sectors, sizes, gap, max_width):
+    """
+    Top left corner of each sector from its grid cell, sizes being {name: (width, height)}.
+    Columns / rows are as large as their largest sector, sectors are centered in their cells.
+    Sectors without cell are put in rows below, wrapping at max_width.
+    """
+    placed = [s for s in sectors if s['grid_row'] is not None and s['grid_col'] is not None]
+    n_cols = max((s['grid_col'] + s['col_span'] for s in placed), default=0)
+    n_rows = max((s['grid_row'] + s['row_span'] for s in placed), default=0)
+    col_widths = [0.0] * n_cols
+    row_heights = [0.0] * n_rows
+
+    # Single cells first, then make room for the spanning sectors on their last column / row
+    for sector in sorted(placed, key=lambda s: (s['col_span'], s['row_span'])):
+        width, height = sizes[sector['name']]
+        cols = range(sector['grid_col'], sector['grid_col'] + sector['col_span'])
+        rows = range(sector['grid_row'], sector['grid_row'] + sector['row_span'])
+        missing_width = width - (sum(col_widths[c] for c in cols) + gap * (len(cols) - 1))
+        if missing_width > 0:
+            col_widths[cols[-1]] += missing_width
+        missing_height = height - (sum(row_heights[r] for r in rows) + gap * (len(rows) - 1))
+        if missing_height > 0:
+            row_heights[rows[-1]] += missing_height
+
+    col_x = [sum(col_widths[:c]) + gap * c for c in range(n_cols)]
+    row_y = [sum(row_heights[:r]) + gap * r for r in range(n_rows)]
+
+    origins = {}
+    for sector in placed:
+        width, height = sizes[sector['name']]
+        first_col, last_col = sector['grid_col'], sector['grid_col'] + sector['col_span'] - 1
+        first_row, last_row = sector['grid_row'], sector['grid_row'] + sector['row_span'] - 1
+        cell_width = col_x[last_col] + col_widths[last_col] - col_x[first_col]
+        cell_height = row_y[last_row] + row_heights[last_row] - row_y[first_row]
+        origins[sector['name']] = (col_x[first_col] + (cell_width - width) / 2,
+                                   row_y[first_row] + (cell_height - height) / 2)
+
+    # Flow layout for the others
+    x = 0.0
+    y = (row_y[-1] + row_heights[-1] + gap) if n_rows else 0.0
+    row_height = 0.0
+    for sector in sectors:
+        if sector['name'] in origins:
+            continue
+        width, height = sizes[sector['name']]
+        if x > 0 and x + width > max_width:
+            x = 0.0
+            y += row_height + gap
+            row_height = 0.0
+        origins[sector['name']] = (x, y)
+        x += width + gap
+        row_height = max(row_height, height)
+
+    return origins
+
+
+def grid_cells(sectors):
+    """(row, col, row_span, col_span) of each sector for a QGridLayout, unplaced ones in rows below."""
+    placed = [s for s in sectors if s['grid_row'] is not None and s['grid_col'] is not None]
+    next_row = max((s['grid_row'] + s['row_span'] for s in placed), default=0)
+    per_row = max(1, max((s['grid_col'] + s['col_span'] for s in placed), default=0))
+
+    cells = {}
+    flow = 0
+    for sector in sectors:
+        if sector in placed:
+            cells[sector['name']] = (sector['grid_row'], sector['grid_col'], sector['row_span'], sector['col_span'])
+        else:
+            row, col = divmod(flow, per_row)
+            cells[sector['name']] = (next_row + row, col, 1, 1)
+            flow += 1
+    return cells
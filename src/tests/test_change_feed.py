@@ -0,0 +1,134 @@
+"""
+Unit tests for the database change feed.
+Tests LISTEN, payload decoding, reconnection and cache invalidation in src/db/change_feed.py
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.db import change_feed
+from src.db.change_feed import ChangeListener, EVENT_CHANGES, SEAT_CHANGES, CHANNELS
+
+
+def make_notify(channel, payload):
+    notify = Mock()
+    notify.channel = channel
+    notify.payload = payload
+    return notify
+
+
+class TestChangeListener(unittest.TestCase):
+    """Test the LISTEN thread and its callbacks"""
+
+    def setUp(self):
+        self.listener = ChangeListener(connect=Mock(), poll_timeout=0.01, reconnect_delay=0)
+
+    def test_payload_is_decoded(self):
+        """Test callbacks get the JSON payload of their channel only"""
+        events, seats = [], []
+        self.listener.subscribe(EVENT_CHANGES, events.append)
+        self.listener.subscribe(SEAT_CHANGES, seats.append)
+
+        self.listener._dispatch(EVENT_CHANGES, '{"op" : "insert", "ids" : [6]}')
+
+        self.assertEqual(events, [{'op': 'insert', 'ids': [6]}])
+        self.assertEqual(seats, [])
+
+    def test_invalid_payload_reloads_everything(self):
+        """Test a payload that is not JSON is passed as None"""
+        events = []
+        self.listener.subscribe(EVENT_CHANGES, events.append)
+
+        self.listener._dispatch(EVENT_CHANGES, 'not json')
+
+        self.assertEqual(events, [None])
+
+    def test_failing_callback_does_not_stop_others(self):
+        """Test an exception in a callback is not raised in the listener"""
+        events = []
+        self.listener.subscribe(EVENT_CHANGES, Mock(side_effect=ValueError("closed")))
+        self.listener.subscribe(EVENT_CHANGES, events.append)
+
+        self.listener._dispatch(EVENT_CHANGES, '{"ids" : null}')
+
+        self.assertEqual(events, [{'ids': None}])
+
+    def test_unsubscribe(self):
+        """Test an unsubscribed callback is no longer called"""
+        events = []
+        self.listener.subscribe(EVENT_CHANGES, events.append)
+        self.listener.unsubscribe(EVENT_CHANGES, events.append)
+
+        self.listener._dispatch(EVENT_CHANGES, '{"ids" : [1]}')
+
+        self.assertEqual(events, [])
+
+    @patch('src.db.change_feed.select.select')
+    def test_run_listens_and_dispatches(self, mock_select):
+        """Test the thread LISTENs on every channel and dispatches the notifications"""
+        connection = Mock()
+        connection.notifies = []
+        connection.poll.side_effect = lambda: connection.notifies.append(
+            make_notify(SEAT_CHANGES, '{"events" : {"6" : 12}}'))
+        mock_select.side_effect = lambda r, w, x, timeout: (r, [], [])
+        self.listener.connect.return_value = connection
+
+        seats = []
+
+        def on_seats(change):
+            seats.append(change)
+            self.listener.stop()
+        self.listener.subscribe(SEAT_CHANGES, on_seats)
+        self.listener.run()
+
+        listened = [c.args[0] for c in connection.cursor.return_value.execute.call_args_list]
+        self.assertEqual(listened, [f"LISTEN {channel}" for channel in CHANNELS])
+        self.assertEqual(seats, [{'events': {'6': 12}}])
+        connection.close.assert_called_once()
+
+    @patch('src.db.change_feed.select.select')
+    def test_reconnect_reloads_everything(self, mock_select):
+        """Test changes missed while disconnected are signalled with None"""
+        connection = Mock()
+        connection.notifies = []
+        mock_select.return_value = ([], [], [])
+        self.listener.connect.side_effect = [Exception("server closed the connection"), connection]
+
+        events = []
+
+        def on_events(change):
+            events.append(change)
+            self.listener.stop()
+        self.listener.subscribe(EVENT_CHANGES, on_events)
+        self.listener.run()
+
+        self.assertEqual(events, [None])
+        self.assertEqual(self.listener.connect.call_count, 2)
+
+
+class TestInvalidateChangedReads(unittest.TestCase):
+    """Test cached reads are dropped for the changed events"""
+
+    @patch('src.db.change_feed.get_all_events')
+    @patch('src.db.change_feed._invalidate_event')
+    def test_changed_events(self, mock_invalidate, mock_events):
+        change_feed.invalidate_changed_reads({'op': 'update', 'ids': [1, 4]})
+
+        self.assertEqual([c.args[0] for c in mock_invalidate.call_args_list], [1, 4])
+        mock_events.invalidate.assert_called_once()
+
+    @patch('src.db.change_feed.clear_query_cache')
+    def test_unknown_events(self, mock_clear):
+        change_feed.invalidate_changed_reads({'op': 'update', 'ids': None})
+        change_feed.invalidate_changed_reads(None)
+
+        self.assertEqual(mock_clear.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,307 @@
+"""
+Unit tests for the database connection pool.
+Tests borrowing, health checks and statistics in src/db/connection.py
+"""
+
+import threading
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import psycopg2.extensions
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.db import connection as db_connection
+from src.db.connection import ConnectionPool, PoolTimeout
+
+
+def make_raw_connection():
+    """Mock psycopg2 connection in idle state"""
+    raw = Mock()
+    raw.closed = 0
+    raw.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    return raw
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test the thread-safe connection pool"""
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_connection_is_reused(self, mock_connect):
+        """Test a returned connection is handed out again instead of reconnecting"""
+        mock_connect.side_effect = lambda **kwargs: make_raw_connection()
+        pool = ConnectionPool(min_size=0, max_size=2)
+
+        first = pool.getconn()
+        raw = first.raw
+        first.close()
+        second = pool.getconn()
+
+        self.assertIs(second.raw, raw)
+        self.assertEqual(mock_connect.call_count, 1)
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_timezone_set_through_options(self, mock_connect):
+        """Test the timezone is configured once per physical connection"""
+        mock_connect.side_effect = lambda **kwargs: make_raw_connection()
+        pool = ConnectionPool(min_size=0, max_size=1, database='ticketbester_db')
+
+        pool.getconn().close()
+
+        kwargs = mock_connect.call_args.kwargs
+        self.assertIn('timezone=Europe/Zurich', kwargs['options'])
+        self.assertEqual(kwargs['database'], 'ticketbester_db')
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_prewarm_opens_min_size(self, mock_connect):
+        """Test prewarm opens the minimum number of connections"""
+        mock_connect.side_effect = lambda **kwargs: make_raw_connection()
+        pool = ConnectionPool(min_size=3, max_size=5)
+
+        pool.prewarm()
+
+        stats = pool.get_stats()
+        self.assertEqual(stats['idle'], 3)
+        self.assertEqual(stats['in_use'], 0)
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_open_transaction_rolled_back_on_release(self, mock_connect):
+        """Test a connection left inside a transaction is rolled back when returned"""
+        raw = make_raw_connection()
+        raw.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        mock_connect.return_value = raw
+        pool = ConnectionPool(min_size=0, max_size=1)
+
+        pool.getconn().close()
+
+        raw.rollback.assert_called_once()
+        self.assertEqual(pool.get_stats()['idle'], 1)
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_closed_connection_discarded(self, mock_connect):
+        """Test a connection closed by the server is replaced on checkout"""
+        mock_connect.side_effect = lambda **kwargs: make_raw_connection()
+        pool = ConnectionPool(min_size=0, max_size=1)
+
+        first = pool.getconn()
+        broken = first.raw
+        first.close()
+        broken.closed = 2
+
+        second = pool.getconn()
+
+        self.assertIsNot(second.raw, broken)
+        self.assertEqual(pool.get_stats()['discarded'], 1)
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_stale_connection_pinged(self, mock_connect):
+        """Test a connection idle for too long is pinged before being reused"""
+        raw = make_raw_connection()
+        mock_connect.return_value = raw
+        pool = ConnectionPool(min_size=0, max_size=1, ping_after=0)
+
+        pool.getconn().close()
+        pool.getconn().close()
+
+        raw.cursor.return_value.execute.assert_called_once_with("SELECT 1")
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_exhausted_pool_times_out(self, mock_connect):
+        """Test borrowing from an exhausted pool raises after the timeout"""
+        mock_connect.side_effect = lambda **kwargs: make_raw_connection()
+        pool = ConnectionPool(min_size=0, max_size=1, timeout=0.05)
+
+        held = pool.getconn()
+
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        held.close()
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_waiting_borrower_gets_released_connection(self, mock_connect):
+        """Test a waiting borrower is woken up when a connection is returned"""
+        mock_connect.side_effect = lambda **kwargs: make_raw_connection()
+        pool = ConnectionPool(min_size=0, max_size=1, timeout=5)
+
+        held = pool.getconn()
+        timer = threading.Timer(0.05, held.close)
+        timer.start()
+
+        borrowed = pool.getconn()
+        timer.join()
+
+        self.assertIsNotNone(borrowed.raw)
+        stats = pool.get_stats()
+        self.assertEqual(stats['waits'], 1)
+        self.assertGreater(stats['max_wait_time'], 0)
+        self.assertEqual(stats['in_use'], 1)
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_double_close_is_ignored(self, mock_connect):
+        """Test closing a borrowed connection twice only returns it once"""
+        mock_connect.side_effect = lambda **kwargs: make_raw_connection()
+        pool = ConnectionPool(min_size=0, max_size=2)
+
+        conn = pool.getconn()
+        conn.close()
+        conn.close()
+
+        self.assertEqual(pool.get_stats()['idle'], 1)
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_get_pool_stats(self, mock_connect):
+        """Test module level stats come from the shared pool"""
+        mock_connect.side_effect = lambda **kwargs: make_raw_connection()
+        db_connection.close_pool()
+
+        conn = db_connection._get_connection()
+        stats = db_connection.get_pool_stats()
+        conn.close()
+        db_connection.close_pool()
+
+        self.assertEqual(stats['in_use'], 1)
+        self.assertEqual(stats['max_size'], db_connection.POOL_MAX_SIZE)
+
+
+
+def make_lagging_connection(lag, replayed_lsn=0, **kwargs):
+    """Mock replica connection answering the lag query"""
+    raw = make_raw_connection()
+    raw.host = kwargs.get('host')
+    raw.cursor.return_value.fetchone.return_value = (lag, replayed_lsn)
+    return raw
+
+
+def make_primary_connection(commit_lsn, **kwargs):
+    """Mock primary connection answering the commit position query"""
+    raw = make_raw_connection()
+    raw.host = kwargs.get('host')
+    raw.cursor.return_value.fetchone.return_value = (commit_lsn,)
+    return raw
+
+
+class TestReplicaRouting(unittest.TestCase):
+    """Test read-only requests go to replicas close enough to the primary"""
+
+    def setUp(self):
+        db_connection.close_pool()
+        patcher = patch.object(db_connection, 'REPLICA_DSNS', ['host=replica1', 'host=replica2'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(db_connection.close_pool)
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_reads_go_to_replicas_in_turn(self, mock_connect):
+        """Test read-only connections come from the replicas, round robin, in read-only autocommit"""
+        mock_connect.side_effect = lambda **kwargs: make_lagging_connection(0, **kwargs)
+
+        hosts = []
+        for _ in range(2):
+            conn = db_connection._get_connection(readonly=True)
+            hosts.append(conn.raw.host)
+            conn.raw.set_session.assert_called_once_with(readonly=True, autocommit=True)
+            conn.close()
+
+        self.assertEqual(sorted(hosts), ['replica1', 'replica2'])
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_writes_go_to_primary(self, mock_connect):
+        """Test connections without readonly come from the primary pool"""
+        mock_connect.side_effect = lambda **kwargs: make_lagging_connection(0, **kwargs)
+
+        conn = db_connection._get_connection()
+
+        self.assertNotIn(conn.raw.host, ('replica1', 'replica2'))
+        conn.close()
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_lagging_replica_is_skipped(self, mock_connect):
+        """Test a replica behind by more than REPLICA_MAX_LAG is not used"""
+        def connect(**kwargs):
+            lag = 60 if kwargs.get('host') == 'replica1' else 0
+            return make_lagging_connection(lag, **kwargs)
+        mock_connect.side_effect = connect
+
+        hosts = []
+        for _ in range(2):
+            conn = db_connection._get_connection(readonly=True)
+            hosts.append(conn.raw.host)
+            conn.close()
+
+        self.assertEqual(hosts, ['replica2', 'replica2'])
+        self.assertEqual(db_connection.get_pool_stats()['replicas'][0]['skipped'], 1)
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_reads_after_commit_wait_for_replay(self, mock_connect):
+        """Test reads right after a commit of the app go to the primary until a replica replayed it"""
+        replayed = {'lsn': 50}
+
+        def connect(**kwargs):
+            if kwargs.get('host') in ('replica1', 'replica2'):
+                raw = make_lagging_connection(0, **kwargs)
+                raw.cursor.return_value.fetchone.side_effect = lambda: (0, replayed['lsn'])
+                return raw
+            return make_primary_connection(100, **kwargs)
+        mock_connect.side_effect = connect
+
+        primary_reads = db_connection._primary_reads
+        conn = db_connection._get_connection()
+        conn.commit()
+        conn.close()
+        read = db_connection._get_connection(readonly=True)
+        self.assertNotIn(read.raw.host, ('replica1', 'replica2'))
+        read.close()
+
+        replayed['lsn'] = 120
+        read = db_connection._get_connection(readonly=True)
+        self.assertIn(read.raw.host, ('replica1', 'replica2'))
+        read.close()
+
+        self.assertEqual(db_connection.get_pool_stats()['primary_reads'] - primary_reads, 1)
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_reads_without_commit_use_replicas(self, mock_connect):
+        """Test reads are not sent to the primary when the app committed nothing the replica lacks"""
+        mock_connect.side_effect = lambda **kwargs: make_lagging_connection(0, replayed_lsn=100, **kwargs)
+
+        read = db_connection._get_connection(readonly=True)
+
+        self.assertIn(read.raw.host, ('replica1', 'replica2'))
+        read.close()
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_busy_replica_is_not_down(self, mock_connect):
+        """Test an exhausted replica pool falls through to the next one without being marked down"""
+        mock_connect.side_effect = lambda **kwargs: make_lagging_connection(0, **kwargs)
+        replicas = db_connection._get_replicas()
+        replicas[0].pool.getconn = Mock(side_effect=db_connection.PoolTimeout("busy"))
+        replicas[1].pool.getconn = Mock(side_effect=db_connection.PoolTimeout("busy"))
+
+        conn = db_connection._get_connection(readonly=True)
+
+        self.assertNotIn(conn.raw.host, ('replica1', 'replica2'))
+        conn.close()
+        stats = db_connection.get_pool_stats()['replicas']
+        self.assertFalse(any(r['down'] for r in stats))
+        self.assertEqual([r['busy'] for r in stats], [1, 1])
+
+    @patch('src.db.connection.psycopg2.connect')
+    def test_unreachable_replicas_fall_back_to_primary(self, mock_connect):
+        """Test reads still work when no replica answers"""
+        def connect(**kwargs):
+            if kwargs.get('host') in ('replica1', 'replica2'):
+                raise psycopg2.OperationalError("could not connect")
+            return make_raw_connection()
+        mock_connect.side_effect = connect
+
+        conn = db_connection._get_connection(readonly=True)
+
+        self.assertIsNotNone(conn.raw)
+        conn.close()
+        self.assertTrue(all(r['down'] for r in db_connection.get_pool_stats()['replicas']))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
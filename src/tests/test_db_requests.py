@@ -3,9 +3,11 @@ Unit tests for database requests module.
 Tests all CRUD operations and business logic in src/db/requests.py
 """
 
+import json
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
+from decimal import Decimal
 import sys
 import os
 
@@ -13,11 +15,16 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.db import requests
+from src.db.query_cache import clear_query_cache
 
 
 class TestEventRequests(unittest.TestCase):
     """Test event-related database requests"""
 
+    def setUp(self):
+        # Cached reads would return the previous test's mocked results
+        clear_query_cache()
+
     @patch('src.db.requests._get_connection')
     def test_get_all_events_success(self, mock_conn):
         """Test fetching all events successfully"""
@@ -58,6 +65,87 @@ class TestEventRequests(unittest.TestCase):
 
         self.assertEqual(result, [])
 
+    @patch('src.db.requests._get_connection')
+    def test_get_scannable_events(self, mock_conn):
+        """Test the door lists the events not ended yet, started ones included"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [
+            (3, 'Concert en cours', 'Concert', datetime(2026, 7, 15).date(), datetime(2026, 7, 15, 20, 0).time())
+        ]
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        result = requests.get_scannable_events()
+
+        self.assertEqual(result[0][0], 3)
+        query = mock_cursor.execute.call_args[0][0]
+        self.assertIn("e.end_at > NOW()", query)
+        self.assertNotIn("start_at > NOW()", query)
+
+    @patch('src.db.requests._get_connection')
+    def test_get_events_page(self, mock_conn):
+        """Test a full page returns the cursor of its last row"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [
+            (1, 'Concert de Rock', 'Concert', datetime(2026, 7, 15).date(), datetime(2026, 7, 15, 20, 0).time(),
+             datetime(2026, 7, 15, 20, 0)),
+            (2, 'Exposition', 'Exposition', datetime(2026, 8, 1).date(), datetime(2026, 8, 1, 10, 0).time(),
+             datetime(2026, 8, 1, 10, 0)),
+            (3, 'Conférence', 'Conférence', datetime(2026, 9, 1).date(), datetime(2026, 9, 1, 9, 0).time(),
+             datetime(2026, 9, 1, 9, 0))
+        ]
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        rows, next_cursor = requests.get_events_page(limit=2, type_id=4)
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(len(rows[0]), 5)
+        self.assertEqual(next_cursor, (datetime(2026, 8, 1, 10, 0), 2))
+        self.assertEqual(mock_cursor.execute.call_args[0][1], [4, 3])
+
+    @patch('src.db.requests._get_connection')
+    def test_get_events_page_last(self, mock_conn):
+        """Test the last page has no cursor and the keyset follows the filters"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [
+            (3, 'Conférence', 'Conférence', datetime(2026, 9, 1).date(), datetime(2026, 9, 1, 9, 0).time(),
+             datetime(2026, 9, 1, 9, 0))
+        ]
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        rows, next_cursor = requests.get_events_page(after=(datetime(2026, 8, 1, 10, 0), 2), limit=2, room_id=1)
+
+        self.assertEqual(len(rows), 1)
+        self.assertIsNone(next_cursor)
+        self.assertEqual(mock_cursor.execute.call_args[0][1], [1, datetime(2026, 8, 1, 10, 0), 2, 3])
+
+    @patch('src.db.requests._get_connection')
+    def test_get_events_page_exception(self, mock_conn):
+        """Test handling exception when fetching a page"""
+        mock_conn.side_effect = Exception("Database connection error")
+
+        self.assertEqual(requests.get_events_page(), ([], None))
+
+    @patch('src.db.requests._get_connection')
+    def test_search_events(self, mock_conn):
+        """Test every typed word is searched as a prefix"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [
+            (5, 'Otello par la Troupe Nationale', 'Pièce de Théâtre', datetime(2026, 11, 20).date(),
+             datetime(2026, 11, 20, 19, 30).time())
+        ]
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        result = requests.search_events("Théâtre  l'ote", limit=10)
+
+        self.assertEqual(result[0][0], 5)
+        self.assertEqual(mock_cursor.execute.call_args[0][1], ("Théâtre:* & l:* & ote:*", 10))
+
+    @patch('src.db.requests._get_connection')
+    def test_search_events_blank(self, mock_conn):
+        """Test a blank search does not query the database"""
+        self.assertEqual(requests.search_events("  -  "), [])
+        mock_conn.assert_not_called()
+
     @patch('src.db.requests._get_connection')
     def test_get_all_events_details_success(self, mock_conn):
         """Test fetching event details by ID"""
@@ -88,9 +176,43 @@ class TestEventRequests(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestEventCatalogPlan(unittest.TestCase):
+    """Check the catalog query plan on the database (skipped when it is not reachable)"""
+
+    def setUp(self):
+        try:
+            self.connection = requests._get_connection()
+        except Exception as e:
+            self.skipTest(f"Database not available: {e}")
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_events_page_uses_partial_index(self):
+        """Test the keyset page is read from idx_event_on_sale, without sorting"""
+        query, params = requests._events_page_query(after=(datetime(2026, 8, 1, 10, 0), 2), limit=50,
+                                                    date_to=datetime(2027, 1, 1))
+        cursor = self.connection.cursor()
+        try:
+            # The seed tables are tiny: make the planner show whether the index can be used
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN (FORMAT JSON) " + query, params)
+            plan = json.dumps(cursor.fetchone()[0])
+        finally:
+            cursor.close()
+            self.connection.rollback()
+
+        self.assertIn('"Index Name": "idx_event_on_sale"', plan)
+        self.assertNotIn('"Node Type": "Sort"', plan)
+
+
 class TestTarifRequests(unittest.TestCase):
     """Test tarif-related database requests"""
 
+    def setUp(self):
+        # Cached reads would return the previous test's mocked results
+        clear_query_cache()
+
     @patch('src.db.requests._get_connection')
     def test_get_tarifs_for_event_success(self, mock_conn):
         """Test fetching tarifs for an event"""
@@ -146,6 +268,10 @@ class TestTarifRequests(unittest.TestCase):
 class TestSeatRequests(unittest.TestCase):
     """Test seat-related database requests"""
 
+    def setUp(self):
+        # Cached reads would return the previous test's mocked results
+        clear_query_cache()
+
     @patch('src.db.requests._get_connection')
     def test_get_available_seats_success(self, mock_conn):
         """Test fetching available seats"""
@@ -167,9 +293,9 @@ class TestSeatRequests(unittest.TestCase):
         """Test fetching all seats with their status"""
         mock_cursor = Mock()
         mock_cursor.fetchall.return_value = [
-            (1, 'S1', 'Standard', 'Standard', 0.00, 'AVAILABLE'),
-            (2, 'S2', 'Standard', 'Standard', 0.00, 'SOLD'),
-            (3, 'S3', 'Standard', 'Standard', 0.00, 'RESERVED')
+            (1, 'S1', 'Standard', 'Standard', 0.00, 'AVAILABLE', 10),
+            (2, 'S2', 'Standard', 'Standard', 0.00, 'SOLD', 42),
+            (3, 'S3', 'Standard', 'Standard', 0.00, 'RESERVED', 17)
         ]
         mock_conn.return_value.cursor.return_value = mock_cursor
 
@@ -178,6 +304,73 @@ class TestSeatRequests(unittest.TestCase):
         self.assertEqual(len(result), 3)
         self.assertEqual(result[1]['status'], 'SOLD')
         self.assertEqual(result[2]['status'], 'RESERVED')
+        self.assertEqual(result[1]['version'], 42)
+
+    @patch('src.db.requests._get_connection')
+    def test_get_seat_changes_since(self, mock_conn):
+        """Test the seats changed since the watermark are returned with the new watermark"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [
+            (44, 5, 'HOLD'),
+            (44, 8, 'SOLD')
+        ]
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        changes, version = requests.get_seat_changes_since(1, 42)
+
+        self.assertEqual(changes, [{'id': 5, 'status': 'HOLD'}, {'id': 8, 'status': 'SOLD'}])
+        self.assertEqual(version, 44)
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (1, 42))
+
+    @patch('src.db.requests._get_connection')
+    def test_get_seat_changes_since_no_change(self, mock_conn):
+        """Test the watermark still moves when no seat changed"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [(50, None, None)]
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        changes, version = requests.get_seat_changes_since(1, 42)
+
+        self.assertEqual(changes, [])
+        self.assertEqual(version, 50)
+
+    @patch('src.db.requests._get_connection')
+    def test_get_seat_changes_since_error(self, mock_conn):
+        """Test the version is kept when the poll fails"""
+        mock_conn.side_effect = Exception("Connection failed")
+
+        changes, version = requests.get_seat_changes_since(1, 42)
+
+        self.assertEqual(changes, [])
+        self.assertEqual(version, 42)
+
+    @patch('src.db.requests._get_connection')
+    def test_get_event_room_config(self, mock_conn):
+        """Test fetching the room, configuration and layout version of an event"""
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = (1, 2, 7)
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        self.assertEqual(requests.get_event_room_config(5), (1, 2, 7))
+
+        mock_cursor.fetchone.return_value = None
+        self.assertIsNone(requests.get_event_room_config(99))
+
+    @patch('src.db.requests._get_connection')
+    def test_get_venue_geometry_rows(self, mock_conn):
+        """Test fetching the seat positions of a room configuration"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [
+            ('SPC Gauche', 1, 1, 1, 1, True, 71, 0, 0, None, None),
+            ('SPC Gauche', 1, 1, 1, 1, True, 72, 0, 1, None, None)
+        ]
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        result = requests.get_venue_geometry_rows(1, 1)
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[1][6], 72)
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (1, 1))
 
     @patch('src.db.requests._get_connection')
     def test_get_sector_supplements(self, mock_conn):
@@ -196,6 +389,79 @@ class TestSeatRequests(unittest.TestCase):
         self.assertEqual(result['Balcon Haut'], 15.00)
 
 
+class TestSeatHoldRequests(unittest.TestCase):
+    """Test seat holds taken on the seat map"""
+
+    @patch('src.db.requests._get_connection')
+    def test_hold_seats_success(self, mock_conn):
+        """Test holding seats returns the seats actually held"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [(5,), (6,)]
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.hold_seats(1, 10, [5, 6, 7], 600)
+
+        self.assertEqual(result, [5, 6])
+        params = mock_cursor.execute.call_args[0][1]
+        self.assertEqual(params, (1, [5, 6, 7], 10, 600, 10, 1))
+        mock_connection.commit.assert_called_once()
+
+    @patch('src.db.requests._get_connection')
+    def test_hold_seats_exception(self, mock_conn):
+        """Test handling exception when holding seats"""
+        mock_cursor = Mock()
+        mock_cursor.execute.side_effect = Exception("Database error")
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.hold_seats(1, 10, [5], 600)
+
+        # Not the same as every seat taken by someone else
+        self.assertIsNone(result)
+        mock_connection.rollback.assert_called_once()
+
+    @patch('src.db.requests._get_connection')
+    def test_extend_holds(self, mock_conn):
+        """Test extending the holds of a reservation"""
+        mock_cursor = Mock()
+        mock_cursor.rowcount = 3
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        result = requests.extend_holds(10, 600)
+
+        self.assertEqual(result, 3)
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (600, 10))
+
+    @patch('src.db.requests._get_connection')
+    def test_release_all_holds(self, mock_conn):
+        """Test releasing every hold of a reservation"""
+        mock_cursor = Mock()
+        mock_cursor.rowcount = 2
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        result = requests.release_holds(10)
+
+        self.assertEqual(result, 2)
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (10, None, None))
+
+    @patch('src.db.requests._get_connection')
+    def test_sweep_expired_holds(self, mock_conn):
+        """Test the sweeper returns the released seats and expired reservations"""
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = (4, 1)
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.sweep_expired_holds(30)
+
+        self.assertEqual(result, {'holds': 4, 'reservations': 1})
+        mock_connection.commit.assert_called_once()
+
+
 class TestClientRequests(unittest.TestCase):
     """Test client-related database requests"""
 
@@ -243,6 +509,10 @@ class TestClientRequests(unittest.TestCase):
 class TestReservationRequests(unittest.TestCase):
     """Test reservation-related database requests"""
 
+    def setUp(self):
+        # Cached reads would return the previous test's mocked results
+        clear_query_cache()
+
     @patch('src.db.requests._get_connection')
     def test_create_reservation_success(self, mock_conn):
         """Test creating a reservation"""
@@ -294,7 +564,7 @@ class TestReservationRequests(unittest.TestCase):
         result = requests.delete_reservation(10)
 
         self.assertTrue(result)
-        self.assertEqual(mock_cursor.execute.call_count, 2)  # Delete tickets + reservation
+        self.assertEqual(mock_cursor.execute.call_count, 4)  # Release holds + seats, delete tickets + reservation
         mock_connection.commit.assert_called_once()
 
     @patch('src.db.requests._get_connection')
@@ -320,6 +590,108 @@ class TestReservationRequests(unittest.TestCase):
         self.assertTrue(result)  # Default to True
 
 
+class TestCheckoutRequests(unittest.TestCase):
+    """Test the single-transaction checkout"""
+
+    @patch('src.db.requests._get_connection')
+    def test_checkout_success(self, mock_conn):
+        """Test checkout returns reservation, tickets and server total"""
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = (20, [31, 32, 33], 135.00)
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        client = {'email': 'test@example.com', 'firstname': 'John', 'lastname': 'Doe'}
+        result = requests.checkout(1, client, {'Normal': 2, 'Student': 1})
+
+        self.assertEqual(result['reservation_id'], 20)
+        self.assertEqual(result['ticket_ids'], [31, 32, 33])
+        self.assertEqual(result['total'], 135.00)
+        mock_cursor.execute.assert_called_once()
+        mock_connection.commit.assert_called_once()
+
+    @patch('src.db.requests._get_connection')
+    def test_checkout_staff_sale_params(self, mock_conn):
+        """Test staff checkout sends no client and the chosen seats"""
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = (21, [40], 50.00)
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        requests.checkout(1, None, {'Normal': 1, 'Student': 0}, seat_ids=(7,), vendor_id=2)
+
+        params = mock_cursor.execute.call_args[0][1]
+        self.assertEqual(params[0:5], (1, 2, None, None, None))
+        self.assertEqual(params[5].adapted, [{'name': 'Normal', 'quantity': 1}])
+        self.assertEqual(params[6], [7])
+        self.assertEqual(params[7:], (None, False))
+
+    @patch('src.db.requests._get_connection')
+    def test_checkout_allocation_preferences(self, mock_conn):
+        """Test seat preferences are sent when the server allocates the seats"""
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = (22, [41, 42], 100.00)
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        requests.checkout(1, None, {'Normal': 2}, vendor_id=2,
+                          preferences={'sector': 'VIP', 'contiguous': True})
+
+        params = mock_cursor.execute.call_args[0][1]
+        self.assertIsNone(params[6])
+        self.assertEqual(params[7:], ('VIP', True))
+
+    @patch('src.db.requests._get_connection')
+    def test_allocate_seats_success(self, mock_conn):
+        """Test allocated seats are returned as dicts"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [
+            (12, 'S12', 'Standard', Decimal('0.00')),
+            (13, 'S13', 'Standard', Decimal('0.00'))
+        ]
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.allocate_seats(1, 2, 20, {'contiguous': True})
+
+        self.assertEqual([seat['id'] for seat in result], [12, 13])
+        self.assertEqual(result[0]['sector'], 'Standard')
+        params = mock_cursor.execute.call_args[0][1]
+        self.assertEqual(params[:5], (1, 2, 20, None, True))
+        mock_connection.commit.assert_called_once()
+
+    @patch('src.db.requests._get_connection')
+    def test_allocate_seats_not_enough(self, mock_conn):
+        """Test nothing is allocated when the event has too few free seats"""
+        mock_cursor = Mock()
+        mock_cursor.execute.side_effect = Exception("Only 1 seats available for event 1")
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.allocate_seats(1, 2, 20)
+
+        self.assertEqual(result, [])
+        mock_connection.rollback.assert_called_once()
+
+    @patch('src.db.requests._get_connection')
+    def test_checkout_failure(self, mock_conn):
+        """Test a failed checkout is rolled back as a whole"""
+        mock_cursor = Mock()
+        mock_cursor.execute.side_effect = Exception("Not enough seats available for event 1")
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.checkout(1, None, {'Normal': 100}, vendor_id=2)
+
+        self.assertIsNone(result)
+        mock_connection.rollback.assert_called_once()
+        mock_connection.commit.assert_not_called()
+
+
 class TestTicketRequests(unittest.TestCase):
     """Test ticket-related database requests"""
 
@@ -350,11 +722,57 @@ class TestTicketRequests(unittest.TestCase):
         self.assertFalse(result)
         mock_connection.rollback.assert_called_once()
 
+    @patch('src.db.requests._get_connection')
+    def test_add_tickets_success(self, mock_conn):
+        """Test adding several tickets in one statement"""
+        mock_cursor = Mock()
+        mock_cursor.rowcount = 2
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.add_tickets_to_reservation(10, 1, [(5, 'Normal'), (6, 'Student')])
+
+        self.assertTrue(result)
+        mock_cursor.execute.assert_called_once()
+        params = mock_cursor.execute.call_args[0][1]
+        self.assertEqual(params, (1, [5, 6], 10, 1, [5, 6], ['Normal', 'Student']))
+        mock_connection.commit.assert_called_once()
+
+    @patch('src.db.requests._get_connection')
+    def test_add_tickets_missing_seat(self, mock_conn):
+        """Test nothing is kept when one of the seats is not found"""
+        mock_cursor = Mock()
+        mock_cursor.rowcount = 1
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.add_tickets_to_reservation(10, 1, [(5, 'Normal'), (999, 'Normal')])
+
+        self.assertFalse(result)
+        mock_connection.rollback.assert_called_once()
+        mock_connection.commit.assert_not_called()
+
+    @patch('src.db.requests._get_connection')
+    def test_add_tickets_exception(self, mock_conn):
+        """Test handling a seat already booked while adding tickets"""
+        mock_cursor = Mock()
+        mock_cursor.execute.side_effect = Exception("Seat already booked")
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.add_tickets_to_reservation(10, 1, [(5, 'Normal'), (6, 'Normal')])
+
+        self.assertFalse(result)
+        mock_connection.rollback.assert_called_once()
+
     @patch('src.db.requests._get_connection')
     def test_scan_ticket_success(self, mock_conn):
         """Test scanning a valid ticket"""
         mock_cursor = Mock()
-        mock_cursor.fetchone.side_effect = [(1, 'paid'), None]  # Ticket exists and paid, not scanned
+        mock_cursor.fetchone.return_value = ('valid', datetime(2026, 1, 15, 19, 30), 'A')
         mock_connection = Mock()
         mock_connection.cursor.return_value = mock_cursor
         mock_conn.return_value = mock_connection
@@ -362,25 +780,31 @@ class TestTicketRequests(unittest.TestCase):
         result = requests.scan_ticket(1, 2, 'A')
 
         self.assertTrue(result['success'])
+        self.assertEqual(result['outcome'], 'valid')
         self.assertIn('validé', result['message'])
+        # One round trip
+        mock_cursor.execute.assert_called_once()
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (1, 2, 'A', None))
+        mock_connection.commit.assert_called_once()
 
     @patch('src.db.requests._get_connection')
     def test_scan_ticket_invalid(self, mock_conn):
         """Test scanning invalid ticket"""
         mock_cursor = Mock()
-        mock_cursor.fetchone.return_value = None
+        mock_cursor.fetchone.return_value = ('unknown', None, None)
         mock_conn.return_value.cursor.return_value = mock_cursor
 
         result = requests.scan_ticket(999, 2, 'A')
 
         self.assertFalse(result['success'])
+        self.assertEqual(result['outcome'], 'unknown')
         self.assertIn('invalide', result['message'])
 
     @patch('src.db.requests._get_connection')
     def test_scan_ticket_not_paid(self, mock_conn):
         """Test scanning unpaid ticket"""
         mock_cursor = Mock()
-        mock_cursor.fetchone.return_value = (1, 'pending')
+        mock_cursor.fetchone.return_value = ('unpaid', None, None)
         mock_conn.return_value.cursor.return_value = mock_cursor
 
         result = requests.scan_ticket(1, 2, 'A')
@@ -390,15 +814,45 @@ class TestTicketRequests(unittest.TestCase):
 
     @patch('src.db.requests._get_connection')
     def test_scan_ticket_already_scanned(self, mock_conn):
-        """Test scanning already scanned ticket"""
+        """Test scanning already scanned ticket gives the first scan"""
         mock_cursor = Mock()
-        mock_cursor.fetchone.side_effect = [(1, 'paid'), (1,)]  # Exists and already scanned
+        mock_cursor.fetchone.return_value = ('already_scanned', datetime(2026, 1, 15, 19, 30, 5), 'B')
         mock_conn.return_value.cursor.return_value = mock_cursor
 
         result = requests.scan_ticket(1, 2, 'A')
 
         self.assertFalse(result['success'])
         self.assertIn('déjà scanné', result['message'])
+        self.assertIn('19:30:05', result['message'])
+        self.assertEqual(result['door'], 'B')
+
+    @patch('src.db.requests._get_connection')
+    def test_scan_ticket_wrong_event(self, mock_conn):
+        """Test scanning a ticket for another event"""
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = ('wrong_event', None, None)
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        result = requests.scan_ticket(1, 2, 'A', event_id=3)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['outcome'], 'wrong_event')
+        self.assertEqual(mock_cursor.execute.call_args[0][1], (1, 2, 'A', 3))
+
+    @patch('src.db.requests._get_connection')
+    def test_scan_ticket_exception(self, mock_conn):
+        """Test handling exception when scanning"""
+        mock_cursor = Mock()
+        mock_cursor.execute.side_effect = Exception("Database error")
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.scan_ticket(1, 2, 'A')
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['outcome'], 'error')
+        mock_connection.rollback.assert_called_once()
 
 
 class TestPaymentRequests(unittest.TestCase):
@@ -448,6 +902,10 @@ class TestPaymentRequests(unittest.TestCase):
 class TestAdminRequests(unittest.TestCase):
     """Test admin-related database requests"""
 
+    def setUp(self):
+        # Cached reads would return the previous test's mocked results
+        clear_query_cache()
+
     @patch('src.db.requests._get_connection')
     def test_get_all_rooms_names(self, mock_conn):
         """Test fetching all room names"""
@@ -530,6 +988,27 @@ class TestAdminRequests(unittest.TestCase):
         self.assertEqual(mock_cursor.execute.call_count, 3)  # Event + 2 tarifs
         mock_connection.commit.assert_called_once()
 
+    @patch('src.db.requests._get_connection')
+    def test_create_event_general_admission(self, mock_conn):
+        """Test creating a general admission event with its capacity"""
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = (7,)
+        mock_connection = Mock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_conn.return_value = mock_connection
+
+        result = requests.create_event(
+            'Open Air', 3,
+            datetime(2026, 12, 1, 20, 0),
+            datetime(2026, 12, 1, 23, 0),
+            1, 1, [{'name': 'Normal', 'price': 40.00}],
+            general_admission=True, capacity=500
+        )
+
+        self.assertEqual(result, 7)
+        event_params = mock_cursor.execute.call_args_list[0][0][1]
+        self.assertEqual(event_params[-2:], (True, 500))
+
     @patch('src.db.requests._get_connection')
     def test_get_type_of_event_details(self, mock_conn):
         """Test getting event type details"""
@@ -546,6 +1025,33 @@ class TestAdminRequests(unittest.TestCase):
         self.assertFalse(result['is_free'])
         self.assertTrue(result['need_reservation'])
 
+    @patch('src.db.requests._get_connection')
+    def test_get_reference_data(self, mock_conn):
+        """Test reference tables are read in one query"""
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = (
+            [{'id': 1, 'name': 'Concert', 'is_free': False, 'need_reservation': True}],
+            [{'id': 1, 'name': 'ISC Room', 'address': 'Sion'}],
+            [{'id': 3, 'name': 'Full Room'}],
+            [{'id': 7, 'event_id': 2, 'name': 'Normal', 'price': 50}]
+        )
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        result = requests.get_reference_data()
+
+        mock_cursor.execute.assert_called_once()
+        self.assertEqual(result['types'][0]['name'], 'Concert')
+        self.assertEqual(result['configs'][0]['id'], 3)
+        self.assertEqual(result['tarifs'][0]['price'], 50.0)
+        self.assertIsInstance(result['tarifs'][0]['price'], float)
+
+    @patch('src.db.requests._get_connection')
+    def test_get_reference_data_error(self, mock_conn):
+        """Test reference data is None when the query fails"""
+        mock_conn.side_effect = Exception("Database error")
+
+        self.assertIsNone(requests.get_reference_data())
+
     @patch('src.db.requests._get_connection')
     def test_add_staff_member(self, mock_conn):
         """Test adding a staff member"""
@@ -580,7 +1086,7 @@ class TestAdminRequests(unittest.TestCase):
         """Test getting event statistics"""
         mock_cursor = Mock()
         mock_cursor.fetchall.return_value = [
-            (1, 'Concert', datetime(2026, 7, 15, 20, 0), 'on_sale', 50, 30, 100)
+            (1, 'Concert', datetime(2026, 7, 15, 20, 0), 'on_sale', 50, 30, 100, 45, 5, Decimal('2500.00'))
         ]
         mock_conn.return_value.cursor.return_value = mock_cursor
 
@@ -590,6 +1096,13 @@ class TestAdminRequests(unittest.TestCase):
         self.assertEqual(result[0]['tickets_sold'], 50)
         self.assertEqual(result[0]['tickets_scanned'], 30)
         self.assertEqual(result[0]['total_seats'], 100)
+        self.assertEqual(result[0]['seats_available'], 45)
+        self.assertEqual(result[0]['tickets_reserved'], 5)
+        self.assertEqual(result[0]['revenue'], 2500.00)
+        # Read from the pre-aggregated counters, no fan-out join on tickets
+        query = mock_cursor.execute.call_args[0][0]
+        self.assertIn('event_counters', query)
+        self.assertNotIn('DISTINCT', query)
 
     @patch('src.db.requests._get_connection')
     def test_get_all_type_of_event_names(self, mock_conn):
@@ -0,0 +1,166 @@
+"""
+Unit tests for the background database tasks.
+Tests results, errors, coalescing and cancellation in src/qt/db_tasks.py
+"""
+
+import threading
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt6.QtWidgets import QApplication, QWidget
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtTest import QTest
+
+from src.constants import HOLD_SWEEP_INTERVAL_MS, PENDING_RESERVATION_MINUTES
+from src.qt.db_tasks import DbTaskRunner
+from src.qt.hold_sweeper import HoldSweeper
+
+# Create QApplication instance for testing
+app = QApplication.instance()
+if app is None:
+    app = QApplication(sys.argv)
+
+
+def wait_until(condition, timeout=2000):
+    """Process events until condition() is true"""
+    for _ in range(timeout // 10):
+        if condition():
+            return True
+        QTest.qWait(10)
+    return condition()
+
+
+class TestDbTaskRunner(unittest.TestCase):
+    """Test the QThreadPool runner used by the widgets"""
+
+    def setUp(self):
+        self.widget = QWidget()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
+        self.runner = DbTaskRunner(self.widget, pool=self.pool)
+        # Blocks the pool thread until released, so the next tasks stay queued
+        self.gate = threading.Event()
+
+    def tearDown(self):
+        self.gate.set()
+        self.pool.waitForDone()
+        self.widget.deleteLater()
+
+    def blocked(self, value):
+        self.gate.wait(2)
+        return value
+
+    def test_result_on_success(self):
+        """Test the result comes back through succeeded"""
+        results = []
+        self.runner.run(lambda a, b=0: a + b, 2, b=3, on_success=results.append)
+
+        self.assertTrue(wait_until(lambda: results))
+        self.assertEqual(results, [5])
+        self.assertFalse(self.runner.busy)
+
+    def test_error_on_failed(self):
+        """Test an exception comes back through failed"""
+        def boom():
+            raise ValueError("connection lost")
+
+        errors = []
+        results = []
+        self.runner.run(boom, on_success=results.append, on_error=errors.append)
+
+        self.assertTrue(wait_until(lambda: errors))
+        self.assertEqual(errors, ["connection lost"])
+        self.assertEqual(results, [])
+
+    def test_same_call_is_shared(self):
+        """Test the same call with the same key runs once"""
+        calls = []
+        results = []
+
+        def load(event_id):
+            calls.append(event_id)
+            return self.blocked(event_id)
+
+        first = self.runner.run(load, 1, on_success=results.append, key="tarifs")
+        second = self.runner.run(load, 1, on_success=results.append, key="tarifs")
+        self.gate.set()
+
+        self.assertIs(first, second)
+        self.assertTrue(wait_until(lambda: len(results) == 2))
+        self.assertEqual(calls, [1])
+
+    def test_latest_call_wins(self):
+        """Test another call with the same key cancels the queued one"""
+        self.runner.run(self.blocked, "busy")
+        results = []
+        first = self.runner.run(lambda: "first", on_success=results.append, key="search")
+        self.runner.run(lambda: "second", on_success=results.append, key="search")
+        self.gate.set()
+
+        self.assertTrue(wait_until(lambda: results))
+        QTest.qWait(50)
+        self.assertTrue(first.cancelled)
+        self.assertEqual(results, ["second"])
+
+    def test_cancel_drops_result(self):
+        """Test a cancelled running task never calls back"""
+        results = []
+        task = self.runner.run(self.blocked, "late", on_success=results.append, key="stats")
+        wait_until(lambda: self.pool.activeThreadCount() == 1)
+        self.runner.cancel("stats")
+        self.gate.set()
+        self.pool.waitForDone()
+        QTest.qWait(50)
+
+        self.assertTrue(task.cancelled)
+        self.assertEqual(results, [])
+        self.assertFalse(self.runner.busy)
+
+    def test_busy_changed(self):
+        """Test busy is signalled once for overlapping tasks"""
+        states = []
+        self.runner.busy_changed.connect(states.append)
+        self.runner.run(self.blocked, 1)
+        self.runner.run(self.blocked, 2)
+        self.gate.set()
+
+        self.assertTrue(wait_until(lambda: states == [True, False]))
+
+
+
+class TestHoldSweeper(unittest.TestCase):
+    """Test the scheduled sweep of expired holds and pending reservations"""
+
+    def setUp(self):
+        self.widget = QWidget()
+        patcher = patch('src.qt.hold_sweeper.sweep_expired_holds', return_value={'holds': 0, 'reservations': 0})
+        self.mock_sweep = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sweeper = HoldSweeper(self.widget)
+
+    def tearDown(self):
+        self.sweeper.timer.stop()
+        QThreadPool.globalInstance().waitForDone()
+        self.widget.deleteLater()
+
+    def test_sweeps_on_start_then_on_timer(self):
+        """Test a sweep runs right away, then every HOLD_SWEEP_INTERVAL_MS"""
+        self.sweeper.start()
+        self.sweeper.start()
+
+        self.assertTrue(wait_until(lambda: not self.sweeper.db.busy))
+        self.mock_sweep.assert_called_once_with(PENDING_RESERVATION_MINUTES)
+        self.assertTrue(self.sweeper.timer.isActive())
+        self.assertEqual(self.sweeper.timer.interval(), HOLD_SWEEP_INTERVAL_MS)
+
+        self.sweeper.timer.timeout.emit()
+        self.assertTrue(wait_until(lambda: self.mock_sweep.call_count == 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,307 @@
+"""
+Database tests of the SQL functions and triggers (src/db/04_functions.sql, 05_triggers.sql).
+They need the database of the .env file with the schema loaded, and are skipped when it cannot be reached.
+Each test runs in a transaction rolled back at the end, except the ones needing several commits.
+"""
+
+import unittest
+import sys
+import os
+
+import psycopg2
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.db import requests
+from src.db.connection import _connect_kwargs, CONNECTION_OPTIONS
+
+
+def connect():
+    return psycopg2.connect(options=CONNECTION_OPTIONS, connect_timeout=3, **_connect_kwargs())
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Skipped without database, self.cursor runs in a transaction rolled back after each test"""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            cls.connection = connect()
+        except Exception as e:
+            raise unittest.SkipTest(f"database not reachable: {e}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.connection.close()
+
+    def setUp(self):
+        self.cursor = self.connection.cursor()
+
+    def tearDown(self):
+        self.connection.rollback()
+        self.cursor.close()
+
+    def query_one(self, query, params=()):
+        self.cursor.execute(query, params)
+        return self.cursor.fetchone()
+
+    def create_event(self, general_admission=False, capacity=None):
+        """New event on sale tomorrow, in the first configuration of a room, with a 'Normal' tarif at 30.00"""
+        event_id = self.query_one("""
+            INSERT INTO event (type_id, name, start_at, end_at, room_id, config_id, general_admission, capacity)
+            SELECT (SELECT MIN(id) FROM type_of_event), 'Test event', now() + interval '1 day',
+                   now() + interval '1 day 2 hours', sec.room_id, cws.config_id, %s, %s
+            FROM config_with_sector cws
+            JOIN sector sec ON sec.id = cws.sector_id
+            ORDER BY cws.config_id, sec.room_id
+            LIMIT 1
+            RETURNING id
+        """, (general_admission, capacity))[0]
+        self.cursor.execute("INSERT INTO tarif (event_id, name, price) VALUES (%s, 'Normal', 30.00)", (event_id,))
+        return event_id
+
+    def counters(self, event_id):
+        self.cursor.execute("""
+            SELECT seats_total, seats_available, reserved, sold, scanned, revenue
+            FROM event_counters
+            WHERE event_id = %s
+        """, (event_id,))
+        return self.cursor.fetchone()
+
+
+class TestGeneralAdmissionCounters(DatabaseTestCase):
+    """Test event_counters of general admission events (no event_seat rows)"""
+
+    def checkout(self, event_id, quantity):
+        return self.query_one("""
+            SELECT reservation_id, ticket_ids, total
+            FROM checkout(%s, 1, 'test@example.com', 'Test', 'Client', %s::jsonb)
+        """, (event_id, f'[{{"name": "Normal", "quantity": {quantity}}}]'))
+
+    def shards(self, event_id):
+        """(remaining, sold) summed over the capacity shards"""
+        return self.query_one("""
+            SELECT SUM(remaining)::INTEGER, SUM(sold)::INTEGER FROM event_capacity_shard WHERE event_id = %s
+        """, (event_id,))
+
+    def test_counters_row_created(self):
+        """Test a new general admission event starts with its whole capacity available"""
+        event_id = self.create_event(general_admission=True, capacity=100)
+
+        self.assertEqual(self.counters(event_id), (100, 100, 0, 0, 0, 0))
+
+    def test_sales_scans_and_revenue(self):
+        """Test tickets, payments and scans of a general admission event are counted"""
+        event_id = self.create_event(general_admission=True, capacity=100)
+
+        reservation_id, ticket_ids, total = self.checkout(event_id, 3)
+        self.assertEqual(self.counters(event_id)[:4], (100, 97, 3, 0))
+
+        self.cursor.execute("INSERT INTO payment (reservation_id, total, method) VALUES (%s, %s, 'card')",
+                            (reservation_id, total))
+        outcome = self.query_one("SELECT outcome FROM record_ticket_scan(%s, 1, 'A', %s)",
+                                 (ticket_ids[0], event_id))[0]
+
+        self.assertEqual(outcome, 'valid')
+        self.assertEqual(self.counters(event_id), (100, 97, 0, 3, 1, 90))
+
+    def test_cancelled_reservation_gives_places_back(self):
+        """Test cancelling an unpaid reservation makes its places available again"""
+        event_id = self.create_event(general_admission=True, capacity=10)
+        reservation_id = self.checkout(event_id, 2)[0]
+
+        self.cursor.execute("UPDATE reservation SET status = 'cancelled' WHERE id = %s", (reservation_id,))
+
+        self.assertEqual(self.counters(event_id)[:4], (10, 10, 0, 0))
+
+    def test_cancelled_paid_reservation_gives_places_back(self):
+        """Test cancelling a paid reservation gives its places back to the capacity shards"""
+        event_id = self.create_event(general_admission=True, capacity=10)
+        reservation_id, ticket_ids, total = self.checkout(event_id, 2)
+        self.cursor.execute("INSERT INTO payment (reservation_id, total, method) VALUES (%s, %s, 'card')",
+                            (reservation_id, total))
+
+        self.cursor.execute("UPDATE reservation SET status = 'cancelled' WHERE id = %s", (reservation_id,))
+
+        self.assertEqual(self.counters(event_id)[:4], (10, 10, 0, 0))
+        self.assertEqual(self.shards(event_id), (10, 0))
+
+    def test_deleted_reservation_gives_places_back(self):
+        """Test tickets deleted with their reservation (cascade) give back their places"""
+        event_id = self.create_event(general_admission=True, capacity=10)
+        reservation_id = self.checkout(event_id, 3)[0]
+
+        self.cursor.execute("DELETE FROM reservation WHERE id = %s", (reservation_id,))
+
+        self.assertEqual(self.counters(event_id)[:4], (10, 10, 0, 0))
+        self.assertEqual(self.shards(event_id), (10, 0))
+
+    def test_deleted_paid_tickets(self):
+        """Test deleting paid tickets gives back sold places"""
+        event_id = self.create_event(general_admission=True, capacity=10)
+        reservation_id, ticket_ids, total = self.checkout(event_id, 2)
+        self.cursor.execute("INSERT INTO payment (reservation_id, total, method) VALUES (%s, %s, 'card')",
+                            (reservation_id, total))
+
+        self.cursor.execute("DELETE FROM ticket WHERE id = %s", (ticket_ids[0],))
+
+        self.assertEqual(self.counters(event_id)[:4], (10, 9, 0, 1))
+        self.assertEqual(self.shards(event_id), (9, 1))
+
+    def test_expired_pending_reservation_gives_places_back(self):
+        """Test the sweeper expires an abandoned general admission reservation and gives its places back"""
+        event_id = self.create_event(general_admission=True, capacity=10)
+        reservation_id = self.checkout(event_id, 2)[0]
+        self.cursor.execute("UPDATE reservation SET reservation_time = now() - interval '1 hour' WHERE id = %s",
+                            (reservation_id,))
+
+        self.cursor.execute("SELECT expire_pending_reservations(interval '30 minutes')")
+
+        status = self.query_one("SELECT status FROM reservation WHERE id = %s", (reservation_id,))[0]
+        self.assertEqual(status, 'expired')
+        self.assertEqual(self.counters(event_id)[:4], (10, 10, 0, 0))
+        self.assertEqual(self.shards(event_id), (10, 0))
+
+    def test_refresh_matches_triggers(self):
+        """Test refresh_event_counters() recounts general admission events the same way"""
+        event_id = self.create_event(general_admission=True, capacity=50)
+        reservation_id, ticket_ids, total = self.checkout(event_id, 4)
+        self.cursor.execute("INSERT INTO payment (reservation_id, total, method) VALUES (%s, %s, 'card')",
+                            (reservation_id, total))
+        self.checkout(event_id, 1)
+        counted = self.counters(event_id)
+
+        self.cursor.execute("SELECT refresh_event_counters()")
+
+        self.assertEqual(self.counters(event_id), counted)
+
+
+class TestSeatCounters(DatabaseTestCase):
+    """Test event_counters of events with seats"""
+
+    def assert_totals(self, event_id):
+        total, available, reserved, sold = self.counters(event_id)[:4]
+        self.assertEqual(available + reserved + sold, total)
+
+    def test_held_seats_are_reserved(self):
+        """Test held seats are counted as reserved, then back to available when released"""
+        event_id = self.create_event()
+        total = self.counters(event_id)[0]
+        self.cursor.execute("SELECT seat_id FROM event_seat WHERE event_id = %s ORDER BY seat_id LIMIT 2",
+                            (event_id,))
+        seat_ids = [row[0] for row in self.cursor.fetchall()]
+
+        self.cursor.execute("""
+            UPDATE event_seat SET status = 'HOLD', hold_expires_at = now() + interval '10 minutes'
+            WHERE event_id = %s AND seat_id = ANY(%s)
+        """, (event_id, seat_ids))
+        self.assertEqual(self.counters(event_id)[:4], (total, total - 2, 2, 0))
+        self.assert_totals(event_id)
+
+        self.cursor.execute("""
+            UPDATE event_seat SET status = 'AVAILABLE', hold_expires_at = NULL
+            WHERE event_id = %s AND seat_id = %s
+        """, (event_id, seat_ids[0]))
+        self.assertEqual(self.counters(event_id)[:4], (total, total - 1, 1, 0))
+
+        counted = self.counters(event_id)
+        self.cursor.execute("SELECT refresh_event_counters()")
+        self.assertEqual(self.counters(event_id), counted)
+
+        self.cursor.execute("DELETE FROM event_seat WHERE event_id = %s", (event_id,))
+        self.assertEqual(self.counters(event_id)[:4], (0, 0, 0, 0))
+
+
+class TestRoomLayoutVersion(DatabaseTestCase):
+    """Test room.layout_version follows the seat map geometry of the room"""
+
+    def layout_version(self, room_id):
+        return self.query_one("SELECT layout_version FROM room WHERE id = %s", (room_id,))[0]
+
+    def test_moved_seat_bumps_version(self):
+        """Test moving a seat bumps the version of its room, renaming it does not"""
+        seat_id, room_id = self.query_one("SELECT id, room_id FROM seat ORDER BY id LIMIT 1")
+        version = self.layout_version(room_id)
+
+        self.cursor.execute("UPDATE seat SET name = name WHERE id = %s", (seat_id,))
+        self.assertEqual(self.layout_version(room_id), version)
+
+        self.cursor.execute("UPDATE seat SET pos_x = 3 WHERE id = %s", (seat_id,))
+        self.assertEqual(self.layout_version(room_id), version + 1)
+
+    def test_moved_sector_bumps_version(self):
+        """Test placing a sector in a configuration bumps the version of its room"""
+        config_id, sector_id, room_id = self.query_one("""
+            SELECT cws.config_id, cws.sector_id, sec.room_id
+            FROM config_with_sector cws
+            JOIN sector sec ON sec.id = cws.sector_id
+            LIMIT 1
+        """)
+        version = self.layout_version(room_id)
+
+        self.cursor.execute("UPDATE config_with_sector SET grid_row = 9 WHERE config_id = %s AND sector_id = %s",
+                            (config_id, sector_id))
+
+        self.assertEqual(self.layout_version(room_id), version + 1)
+
+
+class TestSeatChangesOrder(DatabaseTestCase):
+    """Test get_seat_changes_since with transactions committing out of order (committed event, deleted after)"""
+
+    def setUp(self):
+        super().setUp()
+        self.event_id = self.create_event()
+        self.cursor.execute("SELECT seat_id FROM event_seat WHERE event_id = %s ORDER BY seat_id LIMIT 2",
+                            (self.event_id,))
+        self.first_seat, self.second_seat = [row[0] for row in self.cursor.fetchall()]
+        self.cursor.execute("""
+            UPDATE event_seat SET status = 'HOLD', hold_expires_at = now() + interval '10 minutes'
+            WHERE event_id = %s AND seat_id IN (%s, %s)
+        """, (self.event_id, self.first_seat, self.second_seat))
+        self.connection.commit()
+
+        self.slow = connect()
+        self.fast = connect()
+
+    def tearDown(self):
+        self.slow.close()
+        self.fast.close()
+        self.connection.rollback()
+        self.cursor.execute("DELETE FROM event WHERE id = %s", (self.event_id,))
+        self.connection.commit()
+        super().tearDown()
+
+    def extend_hold(self, connection, seat_id):
+        """Hold extended: the version changes, the status does not (a sale would wait on event_counters)"""
+        cursor = connection.cursor()
+        cursor.execute("""
+            UPDATE event_seat SET hold_expires_at = now() + interval '20 minutes'
+            WHERE event_id = %s AND seat_id = %s
+        """, (self.event_id, seat_id))
+        cursor.close()
+
+    def test_slow_commit_is_not_skipped(self):
+        """Test a change committed after a newer one is returned by the next poll"""
+        seats, watermark = requests.get_seats_with_status_for_event(self.event_id, with_watermark=True)
+
+        # The slow transaction changes its seat first, the fast one commits first
+        self.extend_hold(self.slow, self.first_seat)
+        self.extend_hold(self.fast, self.second_seat)
+        self.fast.commit()
+
+        changes, watermark = requests.get_seat_changes_since(self.event_id, watermark)
+        self.assertEqual([change['id'] for change in changes], [self.second_seat])
+
+        self.slow.commit()
+
+        changes, watermark = requests.get_seat_changes_since(self.event_id, watermark)
+        self.assertIn(self.first_seat, [change['id'] for change in changes])
+
+        # Both finished: nothing left to send again
+        changes, watermark = requests.get_seat_changes_since(self.event_id, watermark)
+        self.assertEqual(changes, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
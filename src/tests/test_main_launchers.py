@@ -23,34 +23,40 @@ if app is None:
     app = QApplication(sys.argv)
 
 
-def mock_loadui_side_effect(ui_file, widget):
-    """Mock loadUi to set up basic UI structure"""
+def mock_load_ui_side_effect(widget):
+    """Mock load_main_window_ui to set up basic UI structure"""
     # Create a central widget with layout
     widget.centralwidget = QWidget()
     widget.centralwidget.setLayout(QVBoxLayout())
     return None
 
 
+def make_screen(*args, **kwargs):
+    """Screens are imported when first shown, the mocked ones are plain widgets the ScreenStack can hold"""
+    return QWidget()
+
+
 class TestTicketBesterMain(unittest.TestCase):
     """Test main.py launcher"""
 
-    @patch('src.qt.home_widget.HomeWidget')
-    @patch('src.main.loadUi')
-    def test_main_window_initialization(self, mock_loadui, mock_home_widget):
+    @patch('src.qt.home_widget.HomeWidget', side_effect=make_screen)
+    @patch('src.main.load_main_window_ui')
+    def test_main_window_initialization(self, mock_load_ui, mock_home_widget):
         """Test main window initializes correctly"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main import TicketBester
         window = TicketBester()
 
         self.assertIsNotNone(window)
-        self.assertEqual(window.windowTitle(), "TicketBester")
+        # Starts on the launcher page
+        self.assertEqual(window.windowTitle(), "TicketBester - Launcher")
 
-    @patch('src.qt.home_widget.HomeWidget')
-    @patch('src.main.loadUi')
-    def test_clear_central_widget(self, mock_loadui, mock_home_widget):
+    @patch('src.qt.home_widget.HomeWidget', side_effect=make_screen)
+    @patch('src.main.load_main_window_ui')
+    def test_clear_central_widget(self, mock_load_ui, mock_home_widget):
         """Test clearing central widget"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main import TicketBester
         window = TicketBester()
@@ -61,11 +67,11 @@ class TestTicketBesterMain(unittest.TestCase):
 
         self.assertIsNone(window.current_widget)
 
-    @patch('src.qt.home_widget.HomeWidget')
-    @patch('src.main.loadUi')
-    def test_set_staff_info(self, mock_loadui, mock_home_widget):
+    @patch('src.qt.home_widget.HomeWidget', side_effect=make_screen)
+    @patch('src.main.load_main_window_ui')
+    def test_set_staff_info(self, mock_load_ui, mock_home_widget):
         """Test setting staff information"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main import TicketBester
         window = TicketBester()
@@ -74,23 +80,23 @@ class TestTicketBesterMain(unittest.TestCase):
         self.assertEqual(window.staff_id, 5)
         self.assertEqual(window.staff_name, "Test Staff")
 
-    @patch('src.qt.home_widget.HomeWidget')
-    @patch('src.main.loadUi')
-    def test_show_home_widget(self, mock_loadui, mock_home_widget):
+    @patch('src.qt.home_widget.HomeWidget', side_effect=make_screen)
+    @patch('src.main.load_main_window_ui')
+    def test_show_home_widget(self, mock_load_ui, mock_home_widget):
         """Test showing home widget"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main import TicketBester
         window = TicketBester()
         # It's already shown in __init__, so just verify
         self.assertIsNotNone(window.current_widget)
 
-    @patch('src.qt.admin_home_widget.AdminHomeWidget')
-    @patch('src.qt.home_widget.HomeWidget')
-    @patch('src.main.loadUi')
-    def test_show_admin_home_widget(self, mock_loadui, mock_home_widget, mock_admin_widget):
+    @patch('src.qt.admin_home_widget.AdminHomeWidget', side_effect=make_screen)
+    @patch('src.qt.home_widget.HomeWidget', side_effect=make_screen)
+    @patch('src.main.load_main_window_ui')
+    def test_show_admin_home_widget(self, mock_load_ui, mock_home_widget, mock_admin_widget):
         """Test showing admin home widget"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main import TicketBester
         window = TicketBester()
@@ -99,12 +105,12 @@ class TestTicketBesterMain(unittest.TestCase):
         self.assertIsNotNone(window.current_widget)
         self.assertEqual(window.windowTitle(), "TicketBester - Administration")
 
-    @patch('src.qt.staff_home_widget.StaffHomeWidget')
-    @patch('src.qt.home_widget.HomeWidget')
-    @patch('src.main.loadUi')
-    def test_show_staff_home_widget(self, mock_loadui, mock_home_widget, mock_staff_widget):
+    @patch('src.qt.staff_home_widget.StaffHomeWidget', side_effect=make_screen)
+    @patch('src.qt.home_widget.HomeWidget', side_effect=make_screen)
+    @patch('src.main.load_main_window_ui')
+    def test_show_staff_home_widget(self, mock_load_ui, mock_home_widget, mock_staff_widget):
         """Test showing staff home widget"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main import TicketBester
         window = TicketBester()
@@ -117,11 +123,11 @@ class TestTicketBesterMain(unittest.TestCase):
 class TestTicketBesterClient(unittest.TestCase):
     """Test main_client.py launcher"""
 
-    @patch('src.qt.home_widget.HomeWidget')
-    @patch('src.main_client.loadUi')
-    def test_client_window_initialization(self, mock_loadui, mock_home_widget):
+    @patch('src.qt.home_widget.HomeWidget', side_effect=make_screen)
+    @patch('src.main_client.load_main_window_ui')
+    def test_client_window_initialization(self, mock_load_ui, mock_home_widget):
         """Test client window initializes correctly"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main_client import TicketBester
         window = TicketBester()
@@ -129,12 +135,12 @@ class TestTicketBesterClient(unittest.TestCase):
         self.assertIsNotNone(window)
         self.assertEqual(window.windowTitle(), "TicketBester")
 
-    @patch('src.qt.reservation_widget.ReservationWidget')
-    @patch('src.qt.home_widget.HomeWidget')
-    @patch('src.main_client.loadUi')
-    def test_show_reservation_widget(self, mock_loadui, mock_home_widget, mock_reservation_widget):
+    @patch('src.qt.reservation_widget.ReservationWidget', side_effect=make_screen)
+    @patch('src.qt.home_widget.HomeWidget', side_effect=make_screen)
+    @patch('src.main_client.load_main_window_ui')
+    def test_show_reservation_widget(self, mock_load_ui, mock_home_widget, mock_reservation_widget):
         """Test showing reservation widget in client mode"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main_client import TicketBester
         window = TicketBester()
@@ -147,11 +153,11 @@ class TestTicketBesterClient(unittest.TestCase):
 class TestTicketBesterAdmin(unittest.TestCase):
     """Test main_admin.py launcher"""
 
-    @patch('src.qt.admin_home_widget.AdminHomeWidget')
-    @patch('src.main_admin.loadUi')
-    def test_admin_window_initialization(self, mock_loadui, mock_admin_widget):
+    @patch('src.qt.admin_home_widget.AdminHomeWidget', side_effect=make_screen)
+    @patch('src.main_admin.load_main_window_ui')
+    def test_admin_window_initialization(self, mock_load_ui, mock_admin_widget):
         """Test admin window initializes correctly"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main_admin import TicketBesterAdmin
         window = TicketBesterAdmin()
@@ -159,12 +165,12 @@ class TestTicketBesterAdmin(unittest.TestCase):
         self.assertIsNotNone(window)
         self.assertEqual(window.windowTitle(), "TicketBester - Administration")
 
-    @patch('src.qt.admin_new_event_widget.AdminNewEventWidget')
-    @patch('src.qt.admin_home_widget.AdminHomeWidget')
-    @patch('src.main_admin.loadUi')
-    def test_show_admin_new_event_widget(self, mock_loadui, mock_admin_widget, mock_new_event_widget):
+    @patch('src.qt.admin_new_event_widget.AdminNewEventWidget', side_effect=make_screen)
+    @patch('src.qt.admin_home_widget.AdminHomeWidget', side_effect=make_screen)
+    @patch('src.main_admin.load_main_window_ui')
+    def test_show_admin_new_event_widget(self, mock_load_ui, mock_admin_widget, mock_new_event_widget):
         """Test showing new event widget"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main_admin import TicketBesterAdmin
         window = TicketBesterAdmin()
@@ -173,12 +179,12 @@ class TestTicketBesterAdmin(unittest.TestCase):
         self.assertIsNotNone(window.current_widget)
         self.assertEqual(window.windowTitle(), "TicketBester - Nouvel événement")
 
-    @patch('src.qt.admin_new_staff_widget.AdminNewStaffWidget')
-    @patch('src.qt.admin_home_widget.AdminHomeWidget')
-    @patch('src.main_admin.loadUi')
-    def test_show_admin_new_staff_widget(self, mock_loadui, mock_admin_widget, mock_new_staff_widget):
+    @patch('src.qt.admin_new_staff_widget.AdminNewStaffWidget', side_effect=make_screen)
+    @patch('src.qt.admin_home_widget.AdminHomeWidget', side_effect=make_screen)
+    @patch('src.main_admin.load_main_window_ui')
+    def test_show_admin_new_staff_widget(self, mock_load_ui, mock_admin_widget, mock_new_staff_widget):
         """Test showing new staff widget"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main_admin import TicketBesterAdmin
         window = TicketBesterAdmin()
@@ -191,11 +197,11 @@ class TestTicketBesterAdmin(unittest.TestCase):
 class TestTicketBesterStaff(unittest.TestCase):
     """Test main_staff.py launcher"""
 
-    @patch('src.qt.staff_home_widget.StaffHomeWidget')
-    @patch('src.main_staff.loadUi')
-    def test_staff_window_initialization(self, mock_loadui, mock_staff_widget):
+    @patch('src.qt.staff_home_widget.StaffHomeWidget', side_effect=make_screen)
+    @patch('src.main_staff.load_main_window_ui')
+    def test_staff_window_initialization(self, mock_load_ui, mock_staff_widget):
         """Test staff window initializes correctly"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main_staff import TicketBesterStaff
         window = TicketBesterStaff()
@@ -205,11 +211,11 @@ class TestTicketBesterStaff(unittest.TestCase):
         self.assertIsNone(window.staff_id)
         self.assertIsNone(window.staff_name)
 
-    @patch('src.qt.staff_home_widget.StaffHomeWidget')
-    @patch('src.main_staff.loadUi')
-    def test_set_staff_info(self, mock_loadui, mock_staff_widget):
+    @patch('src.qt.staff_home_widget.StaffHomeWidget', side_effect=make_screen)
+    @patch('src.main_staff.load_main_window_ui')
+    def test_set_staff_info(self, mock_load_ui, mock_staff_widget):
         """Test setting staff info in staff mode"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main_staff import TicketBesterStaff
         window = TicketBesterStaff()
@@ -218,12 +224,12 @@ class TestTicketBesterStaff(unittest.TestCase):
         self.assertEqual(window.staff_id, 3)
         self.assertEqual(window.staff_name, "Staff Member")
 
-    @patch('src.qt.staff_sell_widget.StaffSellWidget')
-    @patch('src.qt.staff_home_widget.StaffHomeWidget')
-    @patch('src.main_staff.loadUi')
-    def test_show_staff_sell_widget(self, mock_loadui, mock_staff_widget, mock_sell_widget):
+    @patch('src.qt.staff_sell_widget.StaffSellWidget', side_effect=make_screen)
+    @patch('src.qt.staff_home_widget.StaffHomeWidget', side_effect=make_screen)
+    @patch('src.main_staff.load_main_window_ui')
+    def test_show_staff_sell_widget(self, mock_load_ui, mock_staff_widget, mock_sell_widget):
         """Test showing staff sell widget"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main_staff import TicketBesterStaff
         window = TicketBesterStaff()
@@ -232,12 +238,12 @@ class TestTicketBesterStaff(unittest.TestCase):
         self.assertIsNotNone(window.current_widget)
         self.assertEqual(window.windowTitle(), "TicketBester - Vente de billets")
 
-    @patch('src.qt.staff_scan_widget.StaffScanWidget')
-    @patch('src.qt.staff_home_widget.StaffHomeWidget')
-    @patch('src.main_staff.loadUi')
-    def test_show_staff_scan_widget(self, mock_loadui, mock_staff_widget, mock_scan_widget):
+    @patch('src.qt.staff_scan_widget.StaffScanWidget', side_effect=make_screen)
+    @patch('src.qt.staff_home_widget.StaffHomeWidget', side_effect=make_screen)
+    @patch('src.main_staff.load_main_window_ui')
+    def test_show_staff_scan_widget(self, mock_load_ui, mock_staff_widget, mock_scan_widget):
         """Test showing staff scan widget"""
-        mock_loadui.side_effect = mock_loadui_side_effect
+        mock_load_ui.side_effect = mock_load_ui_side_effect
 
         from src.main_staff import TicketBesterStaff
         window = TicketBesterStaff()
@@ -247,6 +253,41 @@ class TestTicketBesterStaff(unittest.TestCase):
         self.assertEqual(window.windowTitle(), "TicketBester - Scanner les billets")
 
 
+class TestStartupProfile(unittest.TestCase):
+    """Test the --startup-profile flag of the launchers"""
+
+    def run_main(self, argv):
+        from src import main_staff
+        with patch.object(sys, 'argv', argv), \
+                patch('src.main_staff.QApplication') as mock_app, \
+                patch('src.main_staff.load_main_window_ui', side_effect=mock_load_ui_side_effect), \
+                patch('src.qt.staff_home_widget.StaffHomeWidget', side_effect=make_screen), \
+                patch('src.main_staff.StartupProfiler') as mock_profiler, \
+                patch('src.main_staff.start_live_updates_later') as mock_live_updates, \
+                patch('src.main_staff.start_hold_sweeper_later') as mock_sweeper:
+            mock_app.return_value.exec.return_value = 0
+            with self.assertRaises(SystemExit):
+                main_staff.main()
+        return mock_profiler, mock_live_updates, mock_sweeper
+
+    def test_profile_flag(self):
+        """Test the profiled launch reports its times and starts no database background work"""
+        mock_profiler, mock_live_updates, mock_sweeper = self.run_main(["main_staff.py", "--startup-profile"])
+
+        mock_profiler.assert_called_once()
+        self.assertEqual(mock_profiler.call_args[0][0], "main_staff")
+        mock_live_updates.assert_not_called()
+        mock_sweeper.assert_not_called()
+
+    def test_normal_launch(self):
+        """Test a normal launch starts the live updates and the hold sweeper, without profiler"""
+        mock_profiler, mock_live_updates, mock_sweeper = self.run_main(["main_staff.py"])
+
+        mock_profiler.assert_not_called()
+        mock_live_updates.assert_called_once()
+        mock_sweeper.assert_called_once()
+
+
 class TestConstants(unittest.TestCase):
     """Test constants.py values"""
 
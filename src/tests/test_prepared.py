@@ -0,0 +1,144 @@
+"""
+Unit tests for the prepared statements of the hot queries.
+Tests PREPARE once per connection, EXECUTE by name and the ad-hoc switch in src/db/prepared.py
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import psycopg2.errors
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.db import requests
+from src.db.prepared import PreparedStatement, execute_prepared, set_prepared_statements, \
+    prepared_statements_enabled
+
+
+def make_cursor(connection):
+    cursor = Mock()
+    cursor.connection = connection
+    return cursor
+
+
+class TestPreparedStatement(unittest.TestCase):
+    """Test the PREPARE / EXECUTE statements built from a query"""
+
+    def test_placeholders(self):
+        """Test %s placeholders become $1, $2... and EXECUTE takes the parameters"""
+        statement = PreparedStatement("pay", "INSERT INTO payment (reservation_id, total) VALUES (%s, %s)")
+
+        self.assertEqual(statement.prepare_sql, "PREPARE pay AS INSERT INTO payment (reservation_id, total) VALUES ($1, $2)")
+        self.assertEqual(statement.execute_sql, "EXECUTE pay(%s, %s)")
+
+    def test_no_parameters(self):
+        statement = PreparedStatement("now", "SELECT now()")
+
+        self.assertEqual(statement.execute_sql, "EXECUTE now")
+
+
+class TestExecutePrepared(unittest.TestCase):
+    """Test statements are prepared once per physical connection"""
+
+    def setUp(self):
+        self.enabled = prepared_statements_enabled()
+        set_prepared_statements(True)
+        self.statement = PreparedStatement("seats", "SELECT * FROM event_seat WHERE event_id = %s")
+
+    def tearDown(self):
+        set_prepared_statements(self.enabled)
+
+    def test_prepared_once_per_connection(self):
+        """Test the second call on a connection only runs EXECUTE"""
+        connection = Mock()
+        first, second = make_cursor(connection), make_cursor(connection)
+
+        execute_prepared(first, self.statement, (1,))
+        execute_prepared(second, self.statement, (2,))
+
+        connection.cursor.return_value.execute.assert_called_once_with(self.statement.prepare_sql)
+        first.execute.assert_called_once_with("EXECUTE seats(%s)", (1,))
+        second.execute.assert_called_once_with("EXECUTE seats(%s)", (2,))
+
+    def test_new_connection_prepares_again(self):
+        """Test another physical connection gets its own PREPARE"""
+        first, second = Mock(), Mock()
+
+        execute_prepared(make_cursor(first), self.statement, (1,))
+        execute_prepared(make_cursor(second), self.statement, (1,))
+
+        first.cursor.return_value.execute.assert_called_once()
+        second.cursor.return_value.execute.assert_called_once()
+
+    def test_failed_prepare_is_retried(self):
+        """Test a statement whose PREPARE failed is prepared on the next call"""
+        connection = Mock()
+        connection.cursor.return_value.execute.side_effect = [Exception("connection lost"), None]
+
+        with self.assertRaises(Exception):
+            execute_prepared(make_cursor(connection), self.statement, (1,))
+        execute_prepared(make_cursor(connection), self.statement, (1,))
+
+        self.assertEqual(connection.cursor.return_value.execute.call_count, 2)
+
+    def test_lost_statement_is_prepared_again(self):
+        """Test a session that lost its statements prepares them again"""
+        connection = Mock()
+        cursor = make_cursor(connection)
+        cursor.execute.side_effect = [psycopg2.errors.InvalidSqlStatementName(), None]
+
+        with self.assertRaises(psycopg2.errors.InvalidSqlStatementName):
+            execute_prepared(cursor, self.statement, (1,))
+        execute_prepared(cursor, self.statement, (1,))
+
+        self.assertEqual(connection.cursor.return_value.execute.call_count, 2)
+
+    def test_switch_off_runs_plain_query(self):
+        """Test the ad-hoc mode sends the query itself, without PREPARE"""
+        set_prepared_statements(False)
+        connection = Mock()
+        cursor = make_cursor(connection)
+
+        execute_prepared(cursor, self.statement, (1,))
+
+        cursor.execute.assert_called_once_with(self.statement.query, (1,))
+        connection.cursor.assert_not_called()
+
+
+class TestHotRequests(unittest.TestCase):
+    """Test the hot requests of requests.py run their prepared statement"""
+
+    def setUp(self):
+        self.enabled = prepared_statements_enabled()
+        set_prepared_statements(True)
+
+    def tearDown(self):
+        set_prepared_statements(self.enabled)
+
+    @patch('src.db.requests._get_connection')
+    def test_scan_ticket_executes_by_name(self, mock_conn):
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = ('unknown', None, None)
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        requests.scan_ticket(1, 2, 'A')
+
+        self.assertEqual(mock_cursor.execute.call_args[0][0], "EXECUTE scan_ticket(%s, %s, %s, %s)")
+        self.assertIn("record_ticket_scan($1, $2, $3, $4)", requests.SCAN_TICKET.prepare_sql)
+
+    @patch('src.db.requests._get_connection')
+    def test_create_payment_executes_by_name(self, mock_conn):
+        mock_cursor = Mock()
+        mock_cursor.fetchone.return_value = (1,)
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        requests.create_payment(10, 100.50, 'card')
+
+        mock_cursor.execute.assert_called_once_with("EXECUTE create_payment(%s, %s, %s)", (10, 100.50, 'card'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Unit tests for the query result cache.
+Tests hits, expiry, eviction, invalidation and statistics in src/db/query_cache.py
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.db import requests
+from src.db.query_cache import cached, dont_cache, clear_query_cache, get_query_cache_stats
+
+
+class TestCachedDecorator(unittest.TestCase):
+    """Test the @cached decorator on a stand-in read function"""
+
+    def setUp(self):
+        self.query = Mock(side_effect=lambda event_id: [{'event_id': event_id}])
+
+        @cached(ttl=60, maxsize=2)
+        def read(event_id):
+            return self.query(event_id)
+
+        self.read = read
+
+    def test_hit_and_miss(self):
+        """Test the same arguments are only queried once"""
+        self.read(1)
+        self.read(1)
+        self.read(2)
+
+        self.assertEqual(self.query.call_count, 2)
+        stats = self.read.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+    def test_results_are_copies(self):
+        """Test changing a returned result does not change the cache"""
+        self.read(1)[0]['event_id'] = 99
+
+        self.assertEqual(self.read(1), [{'event_id': 1}])
+
+    @patch('src.db.query_cache.time.monotonic')
+    def test_expired_result_is_queried(self, mock_time):
+        """Test a result older than ttl is queried again"""
+        mock_time.return_value = 100.0
+        self.read(1)
+        mock_time.return_value = 161.0
+        self.read(1)
+
+        self.assertEqual(self.query.call_count, 2)
+        self.assertEqual(self.read.cache.get_stats()['expirations'], 1)
+
+    def test_least_recently_used_is_evicted(self):
+        """Test maxsize keeps the most recently used results"""
+        self.read(1)
+        self.read(2)
+        self.read(1)
+        self.read(3)  # evicts 2
+        self.read(1)
+        self.read(2)
+
+        self.assertEqual([c.args[0] for c in self.query.call_args_list], [1, 2, 3, 2])
+        self.assertEqual(self.read.cache.get_stats()['evictions'], 2)
+
+    def test_invalidate_one_key(self):
+        """Test invalidate only drops the given arguments"""
+        self.read(1)
+        self.read(2)
+        self.read.invalidate(1)
+        self.read(1)
+        self.read(2)
+
+        self.assertEqual([c.args[0] for c in self.query.call_args_list], [1, 2, 1])
+
+    def test_failed_call_is_not_cached(self):
+        """Test a function calling dont_cache() is queried again next time"""
+        def failing(event_id):
+            dont_cache()
+            return []
+        self.query.side_effect = failing
+
+        self.read(1)
+        self.read(1)
+
+        self.assertEqual(self.query.call_count, 2)
+        self.assertEqual(self.read.cache.get_stats()['size'], 0)
+
+
+class TestRequestsCache(unittest.TestCase):
+    """Test the cached read functions of requests.py"""
+
+    def setUp(self):
+        clear_query_cache()
+
+    def tearDown(self):
+        clear_query_cache()
+
+    @patch('src.db.requests._get_connection')
+    def test_event_reads_are_cached(self, mock_conn):
+        """Test tarifs of an event are read once"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [(1, 'Normal', 50.0)]
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        hits = get_query_cache_stats()['get_tarifs_for_event']['hits']
+        requests.get_tarifs_for_event(1)
+        result = requests.get_tarifs_for_event(1)
+
+        self.assertEqual(result[0]['price'], 50.0)
+        mock_cursor.execute.assert_called_once()
+        self.assertEqual(get_query_cache_stats()['get_tarifs_for_event']['hits'] - hits, 1)
+
+    @patch('src.db.requests._get_connection')
+    def test_errors_are_not_cached(self, mock_conn):
+        """Test the default result of a failed read is not kept"""
+        mock_conn.side_effect = Exception("Database error")
+        self.assertEqual(requests.get_tarifs_for_event(1), [])
+
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [(1, 'Normal', 50.0)]
+        mock_conn.side_effect = None
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        self.assertEqual(len(requests.get_tarifs_for_event(1)), 1)
+
+    @patch('src.db.requests._get_connection')
+    def test_create_event_invalidates_event_list(self, mock_conn):
+        """Test creating an event drops the cached upcoming events"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchone.return_value = (7,)
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        misses = get_query_cache_stats()['get_all_events']['misses']
+        requests.get_all_events()
+        requests.create_event('Jazz', 1, None, None, 1, 1, [])
+        requests.get_all_events()
+
+        self.assertEqual(get_query_cache_stats()['get_all_events']['misses'] - misses, 2)
+
+    @patch('src.db.requests._get_connection')
+    def test_add_staff_invalidates_staff_list(self, mock_conn):
+        """Test adding a staff member drops the cached staff list"""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.return_value = [(2, 'Alice')]
+        mock_cursor.fetchone.return_value = (3,)
+        mock_conn.return_value.cursor.return_value = mock_cursor
+
+        requests.get_all_staff()
+        requests.add_staff_member('Bob')
+        mock_cursor.fetchall.return_value = [(2, 'Alice'), (3, 'Bob')]
+
+        self.assertEqual(len(requests.get_all_staff()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Unit tests for the reference data cache.
+Tests lookups, expiry, invalidation and the disk copy in src/db/reference_cache.py
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.db import reference_cache
+
+
+def make_reference_data():
+    return {
+        'types': [{'id': 1, 'name': 'Concert', 'is_free': False, 'need_reservation': True},
+                  {'id': 2, 'name': 'Exposition', 'is_free': True, 'need_reservation': False}],
+        'rooms': [{'id': 1, 'name': 'ISC Room', 'address': 'Sion'}],
+        'configs': [{'id': 3, 'name': 'Balcony'}, {'id': 1, 'name': 'Full Room'}],
+        'tarifs': [{'id': 1, 'event_id': 1, 'name': 'Normal', 'price': 50.0},
+                   {'id': 2, 'event_id': 1, 'name': 'Student', 'price': 35.0}],
+    }
+
+
+class TestReferenceCache(unittest.TestCase):
+    """Test the process-wide reference data cache"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.cache_dir, "reference.json")
+        for name, value in (('CACHE_DIR', self.cache_dir), ('CACHE_FILE', self.cache_file)):
+            patcher = patch.object(reference_cache, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        patcher = patch.object(reference_cache, 'get_reference_data', side_effect=make_reference_data)
+        self.mock_load = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        reference_cache._cache = None
+
+    def tearDown(self):
+        reference_cache._cache = None
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_lookups_use_one_query(self):
+        """Test names, ids and rows are all served from a single load"""
+        self.assertEqual(reference_cache.get_type_names(), ['Concert', 'Exposition'])
+        self.assertEqual(reference_cache.get_room_names(), ['ISC Room'])
+        self.assertEqual(reference_cache.get_config_names(), ['Balcony', 'Full Room'])
+        self.assertEqual(reference_cache.get_type_id('Exposition'), 2)
+        self.assertEqual(reference_cache.get_room_id('ISC Room'), 1)
+        self.assertEqual(reference_cache.get_config_id('Full Room'), 1)
+        self.assertIsNone(reference_cache.get_config_id('Unknown'))
+        self.assertTrue(reference_cache.get_type_details('Exposition')['is_free'])
+        self.assertEqual(reference_cache.get_room(1)['address'], 'Sion')
+
+        self.assertEqual(self.mock_load.call_count, 1)
+
+    def test_expired_data_is_reloaded(self):
+        """Test the data is loaded again once REFERENCE_CACHE_SECONDS have passed"""
+        reference_cache.get_type_names()
+        reference_cache._loaded_at -= reference_cache.REFERENCE_CACHE_SECONDS + 1
+
+        reference_cache.get_type_names()
+
+        self.assertEqual(self.mock_load.call_count, 2)
+
+    def test_failed_reload_keeps_data(self):
+        """Test the last data is kept when the database can't be reached"""
+        reference_cache.get_type_names()
+        reference_cache._loaded_at -= reference_cache.REFERENCE_CACHE_SECONDS + 1
+        self.mock_load.side_effect = None
+        self.mock_load.return_value = None
+
+        self.assertEqual(reference_cache.get_room_id('ISC Room'), 1)
+
+    def test_invalidate(self):
+        """Test invalidation drops the memory and disk copies"""
+        reference_cache.get_type_names()
+        self.assertTrue(os.path.exists(self.cache_file))
+
+        reference_cache.invalidate_reference_cache()
+        reference_cache.get_type_names()
+
+        self.assertEqual(self.mock_load.call_count, 2)
+
+    def test_cold_start_uses_disk_copy(self):
+        """Test a new process reads the disk copy instead of querying"""
+        reference_cache.get_type_names()
+        reference_cache._cache = None
+
+        self.assertEqual(reference_cache.get_config_id('Balcony'), 3)
+        self.assertEqual(self.mock_load.call_count, 1)
+
+    def test_old_disk_copy_is_ignored(self):
+        """Test a disk copy older than REFERENCE_DISK_CACHE_SECONDS is not used"""
+        with open(self.cache_file, "w", encoding="utf-8") as f:
+            json.dump({'format': reference_cache.REFERENCE_FORMAT,
+                       'saved_at': time.time() - reference_cache.REFERENCE_DISK_CACHE_SECONDS - 1,
+                       'data': make_reference_data()}, f)
+
+        reference_cache.get_type_names()
+
+        self.assertEqual(self.mock_load.call_count, 1)
+
+    @patch('src.db.reference_cache.get_tarifs_for_event')
+    def test_event_tarifs(self, mock_tarifs):
+        """Test cached tarifs are served from memory, other events are queried"""
+        mock_tarifs.return_value = []
+
+        tarifs = reference_cache.get_event_tarifs(1)
+        reference_cache.get_event_tarifs(9)
+
+        self.assertEqual([tarif['name'] for tarif in tarifs], ['Normal', 'Student'])
+        self.assertNotIn('event_id', tarifs[0])
+        mock_tarifs.assert_called_once_with(9)
+
+
+if __name__ == '__main__':
+    unittest.main()
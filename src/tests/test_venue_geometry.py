@@ -0,0 +1,76 @@
+"""
+Unit tests for the seat map geometry cache.
+Tests the memory / disk cache and its layout version in src/qt/venue_geometry.py
+"""
+
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.qt import venue_geometry
+
+ROWS = [('Parterre', 0, 0, 1, 1, False, 1, 0, 0, None, None),
+        ('Parterre', 0, 0, 1, 1, False, 2, 0, 1, None, None)]
+MOVED_ROWS = [('Parterre', 0, 0, 1, 1, False, 1, 0, 0, None, None),
+              ('Parterre', 0, 0, 1, 1, False, 2, 1, 0, None, None)]
+
+
+class TestVenueGeometryCache(unittest.TestCase):
+    """Test geometries are rebuilt when the room layout version changes"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        patcher = patch.object(venue_geometry, 'CACHE_DIR', self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch.object(venue_geometry, 'get_venue_geometry_rows', return_value=ROWS)
+        self.mock_rows = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        venue_geometry._cache.clear()
+
+    def tearDown(self):
+        venue_geometry._cache.clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_cached_in_memory_and_on_disk(self):
+        """Test the same layout version is read from the database once"""
+        geometry = venue_geometry.get_venue_geometry(1, 2, 5, seat_ids=[1, 2])
+        venue_geometry.get_venue_geometry(1, 2, 5, seat_ids=[1, 2])
+        venue_geometry._cache.clear()
+        from_disk = venue_geometry.get_venue_geometry(1, 2, 5, seat_ids=[1, 2])
+
+        self.mock_rows.assert_called_once_with(1, 2)
+        self.assertEqual(from_disk['seats'], geometry['seats'])
+
+    def test_new_layout_version_rebuilds(self):
+        """Test moved seats are seen once the layout version changed, in memory and on disk"""
+        venue_geometry.get_venue_geometry(1, 2, 5, seat_ids=[1, 2])
+        self.mock_rows.return_value = MOVED_ROWS
+
+        geometry = venue_geometry.get_venue_geometry(1, 2, 6, seat_ids=[1, 2])
+        self.assertEqual(geometry['seats'][2], (0, 1))
+
+        venue_geometry._cache.clear()
+        geometry = venue_geometry.get_venue_geometry(1, 2, 6, seat_ids=[1, 2])
+        self.assertEqual(geometry['seats'][2], (0, 1))
+        self.assertEqual(self.mock_rows.call_count, 2)
+
+    def test_missing_seat_rebuilds(self):
+        """Test a cached geometry without one of the seats is rebuilt"""
+        venue_geometry.get_venue_geometry(1, 2, 5, seat_ids=[1, 2])
+
+        venue_geometry.get_venue_geometry(1, 2, 5, seat_ids=[1, 2, 3])
+
+        self.assertEqual(self.mock_rows.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()